@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 from assume.common.forecasts import Forecaster
+from assume.common.kpis import KpiAccumulator
 from assume.common.mango_serializer import mango_codec_factory
 from assume.common.market_objects import MarketConfig, MarketProduct, Orderbook
 from assume.common.outputs import OutputDef, WriteOutput
@@ -9,8 +9,11 @@ from typing import TypedDict
 import numpy as np
 import pandas as pd
 
+from assume.common import dispatch_kernels
 from assume.common.forecasts import Forecaster
 from assume.common.market_objects import MarketConfig, Orderbook, Product
+from assume.common.time_index import TimeIndex
+from assume.common.unit_outputs import UnitOutputs
 
 
 class BaseStrategy:
@@ -27,6 +30,7 @@ class BaseUnit:
         technology (str): The technology of the unit.
         bidding_strategies (dict[str, BaseStrategy]): The bidding strategies of the unit.
         index (pandas.DatetimeIndex): The index of the unit.
+        time_index (TimeIndex): Translates timestamps of the index into positions.
         node (str, optional): The node of the unit. Defaults to "".
         forecaster (Forecaster, optional): The forecast of the unit. Defaults to None.
         **kwargs: Additional keyword arguments.
@@ -36,7 +40,7 @@ class BaseUnit:
         unit_operator (str): The operator of the unit.
         technology (str): The technology of the unit.
         bidding_strategies (dict[str, BaseStrategy]): The bidding strategies of the unit.
-        index (pandas.DatetimeIndex): The index of the unit.
+        index (pandas.DatetimeIndex | TimeIndex): The index of the unit, a shared TimeIndex avoids recreating it per unit.
         node (str, optional): The node of the unit. Defaults to "".
         forecaster (Forecaster, optional): The forecast of the unit. Defaults to None.
         location (tuple[float, float], optional): The location of the unit. Defaults to (0.0, 0.0).
@@ -44,13 +48,16 @@ class BaseUnit:
 
     """
 
+    # outputs for which space is preallocated in the output store
+    output_columns: tuple[str, ...] = ("energy", "energy_cashflow")
+
     def __init__(
         self,
         id: str,
         unit_operator: str,
         technology: str,
         bidding_strategies: dict[str, BaseStrategy],
-        index: pd.DatetimeIndex,
+        index: pd.DatetimeIndex | TimeIndex,
         node: str = "node0",
         forecaster: Forecaster = None,
         location: tuple[float, float] = (0.0, 0.0),
@@ -62,27 +69,29 @@ class BaseUnit:
         self.node = node
         self.location = location
         self.bidding_strategies: dict[str, BaseStrategy] = bidding_strategies
+        self.outputs = UnitOutputs(index, self.output_columns)
         self.index = index
-        self.outputs = defaultdict(lambda: pd.Series(0.0, index=self.index))
-        # series does not like to convert from tensor to float otherwise
 
         # RL data stored as lists to simplify storing to the buffer
         self.outputs["rl_observations"] = []
         self.outputs["rl_actions"] = []
         self.outputs["rl_rewards"] = []
 
-        # some data is stored as series to allow to store it in the outputs
-        self.outputs["actions"] = pd.Series(0.0, index=self.index, dtype=object)
-        self.outputs["exploration_noise"] = pd.Series(
-            0.0, index=self.index, dtype=object
-        )
-        self.outputs["reward"] = pd.Series(0.0, index=self.index, dtype=object)
-
         if forecaster:
             self.forecaster = forecaster
         else:
             self.forecaster = defaultdict(lambda: pd.Series(0.0, index=self.index))
 
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self._index
+
+    @index.setter
+    def index(self, index: pd.DatetimeIndex | TimeIndex):
+        self.time_index = index if isinstance(index, TimeIndex) else TimeIndex(index)
+        self._index = self.time_index.index
+        self.outputs.index = self.time_index
+
     def calculate_bids(
         self,
         market_config: MarketConfig,
@@ -153,15 +162,16 @@ class BaseUnit:
         """
 
         product_type = marketconfig.product_type
+        dispatch = self.outputs.get_array(product_type)
         for order in orderbook:
-            start = order["start_time"]
-            end = order["end_time"]
-            end_excl = end - self.index.freq
+            positions = self.time_index.get_product_slice(
+                order["start_time"], order["end_time"]
+            )
             if isinstance(order["accepted_volume"], dict):
                 added_volume = list(order["accepted_volume"].values())
             else:
                 added_volume = order["accepted_volume"]
-            self.outputs[product_type].loc[start:end_excl] += added_volume
+            dispatch[positions] += added_volume
         self.calculate_cashflow(product_type, orderbook)
 
         self.bidding_strategies[marketconfig.market_id].calculate_reward(
@@ -215,23 +225,26 @@ class BaseUnit:
         """
         return self.outputs["energy"][start:end]
 
-    def get_output_before(self, dt: datetime, product_type: str = "energy") -> float:
+    def get_output_before(
+        self, dt: datetime | int, product_type: str = "energy"
+    ) -> float:
         """
         Returns output before the given datetime.
 
         If the datetime is before the start of the index, 0 is returned.
 
         Args:
-            dt: The datetime.
+            dt: The datetime or its position in the index.
             product_type: The product type (default is "energy").
 
         Returns:
             The output before the given datetime.
         """
-        if dt - self.index.freq < self.index[0]:
+        pos = self.time_index.get_offset(dt) - 1
+        if pos < 0:
             return 0
         else:
-            return self.outputs[product_type].at[dt - self.index.freq]
+            return self.outputs.get_array(product_type)[pos]
 
     def as_dict(self) -> dict[str, str | int]:
         """
@@ -256,27 +269,24 @@ class BaseUnit:
             product_type: The product type.
             orderbook: The orderbook.
         """
+        cashflows = self.outputs.get_array(f"{product_type}_cashflow")
         for order in orderbook:
             start = order["start_time"]
             end = order["end_time"]
-            end_excl = end - self.index.freq
+            positions = self.time_index.get_product_slice(start, end)
 
             if isinstance(order["accepted_volume"], dict):
                 cashflow = [
                     float(order["accepted_price"][i] * order["accepted_volume"][i])
                     for i in order["accepted_volume"].keys()
                 ]
-                self.outputs[f"{product_type}_cashflow"].loc[start:end_excl] += (
-                    cashflow * self.index.freq.n
-                )
+                cashflows[positions] += cashflow * self.index.freq.n
             else:
                 cashflow = float(
                     order.get("accepted_price", 0) * order.get("accepted_volume", 0)
                 )
                 hours = (end - start) / timedelta(hours=1)
-                self.outputs[f"{product_type}_cashflow"].loc[start:end_excl] += (
-                    cashflow * hours
-                )
+                cashflows[positions] += cashflow * hours
 
     def get_starting_costs(self, op_time: int) -> float:
         """
@@ -301,6 +311,109 @@ class BaseUnit:
         self.outputs["rl_rewards"] = []
 
 
+class OperationCounters:
+    """
+    Running counters of the operation and down times of a unit, derived from its committed energy output.
+
+    The counters hold the signed length of the current run of operation (positive) or shut down (negative)
+    timesteps and the sum and number of the completed operation and down periods. They are advanced with
+    :meth:`commit` when the dispatch of the unit is executed, so that queries only need to look at the timesteps
+    after the committed ones.
+
+    Attributes:
+        energy (numpy.ndarray): The energy output of the unit.
+        position (int): The number of committed timesteps.
+        run (int): The signed length of the current run.
+        up_time (int): The sum of the completed operation periods.
+        up_periods (int): The number of completed operation periods.
+        down_time (int): The sum of the completed down periods.
+        down_periods (int): The number of completed down periods.
+
+    Args:
+        energy (numpy.ndarray): The energy output of the unit.
+    """
+
+    def __init__(self, energy: np.ndarray):
+        self.energy = energy
+        self.position = 0
+        self.run = 0
+        self.up_time = 0
+        self.up_periods = 0
+        self.down_time = 0
+        self.down_periods = 0
+
+    def fold(self, pos: int) -> tuple[int, int, int, int, int]:
+        """
+        Returns the counters at the given position without committing the timesteps before it.
+
+        Only the timesteps after the committed ones are read. Positions before them are counted from the start.
+
+        Args:
+            pos (int): The position for which the counters are needed.
+
+        Returns:
+            tuple[int, int, int, int, int]: The run, up_time, up_periods, down_time and down_periods.
+        """
+        pos = min(max(pos, 0), len(self.energy))
+        if pos < self.position:
+            start, counters = 0, (0, 0, 0, 0, 0)
+        else:
+            start = self.position
+            counters = (
+                self.run,
+                self.up_time,
+                self.up_periods,
+                self.down_time,
+                self.down_periods,
+            )
+        if pos == start:
+            return counters
+
+        run, up_time, up_periods, down_time, down_periods = counters
+        is_on = self.energy[start:pos] > 0
+        bounds = np.flatnonzero(is_on[1:] != is_on[:-1]) + 1
+        lengths = np.diff(bounds, prepend=0, append=len(is_on)).tolist()
+        status = bool(is_on[0])
+        if run != 0 and (run > 0) == status:
+            # the first run continues the current one
+            lengths[0] += abs(run)
+        elif run > 0:
+            up_time += run
+            up_periods += 1
+        elif run < 0:
+            down_time -= run
+            down_periods += 1
+
+        # the runs alternate, the last one is the current run
+        first_up, first_down = (0, 1) if status else (1, 0)
+        up_time += sum(lengths[first_up:-1:2])
+        up_periods += len(lengths[first_up:-1:2])
+        down_time += sum(lengths[first_down:-1:2])
+        down_periods += len(lengths[first_down:-1:2])
+        last_on = status == (len(lengths) % 2 == 1)
+        run = lengths[-1] if last_on else -lengths[-1]
+        return run, up_time, up_periods, down_time, down_periods
+
+    def commit(self, pos: int) -> None:
+        """
+        Advances the counters to the given position, when the dispatch before it is executed.
+
+        Args:
+            pos (int): The position up to which the dispatch is executed.
+        """
+        pos = min(pos, len(self.energy))
+        if pos <= self.position:
+            return
+        (
+            self.run,
+            self.up_time,
+            self.up_periods,
+            self.down_time,
+            self.down_periods,
+        ) = self.fold(pos)
+        self.position = pos
+
+
 class SupportsMinMax(BaseUnit):
     """
     Base class used for units supporting continuous dispatch and without energy storage.
@@ -392,32 +505,47 @@ class SupportsMinMax(BaseUnit):
         fuel_cost = prices[self.technology.replace("_combined", "")].mean()
         return (fuel_cost + emission_cost) / self.efficiency
 
+    @property
+    def operation_counters(self) -> OperationCounters:
+        """
+        The running counters of the operation and down times of the unit.
+        """
+        energy = self.outputs.get_array("energy")
+        counters = getattr(self, "_operation_counters", None)
+        if counters is None or counters.energy is not energy:
+            # the outputs were created for a new index
+            counters = self._operation_counters = OperationCounters(energy)
+        return counters
+
     def get_operation_time(self, start: datetime) -> int:
         """
         Returns the time the unit is operating (positive) or shut down (negative).
 
+        Only the last max(min_operating_time, min_down_time) timesteps are taken into account.
+
         Args:
             start (datetime.datetime): The start time.
 
         Returns:
             int: The operation time.
         """
-        before = start - self.index.freq
-
         max_time = max(self.min_operating_time, self.min_down_time)
-        begin = start - self.index.freq * max_time
-        end = before
-        arr = self.outputs["energy"][begin:end][::-1] > 0
-        if len(arr) < 1:
+        window = self.time_index.get_slice(
+            start - self.index.freq * max_time, start - self.index.freq
+        )
+        length = window.stop - window.start
+        if length < 1:
             # before start of index
             return max_time
-        is_off = not arr.iloc[0]
-        runn = 0
-        for val in arr:
-            if val == is_off:
-                break
-            runn += 1
-        return (-1) ** is_off * runn
+
+        counters = self.operation_counters
+        if window.stop == counters.position:
+            run = counters.run
+        else:
+            run = dispatch_kernels.get_operation_time(
+                counters.energy, window.stop, length
+            )
+        return max(min(run, length), -length)
 
     def get_average_operation_times(self, start: datetime) -> tuple[float, float]:
         """
@@ -432,38 +560,31 @@ class SupportsMinMax(BaseUnit):
         Note:
             down_time in general is indicated with negative values
         """
-        op_series = []
-
-        before = start - self.index.freq
-        arr = self.outputs["energy"][self.index[0] : before][::-1] > 0
-
-        if len(arr) < 1:
+        pos = self.time_index.get_slice(self.index[0], start - self.index.freq).stop
+        if pos < 1:
             # before start of index
             return max(self.min_operating_time, 1), min(-self.min_down_time, -1)
 
-        op_series = []
-        status = arr.iloc[0]
-        runn = 0
-        for val in arr:
-            if val == status:
-                runn += 1
-            else:
-                op_series.append(-((-1) ** status) * runn)
-                runn = 1
-                status = val
-        op_series.append(-((-1) ** status) * runn)
+        run, up_time, up_periods, down_time, down_periods = (
+            self.operation_counters.fold(pos)
+        )
+        # the current run counts as a period
+        if run > 0:
+            up_time += run
+            up_periods += 1
+        else:
+            down_time -= run
+            down_periods += 1
 
-        op_times = [operation for operation in op_series if operation > 0]
-        if op_times == []:
+        if up_periods == 0:
             avg_op_time = self.min_operating_time
         else:
-            avg_op_time = sum(op_times) / len(op_times)
+            avg_op_time = up_time / up_periods
 
-        down_times = [operation for operation in op_series if operation < 0]
-        if down_times == []:
+        if down_periods == 0:
             avg_down_time = self.min_down_time
         else:
-            avg_down_time = sum(down_times) / len(down_times)
+            avg_down_time = -down_time / down_periods
 
         return max(1, avg_op_time, self.min_operating_time), min(
             -1, avg_down_time, -self.min_down_time
@@ -561,22 +682,23 @@ class SupportsMinMaxCharge(BaseUnit):
             tuple[pandas.Series, pandas.Series]: The min and max discharging power for the given time period.
         """
 
-    def get_soc_before(self, dt: datetime) -> float:
+    def get_soc_before(self, dt: datetime | int) -> float:
         """
         Returns the State of Charge (SoC) before the given datetime.
         If datetime is before the start of the index, the initial SoC is returned.
         The SoC is a float between 0 and 1.
 
         Args:
-            dt (datetime.datetime): The current datetime.
+            dt (datetime.datetime | int): The current datetime or its position in the index.
 
         Returns:
             float: The SoC before the given datetime.
         """
-        if dt - self.index.freq <= self.index[0]:
+        pos = self.time_index.get_offset(dt) - 1
+        if pos <= 0:
             return self.initial_soc
         else:
-            return self.outputs["soc"].at[dt - self.index.freq]
+            return self.outputs.get_array("soc")[pos]
 
     def get_clean_spread(self, prices: pd.DataFrame) -> float:
         """
@@ -807,6 +929,47 @@ class LearningStrategy(BaseStrategy):
         # them into suitable format for recurrent neural networks
         self.num_timeseries_obs_dim = num_timeseries_obs_dim
 
+    def store_actions(self, unit: BaseUnit, start: datetime, actions, noise) -> None:
+        """
+        Stores the actions and the exploration noise of a timestep in the outputs of the unit.
+
+        The values are detached from the tensors and written to one float column per action dimension,
+        named ``actions_0``, ``exploration_noise_0`` and so on, so that they can be written to the
+        database without converting tensors.
+
+        Args:
+            unit (BaseUnit): The unit.
+            start (datetime.datetime): The start of the timestep.
+            actions (torch.Tensor): The actions of the timestep.
+            noise (torch.Tensor): The exploration noise of the timestep.
+        """
+        pos = unit.outputs.get_pos(start)
+        for name, values in (("actions", actions), ("exploration_noise", noise)):
+            if hasattr(values, "detach"):
+                values = values.detach().cpu().numpy()
+            for i, value in enumerate(np.ravel(values)):
+                unit.outputs.get_array(f"{name}_{i}")[pos] = value
+
+    def get_actions_output(self, unit: BaseUnit, start: datetime) -> dict[str, float]:
+        """
+        Returns the stored actions and exploration noise of a timestep.
+
+        Args:
+            unit (BaseUnit): The unit.
+            start (datetime.datetime): The start of the timestep.
+
+        Returns:
+            dict[str, float]: The values of the actions and exploration noise by column.
+        """
+        pos = unit.outputs.get_pos(start)
+        output = {}
+        for i in range(self.act_dim):
+            for name in ("exploration_noise", "actions"):
+                output[f"{name}_{i}"] = float(
+                    unit.outputs.get_array(f"{name}_{i}")[pos]
+                )
+        return output
+
 
 class LearningConfig(TypedDict):
     """
@@ -0,0 +1,214 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Kernels applying the technical constraints of the units to a whole dispatch window at once.
+
+The kernels work on the arrays of the unit outputs and carry the state of the unit from one timestep
+to the next instead of reading it from the outputs again. If numba is installed, they are compiled.
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:
+
+    def njit(*args, **kwargs):
+        # without numba, the kernels run as plain python loops over the arrays
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+@njit(cache=True)
+def get_operation_time(energy: np.ndarray, pos: int, max_time: int) -> int:
+    """
+    Returns the time the unit is operating (positive) or shut down (negative) before the given position.
+
+    Only the last max_time timesteps are taken into account.
+    Unlike :meth:`assume.common.base.SupportsMinMax.get_operation_time`, 0 is returned without history.
+
+    Args:
+        energy (numpy.ndarray): The energy output of the unit.
+        pos (int): The position of the current timestep.
+        max_time (int): The maximum number of timesteps to look back.
+
+    Returns:
+        int: The operation time.
+    """
+    run = 0
+    for p in range(pos - 1, max(pos - max_time, 0) - 1, -1):
+        if energy[p] > 0:
+            if run < 0:
+                break
+            run += 1
+        else:
+            if run > 0:
+                break
+            run -= 1
+    return run
+
+
+@njit(cache=True)
+def apply_ramp_constraints(
+    dispatch: np.ndarray,
+    energy: np.ndarray,
+    positions: np.ndarray,
+    available_power: np.ndarray,
+    min_power: float,
+    max_power: float,
+    ramp_up: float,
+    ramp_down: float,
+    min_operating_time: int,
+    min_down_time: int,
+) -> None:
+    """
+    Corrects the dispatch at the given positions according to the ramping and operation time restrictions.
+
+    The timesteps are processed in order and every corrected value is taken into account for the following
+    timesteps, like with :meth:`assume.common.base.SupportsMinMax.calculate_ramp` and
+    :meth:`assume.common.base.SupportsMinMax.get_operation_time` called for each timestep.
+
+    Args:
+        dispatch (numpy.ndarray): The dispatch which is corrected in place.
+        energy (numpy.ndarray): The energy output of the unit, which may be the dispatch itself.
+        positions (numpy.ndarray): The ascending positions of the timesteps to correct.
+        available_power (numpy.ndarray): The available power at each of the positions.
+        min_power (float): The minimum power of the unit.
+        max_power (float): The maximum power of the unit.
+        ramp_up (float): The ramp up rate of the unit.
+        ramp_down (float): The ramp down rate of the unit.
+        min_operating_time (int): The minimum operating time of the unit.
+        min_down_time (int): The minimum down time of the unit.
+    """
+    max_time = max(min_operating_time, min_down_time)
+    run = 0
+    last_pos = -2
+    for i in range(len(positions)):
+        pos = positions[i]
+        if pos != last_pos + 1:
+            run = get_operation_time(energy, pos, max_time)
+        # without history, the unit can be switched on and off
+        op_time = run if run != 0 else max_time
+        previous_power = energy[pos - 1] if pos > 0 else 0.0
+
+        power = dispatch[pos]
+        # was off before, but should be on now and min_down_time is not reached
+        if power > 0 and op_time < 0 and op_time > -min_down_time:
+            power = 0.0
+        # was on before, but should be off now and min_operating_time is not reached
+        elif power == 0 and op_time > 0 and op_time < min_operating_time:
+            power = min_power
+
+        if power != 0:
+            power = min(power, previous_power + ramp_up, max_power)
+            power = max(power, previous_power - ramp_down, min_power)
+            if power > 0:
+                power = min(power, available_power[i])
+                power = max(power, min_power)
+        dispatch[pos] = power
+
+        # carry the operation time forward to the next timestep
+        if energy[pos] > 0:
+            run = min(run + 1, max_time) if run > 0 else min(1, max_time)
+        else:
+            run = max(run - 1, -max_time) if run < 0 else max(-1, -max_time)
+        last_pos = pos
+
+
+@njit(cache=True)
+def apply_soc_constraints(
+    dispatch: np.ndarray,
+    energy: np.ndarray,
+    socs: np.ndarray,
+    positions: np.ndarray,
+    duration: float,
+    max_volume: float,
+    min_volume: float,
+    efficiency_charge: float,
+    efficiency_discharge: float,
+    min_power_charge: float,
+    max_power_charge: float,
+    min_power_discharge: float,
+    max_power_discharge: float,
+    limit_power: bool,
+    fill_to_end: bool,
+) -> None:
+    """
+    Corrects the dispatch of a storage at the given positions according to its state of charge
+    and propagates the state of charge along the positions.
+
+    The state of charge resulting from a timestep is written to the following timesteps up to the next
+    position, or only to the next timestep after the last position unless fill_to_end is set.
+
+    Args:
+        dispatch (numpy.ndarray): The dispatch which is corrected in place.
+        energy (numpy.ndarray): The energy output of the unit, which may be the dispatch itself.
+        socs (numpy.ndarray): The state of charge of the unit, which is updated in place.
+        positions (numpy.ndarray): The ascending positions of the timesteps to correct.
+        duration (float): The duration of a timestep in hours.
+        max_volume (float): The maximum volume of the storage.
+        min_volume (float): The minimum volume of the storage.
+        efficiency_charge (float): The efficiency while charging.
+        efficiency_discharge (float): The efficiency while discharging.
+        min_power_charge (float): The minimum charging power (negative).
+        max_power_charge (float): The maximum charging power (negative).
+        min_power_discharge (float): The minimum discharging power.
+        max_power_discharge (float): The maximum discharging power.
+        limit_power (bool): Whether the dispatch is limited to the charging and discharging power first.
+        fill_to_end (bool): Whether the last state of charge is written to the end of the index.
+    """
+    for i in range(len(positions)):
+        pos = positions[i]
+        soc = socs[pos]
+        power = dispatch[pos]
+        if limit_power:
+            if power > max_power_discharge:
+                power = max_power_discharge
+            elif power < max_power_charge:
+                power = max_power_charge
+            elif (
+                power < min_power_discharge and power > min_power_charge and power != 0
+            ):
+                power = 0.0
+            dispatch[pos] = power
+
+        delta_soc = 0.0
+        # discharging
+        if power > 0:
+            max_soc_discharge = round(
+                max(
+                    0.0,
+                    (soc * max_volume - min_volume) * efficiency_discharge / duration,
+                ),
+                3,
+            )
+            if power > max_soc_discharge:
+                dispatch[pos] = max_soc_discharge
+            delta_soc = -energy[pos] * duration / efficiency_discharge / max_volume
+        # charging
+        elif power < 0:
+            max_soc_charge = round(
+                min(
+                    0.0, (soc * max_volume - max_volume) / efficiency_charge / duration
+                ),
+                3,
+            )
+            if power < max_soc_charge:
+                dispatch[pos] = max_soc_charge
+            delta_soc = -energy[pos] * duration * efficiency_charge / max_volume
+
+        if i + 1 < len(positions):
+            stop = positions[i + 1] + 1
+        elif fill_to_end:
+            stop = len(socs)
+        else:
+            stop = pos + 2
+        socs[pos + 1 : min(stop, len(socs))] = soc + delta_soc
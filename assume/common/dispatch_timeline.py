@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+from datetime import datetime, timedelta
+
+import dateutil.rrule as rr
+import numpy as np
+import pandas as pd
+
+from assume.common.market_objects import Orderbook
+from assume.common.time_index import TimeIndex
+
+logger = logging.getLogger(__name__)
+
+
+class DispatchTimeline:
+    """
+    Accumulates the accepted volume of the orders per market and unit on the timesteps of the simulation.
+
+    Each (market_id, unit_id) pair has a row in a matrix with one column per timestep, to which the accepted
+    volume of the orders is added when the market feedback is received. The timesteps at which an order starts
+    or ends are marked, so that :meth:`get_dispatch` returns the step function of the accepted volume
+    without keeping, expanding and sorting the orders.
+
+    The matrices only cover a window of timesteps, which starts at the first timestep that was not sent yet
+    and grows with the accepted orders. Sent timesteps are dropped with :meth:`discard_before`.
+
+    Attributes:
+        time_index (TimeIndex): The timesteps of the simulation.
+        rows (dict[tuple[str, str], int]): The row of each market and unit.
+        offset (int): The position of the first timestep of the window.
+        volume (numpy.ndarray): The accepted volume with shape (rows, timesteps of the window).
+        changes (numpy.ndarray): Marks the timesteps at which an order starts or ends, same shape as the volume.
+
+    Args:
+        index (pandas.DatetimeIndex | TimeIndex): The timesteps of the simulation.
+    """
+
+    def __init__(self, index: pd.DatetimeIndex | TimeIndex):
+        self.time_index = index if isinstance(index, TimeIndex) else TimeIndex(index)
+        self.rows: dict[tuple[str, str], int] = {}
+        self.offset = 0
+        self.volume = np.zeros((0, 0))
+        self.changes = np.zeros((0, 0), dtype=bool)
+
+    def _resize(self, rows: int, columns: int) -> None:
+        volume = np.zeros((rows, columns))
+        changes = np.zeros((rows, columns), dtype=bool)
+        old_rows, old_columns = self.volume.shape
+        volume[:old_rows, :old_columns] = self.volume
+        changes[:old_rows, :old_columns] = self.changes
+        self.volume, self.changes = volume, changes
+
+    def get_row(self, market_id: str, unit_id: str) -> int:
+        """
+        Returns the row of a market and unit, adding it if needed.
+
+        Args:
+            market_id (str): The id of the market.
+            unit_id (str): The id of the unit.
+
+        Returns:
+            int: The row in the matrices.
+        """
+        key = (market_id, unit_id)
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.rows)
+            if row == len(self.volume):
+                # grow the matrices by doubling the number of rows
+                self._resize(max(2 * row, 8), self.volume.shape[1])
+            self.rows[key] = row
+        return row
+
+    def add_orders(self, orderbook: Orderbook) -> None:
+        """
+        Adds the accepted volume of the orders.
+
+        Args:
+            orderbook (Orderbook): The orders with accepted volume, market_id and unit_id.
+        """
+        for order in orderbook:
+            row = self.get_row(order["market_id"], order["unit_id"])
+            accepted_volume = order["accepted_volume"]
+            if isinstance(accepted_volume, dict):
+                # block orders have an accepted volume per product
+                duration = (order["end_time"] - order["start_time"]) / len(
+                    accepted_volume
+                )
+                for start, volume in accepted_volume.items():
+                    self._add(row, start, start + duration, volume)
+            elif order["only_hours"] is None:
+                self._add(row, order["start_time"], order["end_time"], accepted_volume)
+            else:
+                # only_hours allows to have peak or off-peak bids
+                start_hour, end_hour = order["only_hours"]
+                duration_hours = end_hour - start_hour
+                if duration_hours <= 0:
+                    duration_hours += 24
+                starts = rr.rrule(
+                    rr.DAILY,
+                    dtstart=order["start_time"],
+                    byhour=start_hour,
+                    until=order["end_time"],
+                )
+                for start in starts:
+                    self._add(
+                        row,
+                        start,
+                        start + timedelta(hours=duration_hours),
+                        accepted_volume,
+                    )
+
+    def _add(self, row: int, start: datetime, end: datetime, volume: float) -> None:
+        positions = self.time_index.get_product_slice(start, end)
+        if positions.start == positions.stop or positions.stop < self.offset:
+            # the order is outside of the simulation or was already sent
+            return
+        start_pos = max(positions.start, self.offset) - self.offset
+        stop_pos = positions.stop - self.offset
+        if stop_pos >= self.volume.shape[1]:
+            # grow the window by at least doubling the number of timesteps
+            self._resize(len(self.volume), max(2 * self.volume.shape[1], stop_pos + 1))
+        self.volume[row, start_pos:stop_pos] += volume
+        if positions.start >= self.offset:
+            self.changes[row, start_pos] = True
+        self.changes[row, stop_pos] = True
+
+    def discard_before(self, time: datetime) -> None:
+        """
+        Drops the timesteps before the given time from the window, as their dispatch was already sent.
+
+        Args:
+            time (datetime.datetime): The first timestep which is kept.
+        """
+        drop = self.time_index.get_product_slice(time, time).start - self.offset
+        drop = min(drop, self.volume.shape[1])
+        if drop <= 0:
+            return
+        # shift the window in place, the freed timesteps are reused for later orders
+        kept = self.volume.shape[1] - drop
+        self.volume[:, :kept] = self.volume[:, drop:]
+        self.volume[:, kept:] = 0
+        self.changes[:, :kept] = self.changes[:, drop:]
+        self.changes[:, kept:] = False
+        self.offset += drop
+
+    def get_dispatch(self, begin: datetime, end: datetime) -> list[list]:
+        """
+        Returns the step function of the accepted volume between begin and end.
+
+        Only the timesteps at which an order starts or ends are returned, the end is excluded.
+        The end of an order is returned with the remaining volume, which is 0 if no other order continues,
+        also if the order ends exactly at the begin, i.e. in the period after its last timestep was sent.
+
+        Args:
+            begin (datetime.datetime): The first timestep.
+            end (datetime.datetime): The end of the period (exclusive).
+
+        Returns:
+            list[list]: The records formatted like "datetime, power, market_id, unit_id", grouped by market and unit.
+        """
+        positions = self.time_index.get_product_slice(begin, end)
+        start = max(positions.start, self.offset)
+        stop = min(positions.stop, self.offset + self.volume.shape[1])
+        if not self.rows or start >= stop:
+            return []
+        n_rows = len(self.rows)
+        rows, steps = np.nonzero(
+            self.changes[:n_rows, start - self.offset : stop - self.offset]
+        )
+        steps += start - self.offset
+        if not len(rows):
+            return []
+
+        keys = list(self.rows)
+        times = self.time_index.index[steps + self.offset].to_pydatetime()
+        volumes = self.volume[rows, steps].tolist()
+        return [
+            [time, volume, *keys[row]]
+            for time, volume, row in zip(times, volumes, rows.tolist())
+        ]
@@ -3,10 +3,65 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import logging
+import os
+import tempfile
+import weakref
 
 import numpy as np
 import pandas as pd
 
+from assume.common.time_index import TimeIndex
+
+logger = logging.getLogger(__name__)
+
+# version of the forecasts created from the inputs, which is part of the key of cached forecasts
+# and must be increased whenever the calculation of the forecasts changes
+FORECASTS_VERSION = 1
+
+
+def _remove_shared_file(path: str) -> None:
+    """
+    Removes the memory-mapped file of shared forecasts.
+
+    Args:
+        path (str): The path of the file.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        # the file can not be removed while it is mapped on some platforms
+        logger.warning(f"could not remove shared forecasts {path}")
+
+
+def calculate_merit_order_price(
+    marginal_costs: np.ndarray, power: np.ndarray, demand: np.ndarray
+) -> np.ndarray:
+    """
+    Calculates the price of the merit order in each timestep.
+
+    In each timestep, the power plants are sorted by their marginal costs and the price is set by the cheapest power plant
+    whose cumulative power exceeds the demand. If the demand can not be covered, the price is 0.
+
+    Args:
+        marginal_costs (numpy.ndarray): The marginal costs with shape (timesteps, power plants).
+        power (numpy.ndarray): The available power with shape (timesteps, power plants).
+        demand (numpy.ndarray): The demand of each timestep.
+
+    Returns:
+        numpy.ndarray: The price of each timestep.
+    """
+    prices = np.zeros(len(demand))
+    if not marginal_costs.shape[1]:
+        return prices
+    order = np.argsort(marginal_costs, axis=1, kind="stable")
+    sorted_costs = np.take_along_axis(marginal_costs, order, axis=1)
+    cumsum_power = np.take_along_axis(power, order, axis=1).cumsum(axis=1)
+    # like searchsorted on each row, the position of the first plant exceeding the demand
+    positions = (cumsum_power <= demand[:, None]).sum(axis=1)
+    covered = positions < marginal_costs.shape[1]
+    prices[covered] = sorted_costs[covered, positions[covered]]
+    return prices
+
 
 class Forecaster:
     """
@@ -15,11 +70,24 @@ class Forecaster:
     to retrieve forecasts for specific columns, availability of units, and prices of fuel types, returning
     the corresponding timeseries as pandas Series.
 
+    The stored forecasts share one float matrix with one row per column, so that each column is a contiguous
+    array which can be addressed by integer timesteps with :meth:`get_array`. Columns without forecast are
+    served from shared read-only arrays, so looking up a forecast does not copy a timeseries.
+    The Series returned by indexing are read-only views on the arrays, changing their values in place
+    raises a ValueError instead of changing the stored forecast, use :meth:`set_column` to change a forecast.
+
+    With :meth:`share`, the matrix is moved to a memory-mapped .npy file. A shared forecaster is pickled as the
+    path of this file, which the unpickled forecaster maps read-only, so that units operators in subprocesses
+    share the forecasts in memory instead of receiving a copy of them.
+
     Attributes:
         index (pandas.Series): The index of the forecasts.
+        time_index (TimeIndex): Translates timestamps of the index into positions.
+        column_positions (dict[str, int]): The row of each stored column in the data matrix.
+        frozen (bool): Whether the forecasts are read-only, see :meth:`freeze`.
 
     Args:
-        index (pandas.Series): The index of the forecasts.
+        index (pandas.Series | TimeIndex): The index of the forecasts.
 
     Example:
         >>> forecaster = Forecaster(index=pd.Series([1, 2, 3]))
@@ -28,8 +96,46 @@ class Forecaster:
 
     """
 
-    def __init__(self, index: pd.Series):
-        self.index = index
+    def __init__(self, index: pd.Series | TimeIndex):
+        self.time_index = index if isinstance(index, TimeIndex) else TimeIndex(index)
+        self.index = self.time_index.index
+        self.column_positions: dict[str, int] = {}
+        self._data = np.zeros((0, len(self.index)))
+        # read-only arrays of constant values, shared by all columns without forecast
+        self._constants: dict[float, np.ndarray] = {}
+        # read-only views on the arrays, which back the series returned for every lookup of a column
+        self._views: dict[str, np.ndarray] = {}
+        self.frozen = False
+        # the memory-mapped file backing the data matrix
+        self._shared_path: str | None = None
+        # removes the file created by this forecaster, also if it is garbage collected or the interpreter exits
+        self._shared_file_finalizer: weakref.finalize | None = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the caches are rebuilt on demand
+        state["_constants"] = {}
+        state["_views"] = {}
+        if self._shared_path is not None:
+            # only the path of the mapped file is pickled instead of the data
+            state["_data"] = None
+        # the copies do not own the file
+        state["_shared_file_finalizer"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self._shared_path is not None:
+            self._data = np.load(self._shared_path, mmap_mode="r")
+        elif self.frozen:
+            self._data.flags.writeable = False
+
+    @property
+    def data(self) -> np.ndarray:
+        """
+        The matrix holding all stored columns with shape (columns, timesteps).
+        """
+        return self._data[: len(self.column_positions)]
 
     def __getitem__(self, column: str) -> pd.Series:
         """
@@ -39,11 +145,188 @@ class Forecaster:
             column (str): The column of the forecast.
 
         Returns:
-            pd.Series: The forecast.
+            pd.Series: The forecast, a read-only view which can not be changed in place.
 
         This method returns the forecast for a given column as a pandas Series based on the provided index.
         """
-        return pd.Series(0.0, self.index)
+        values = self._views.get(column)
+        if values is None:
+            values = self.get_array(column).view()
+            values.flags.writeable = False
+            self._views[column] = values
+        # a new series for each lookup, so that replacing its values does not change later lookups
+        return pd.Series(values, self.index, copy=False)
+
+    def get_array(
+        self, column: str, start_pos: int = 0, end_pos: int | None = None
+    ) -> np.ndarray:
+        """
+        Returns the forecast for a given column as array between two positions of the index.
+
+        Args:
+            column (str): The column of the forecast.
+            start_pos (int, optional): The first position. Defaults to 0.
+            end_pos (int | None, optional): The end position (exclusive). Defaults to the end of the index.
+
+        Returns:
+            numpy.ndarray: A view on the forecast, which must not be changed.
+        """
+        pos = self.column_positions.get(column)
+        if pos is None:
+            return self.get_default(column)[start_pos:end_pos]
+        return self._data[pos, start_pos:end_pos]
+
+    def get_default(self, column: str) -> np.ndarray:
+        """
+        Returns the values of a column which has no stored forecast.
+
+        Args:
+            column (str): The column of the forecast.
+
+        Returns:
+            numpy.ndarray: The read-only values of the column.
+        """
+        return self.get_constant(0.0)
+
+    def get_constant(self, value: float) -> np.ndarray:
+        """
+        Returns a read-only array with the given value for each timestep, which is shared between columns.
+
+        Args:
+            value (float): The value.
+
+        Returns:
+            numpy.ndarray: The constant array.
+        """
+        array = self._constants.get(value)
+        if array is None:
+            array = np.full(len(self.index), value, dtype=float)
+            array.flags.writeable = False
+            self._constants[value] = array
+        return array
+
+    def set_column(self, column: str, values: float | np.ndarray | pd.Series) -> None:
+        """
+        Stores the forecast of a column, existing values of the column are overwritten in place.
+
+        Args:
+            column (str): The column of the forecast.
+            values (float | numpy.ndarray | pandas.Series): The values for each timestep or a single value.
+                Series are aligned to the index.
+        """
+        if isinstance(values, pd.Series):
+            values = values.reindex(self.index)
+        self.set_columns([column], np.asarray(values, dtype=float))
+
+    def set_columns(self, columns: list[str], values: float | np.ndarray) -> None:
+        """
+        Stores the forecasts of several columns at once, existing values of the columns are overwritten in place.
+
+        The matrix grows at most once for all new columns.
+
+        Args:
+            columns (list[str]): The columns of the forecasts.
+            values (float | numpy.ndarray): The values with shape (columns, timesteps), which are broadcast
+                like a single value or one value per column with shape (columns, 1).
+
+        Raises:
+            ValueError: If the forecasts are frozen, or if existing columns of forecasts mapped read-only are changed.
+        """
+        if self.frozen:
+            raise ValueError("The forecasts are frozen and can not be changed")
+        new_columns = [
+            column
+            for column in dict.fromkeys(columns)
+            if column not in self.column_positions
+        ]
+        rows = len(self.column_positions) + len(new_columns)
+        if rows > len(self._data):
+            # grow the matrix by at least doubling the number of rows
+            data = np.zeros((max(2 * len(self._data), rows, 8), len(self.index)))
+            data[: len(self.column_positions)] = self.data
+            self.release()
+            self._data = data
+            self._views.clear()
+        if not self._data.flags.writeable:
+            raise ValueError(
+                "The forecasts are mapped read-only from a file and can not be changed"
+            )
+        for column in new_columns:
+            self.column_positions[column] = len(self.column_positions)
+            self._views.pop(column, None)
+        self._data[[self.column_positions[column] for column in columns]] = values
+
+    def set_data(self, data: np.ndarray, columns: list[str]) -> None:
+        """
+        Replaces the stored forecasts by a matrix, for example one which is memory-mapped from a file.
+
+        Args:
+            data (numpy.ndarray): The forecasts with shape (columns, timesteps).
+            columns (list[str]): The column of each row of the matrix.
+
+        Raises:
+            ValueError: If the forecasts are frozen.
+        """
+        if self.frozen:
+            raise ValueError("The forecasts are frozen and can not be changed")
+        self.release()
+        self._data = data
+        self.column_positions = {column: pos for pos, column in enumerate(columns)}
+        self._views.clear()
+
+    def freeze(self) -> None:
+        """
+        Makes the stored forecasts read-only, after which no columns can be set.
+
+        The matrix is trimmed to the stored columns, so that the forecasts are one contiguous block of memory.
+        """
+        if len(self._data) != len(self.column_positions):
+            self._data = self.data.copy()
+        self._data.flags.writeable = False
+        self.frozen = True
+        # the cached views may refer to the untrimmed matrix
+        self._views.clear()
+
+    def share(self) -> None:
+        """
+        Moves the stored forecasts to a memory-mapped file, which is mapped by the unpickled copies of the forecaster.
+
+        Columns of this forecaster changed in place afterwards are visible to all copies, adding a column moves the
+        forecasts of this forecaster back to private memory. The copies map the file read-only, their existing columns
+        can not be changed. The file is removed with :meth:`release`, or when the forecaster is garbage collected or
+        the interpreter exits.
+        """
+        if self._shared_path is not None:
+            return
+        data = self.data
+        fd, path = tempfile.mkstemp(prefix="assume_forecasts_", suffix=".npy")
+        os.close(fd)
+        self._data = np.lib.format.open_memmap(
+            path, mode="w+", dtype=float, shape=data.shape
+        )
+        self._data[:] = data
+        self._data.flush()
+        self._data.flags.writeable = not self.frozen
+        self._shared_path = path
+        self._shared_file_finalizer = weakref.finalize(self, _remove_shared_file, path)
+        self._views.clear()
+
+    def release(self) -> None:
+        """
+        Moves the stored forecasts back to private memory and removes the memory-mapped file if it was
+        created by this forecaster.
+
+        Copies which already mapped the file keep their view on the forecasts.
+        """
+        if self._shared_path is None:
+            return
+        self._data = np.array(self._data)
+        self._data.flags.writeable = not self.frozen
+        self._views.clear()
+        if self._shared_file_finalizer is not None:
+            self._shared_file_finalizer()
+        self._shared_path = None
+        self._shared_file_finalizer = None
 
     def get_availability(self, unit: str) -> pd.Series:
         """
@@ -119,28 +402,34 @@ class CsvForecaster(Forecaster):
         self.powerplants_units = powerplants_units
         self.demand_units = demand_units
         self.market_configs = market_configs
-        self.forecasts = pd.DataFrame(index=index)
 
-    def __getitem__(self, column: str) -> pd.Series:
+    @property
+    def forecasts(self) -> pd.DataFrame:
         """
-        Returns the forecast for a given column.
+        The stored forecasts as dataframe, which shares its values with the data matrix.
+        """
+        return pd.DataFrame(
+            self.data.T,
+            index=self.index,
+            columns=list(self.column_positions),
+            copy=False,
+        )
 
-        If the column does not exist in the forecasts, a Series of zeros is returned. If the column contains "availability", a Series of ones is returned.
+    def get_default(self, column: str) -> np.ndarray:
+        """
+        Returns the values of a column which has no stored forecast.
+
+        If the column contains "availability", the unit is always available, otherwise zeros are returned.
 
         Args:
             column (str): The column of the forecast.
 
         Returns:
-            pd.Series: The forecast for the given column.
-
+            numpy.ndarray: The read-only values of the column.
         """
-
-        if column not in self.forecasts.columns:
-            if "availability" in column:
-                return pd.Series(1, self.index)
-            return pd.Series(0.0, self.index)
-
-        return self.forecasts[column]
+        if "availability" in column:
+            return self.get_constant(1.0)
+        return self.get_constant(0.0)
 
     def set_forecast(self, data: pd.DataFrame | pd.Series | None, prefix=""):
         """
@@ -161,22 +450,25 @@ class CsvForecaster(Forecaster):
         if data is None:
             return
         elif isinstance(data, pd.DataFrame):
-            if prefix:
-                # set prefix for columns to set
-                columns = [prefix + column for column in data.columns]
-                data.columns = columns
             if len(data.index) == 1:
                 # if we have a single value which should be set for the whole series
-                for column in data.columns:
-                    self.forecasts[column] = data[column].item()
+                self.set_columns(
+                    [prefix + column for column in data.columns],
+                    data.to_numpy(dtype=float).T,
+                )
             else:
-                # Add new columns to the existing DataFrame, overwriting any existing columns with the same names
-                new_columns = set(data.columns) - set(self.forecasts.columns)
-                self.forecasts = pd.concat(
-                    [self.forecasts, data[list(new_columns)]], axis=1
+                # Add new columns, existing columns with the same names are kept
+                new_columns = [
+                    column
+                    for column in data.columns
+                    if prefix + column not in self.column_positions
+                ]
+                self.set_columns(
+                    [prefix + column for column in new_columns],
+                    data[new_columns].reindex(self.index).to_numpy(dtype=float).T,
                 )
         else:
-            self.forecasts[prefix + data.name] = data
+            self.set_column(prefix + data.name, data)
 
     def calc_forecast_if_needed(self):
         """
@@ -186,15 +478,14 @@ class CsvForecaster(Forecaster):
         thise don't already exist.
         """
 
-        cols = []
-        for pp in self.powerplants_units.index:
-            col = f"availability_{pp}"
-            if col not in self.forecasts.columns:
-                s = pd.Series(1, index=self.forecasts.index)
-                s.name = col
-                cols.append(s)
-        cols.append(self.forecasts)
-        self.forecasts = pd.concat(cols, axis=1).copy()
+        self.set_columns(
+            [
+                f"availability_{pp}"
+                for pp in self.powerplants_units.index
+                if f"availability_{pp}" not in self.column_positions
+            ],
+            1.0,
+        )
 
         for market_id, config in self.market_configs.items():
             if config["product_type"] != "energy":
@@ -203,14 +494,16 @@ class CsvForecaster(Forecaster):
                 )
                 continue
 
-            if f"price_{market_id}" not in self.forecasts.columns:
-                self.forecasts[f"price_{market_id}"] = (
-                    self.calculate_market_price_forecast(market_id=market_id)
+            if f"price_{market_id}" not in self.column_positions:
+                self.set_column(
+                    f"price_{market_id}",
+                    self.calculate_market_price_forecast(market_id=market_id),
                 )
 
-            if f"residual_load_{market_id}" not in self.forecasts.columns:
-                self.forecasts[f"residual_load_{market_id}"] = (
-                    self.calculate_residual_load_forecast(market_id=market_id)
+            if f"residual_load_{market_id}" not in self.column_positions:
+                self.set_column(
+                    f"residual_load_{market_id}",
+                    self.calculate_residual_load_forecast(market_id=market_id),
                 )
 
     def get_registered_market_participants(self, market_id):
@@ -233,56 +526,87 @@ class CsvForecaster(Forecaster):
         )
         return self.powerplants_units
 
-    def calculate_residual_load_forecast(self, market_id) -> pd.Series:
+    def calculate_residual_load_forecast(
+        self, market_id: str, node: str | None = None
+    ) -> pd.Series:
         """
         This method calculates the residual demand forecast by subtracting the total available power from renewable energy (VRE) power plants from the overall demand forecast for each time step.
 
+        Args:
+            market_id (str): The market ID.
+            node (str | None, optional): Only units at this node are considered. Defaults to None.
+
         Returns:
             pd.Series: The residual demand forecast.
 
         Notes:
             1. Selects VRE power plants (wind_onshore, wind_offshore, solar) from the powerplants_units data.
-            2. Creates a DataFrame, vre_feed_in_df, with columns representing VRE power plants and initializes it with zeros.
-            3. Calculates the power feed-in for each VRE power plant based on its availability and maximum power.
-            4. Calculates the residual demand by subtracting the total VRE power feed-in from the overall demand forecast.
+            2. Calculates the power feed-in of the VRE power plants based on their availability and maximum power.
+            3. Calculates the residual demand by subtracting the total VRE power feed-in from the overall demand forecast.
         """
 
         vre_powerplants_units = self.powerplants_units[
             self.powerplants_units["technology"].isin(
                 ["wind_onshore", "wind_offshore", "solar"]
             )
-        ].copy()
-
-        vre_feed_in_df = pd.DataFrame(
-            index=self.index, columns=vre_powerplants_units.index, data=0.0
-        )
+        ]
+        if node is not None:
+            vre_powerplants_units = vre_powerplants_units[
+                vre_powerplants_units["node"] == node
+            ]
 
+        vre_feed_in = np.zeros(len(self.index))
         for pp, max_power in vre_powerplants_units["max_power"].items():
-            vre_feed_in_df[pp] = self.forecasts[f"availability_{pp}"] * max_power
+            vre_feed_in += self.get_array(f"availability_{pp}") * max_power
+
+        sum_demand = self.get_demand_forecast(market_id, node)
 
+        return pd.Series(sum_demand - vre_feed_in, index=self.index)
+
+    def get_demand_forecast(
+        self, market_id: str, node: str | None = None
+    ) -> np.ndarray:
+        """
+        Returns the summed demand of the demand units bidding on a market for each timestep.
+
+        Args:
+            market_id (str): The market ID.
+            node (str | None, optional): Only demand units at this node are considered. Defaults to None.
+
+        Returns:
+            numpy.ndarray: The summed demand.
+        """
         demand_units = self.demand_units[
             self.demand_units[f"bidding_{market_id}"].notnull()
         ]
-        sum_demand = self.forecasts[demand_units.index].sum(axis=1)
+        if node is not None:
+            demand_units = demand_units[demand_units["node"] == node]
 
-        res_demand_df = sum_demand - vre_feed_in_df.sum(axis=1)
+        sum_demand = np.zeros(len(self.index))
+        for unit in demand_units.index:
+            sum_demand += self.get_array(unit)
+        return sum_demand
 
-        return res_demand_df
-
-    def calculate_market_price_forecast(self, market_id):
+    def calculate_market_price_forecast(
+        self, market_id: str, node: str | None = None
+    ) -> pd.Series:
         """
         Calculates the merit order price forecast for the entire time horizon at once.
 
-        The method considers the infeed of renewables, residual demand, and the marginal costs of power plants to derive the price forecast.
+        The method considers the availability of the power plants, the demand, and the marginal costs of power plants to derive the price forecast.
+
+        Args:
+            market_id (str): The market ID.
+            node (str | None, optional): Only units at this node are considered. Defaults to None.
 
         Returns:
             pd.Series: The merit order price forecast.
 
         Notes:
             1. Calculates the marginal costs for each power plant based on fuel costs, efficiencies, emissions, and fixed costs.
-            2. Sorts the power plants based on their marginal costs and availability.
-            3. Computes the cumulative power of available power plants.
-            4. Determines the price forecast by iterating through the sorted power plants, setting the price for times that can still be provided with a specific technology and cheaper ones.
+            2. Calculates the available power of each power plant.
+            3. Sorts the power plants by their marginal costs in each timestep, see :func:`calculate_merit_order_price`.
+            4. The price is the marginal cost of the power plant which covers the demand in each timestep.
 
         TODO:
             Extend price forecasts for all markets, not just specified for the DAM.
@@ -290,44 +614,24 @@ class CsvForecaster(Forecaster):
 
         """
 
-        # calculate infeed of renewables and residual demand_df
-        # check if max_power is a series or a float
-
-        # select only those power plant units, which have a bidding strategy for the specifi market_id
+        # select only those power plant units, which have a bidding strategy for the specific market_id
         powerplants_units = self.powerplants_units[
             self.powerplants_units[f"bidding_{market_id}"].notnull()
         ]
-
-        marginal_costs = powerplants_units.apply(self.calculate_marginal_cost, axis=1).T
-        sorted_columns = marginal_costs.loc[self.index[0]].sort_values().index
-        col_availabilities = self.forecasts.columns[
-            self.forecasts.columns.str.startswith("availability")
-        ]
-        availabilities = self.forecasts[col_availabilities]
-        availabilities.columns = col_availabilities.str.replace("availability_", "")
-
-        power = self.powerplants_units.max_power * availabilities
-        cumsum_power = power[sorted_columns].cumsum(axis=1)
-
-        demand_units = self.demand_units[
-            self.demand_units[f"bidding_{market_id}"].notnull()
-        ]
-        sum_demand = self.forecasts[demand_units.index].sum(axis=1)
-
-        # initialize empty price_forecast
-        price_forecast = pd.Series(index=self.index, data=0.0)
-
-        # start with most expensive type (highest cumulative power)
-        for col in sorted_columns[::-1]:
-            # find times which can still be provided with this technology
-            # and cheaper once
-            cheaper = cumsum_power[col] > sum_demand
-            # set the price of this technology as the forecast price
-            # for these times
-            price_forecast.loc[cheaper] = marginal_costs[col].loc[cheaper]
-            # repeat with the next cheaper technology
-
-        return price_forecast
+        if node is not None:
+            powerplants_units = powerplants_units[powerplants_units["node"] == node]
+
+        # one column per power plant
+        marginal_costs = np.zeros((len(self.index), len(powerplants_units)))
+        power = np.zeros((len(self.index), len(powerplants_units)))
+        for i, (pp, pp_series) in enumerate(powerplants_units.iterrows()):
+            marginal_costs[:, i] = self.calculate_marginal_cost(pp_series)
+            power[:, i] = self.get_array(f"availability_{pp}") * pp_series["max_power"]
+
+        price_forecast = calculate_merit_order_price(
+            marginal_costs, power, self.get_demand_forecast(market_id, node)
+        )
+        return pd.Series(price_forecast, index=self.index)
 
     def calculate_marginal_cost(self, pp_series: pd.Series) -> pd.Series:
         """
@@ -352,14 +656,10 @@ class CsvForecaster(Forecaster):
             5. Aggregates the fuel cost, emissions cost, and fixed cost to obtain the marginal cost of the power plant.
         """
 
-        fp_column = f"fuel_price_{pp_series.fuel_type}"
-        if fp_column in self.forecasts.columns:
-            fuel_price = self.forecasts[fp_column]
-        else:
-            fuel_price = pd.Series(0.0, index=self.index)
+        fuel_price = self[f"fuel_price_{pp_series.fuel_type}"]
 
         emission_factor = pp_series["emission_factor"]
-        co2_price = self.forecasts["fuel_price_co2"]
+        co2_price = self["fuel_price_co2"]
 
         fuel_cost = fuel_price / pp_series["efficiency"]
         emissions_cost = co2_price * emission_factor / pp_series["efficiency"]
@@ -436,14 +736,16 @@ class RandomForecaster(CsvForecaster):
             column (str): The column of the forecast.
 
         Returns:
-            pd.Series: The forecast modified by random noise.
+            pd.Series: The forecast modified by random noise, read-only like the forecasts of the other forecasters.
 
         """
 
-        if column not in self.forecasts.columns:
-            return pd.Series(0.0, self.index)
+        if column not in self.column_positions:
+            return pd.Series(self.get_constant(0.0), self.index, copy=False)
         noise = np.random.normal(0, self.sigma, len(self.index))
-        return self.forecasts[column] * noise
+        values = self.get_array(column) * noise
+        values.flags.writeable = False
+        return pd.Series(values, self.index, copy=False)
 
 
 class NaiveForecast(Forecaster):
@@ -499,36 +801,45 @@ class NaiveForecast(Forecaster):
         self.co2_price = co2_price
         self.demand = demand
         self.price_forecast = price_forecast
+        self._parameter_arrays: dict[str, np.ndarray] = {}
 
-    def __getitem__(self, column: str) -> pd.Series:
+    def get_default(self, column: str) -> np.ndarray:
         """
         Retrieves forecasted values.
 
         This method retrieves the forecasted values for a specific column based on the
         provided parameters such as availability, fuel price, CO2 price, demand, and price
         forecast. If the column matches one of the predefined parameters, the corresponding
-        value is returned as a pandas Series. If the column does not match, a Series of zeros is returned.
+        values are returned. If the column does not match, zeros are returned.
+        The values of each parameter are created once and shared by all matching columns.
 
         Args:
             column (str): The column for which forecasted values are requested.
 
         Returns:
-            pd.Series: The forecasted values for the specified column.
+            numpy.ndarray: The read-only forecasted values for the specified column.
 
         """
 
         if "availability" in column:
-            value = self.availability
+            parameter = "availability"
         elif column == "fuel_price_co2":
-            value = self.co2_price
+            parameter = "co2_price"
         elif "fuel_price" in column:
-            value = self.fuel_price
+            parameter = "fuel_price"
         elif "demand" in column:
-            value = self.demand
+            parameter = "demand"
         elif column == "price_EOM":
-            value = self.price_forecast
+            parameter = "price_forecast"
         else:
-            value = 0
-        if isinstance(value, pd.Series):
-            value.index = self.index
-        return pd.Series(value, self.index)
+            return self.get_constant(0.0)
+
+        array = self._parameter_arrays.get(parameter)
+        if array is None:
+            value = getattr(self, parameter)
+            if isinstance(value, pd.Series):
+                value = value.to_numpy()
+            array = np.array(np.broadcast_to(value, len(self.index)), dtype=float)
+            array.flags.writeable = False
+            self._parameter_arrays[parameter] = array
+        return array
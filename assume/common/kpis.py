@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+AGGREGATIONS = ("sum", "avg", "min", "max", "count")
+
+
+class KpiAccumulator:
+    """
+    Streaming aggregation of a key performance indicator over the records of an output table.
+
+    The accumulator is updated with every batch of its table which is written by the output agent,
+    so that the KPI is available at the end of the simulation without reading the stored data again.
+    Like in SQL, missing values are ignored and groups without any value have no result.
+
+    Attributes:
+        table (str): The output table the KPI is calculated from.
+        value (str | Callable[[pandas.DataFrame], pandas.Series]): The column or a function calculating the values of a batch.
+        aggregation (str): The aggregation of the values, one of "sum", "avg", "min", "max" or "count".
+        group_by (str): The column by which the values are grouped, used as ident of the KPI.
+        sums (dict): The sum of the values of each group.
+        counts (dict): The number of values of each group.
+        mins (dict): The minimum of the values of each group.
+        maxs (dict): The maximum of the values of each group.
+
+    Args:
+        table (str): The output table the KPI is calculated from.
+        value (str | Callable[[pandas.DataFrame], pandas.Series]): The column or a function calculating the values of a batch.
+        aggregation (str, optional): The aggregation of the values. Defaults to "sum".
+        group_by (str, optional): The column by which the values are grouped. Defaults to "market_id".
+
+    Example:
+        >>> avg_price = KpiAccumulator("market_meta", "price", "avg")
+        >>> avg_price.update(market_meta_df)
+        >>> avg_price.result()
+        {'EOM': 49.5}
+    """
+
+    def __init__(
+        self,
+        table: str,
+        value: str | Callable[[pd.DataFrame], pd.Series],
+        aggregation: str = "sum",
+        group_by: str = "market_id",
+    ):
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(
+                f"unknown aggregation {aggregation}, use one of {AGGREGATIONS}"
+            )
+        self.table = table
+        self.value = value
+        self.aggregation = aggregation
+        self.group_by = group_by
+        self.sums: dict = {}
+        self.counts: dict = {}
+        self.mins: dict = {}
+        self.maxs: dict = {}
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Adds the values of a batch of the table.
+
+        Args:
+            df (pandas.DataFrame): The batch of the table.
+        """
+        if df.empty or self.group_by not in df.columns:
+            return
+        if callable(self.value):
+            values = self.value(df)
+        elif self.value in df.columns:
+            values = df[self.value]
+        else:
+            return
+
+        values = pd.to_numeric(values, errors="coerce").replace(
+            [np.inf, -np.inf], np.nan
+        )
+        stats = values.groupby(df[self.group_by].to_numpy()).agg(
+            ["sum", "count", "min", "max"]
+        )
+        for ident, total, count, minimum, maximum in stats.itertuples():
+            if not count:
+                continue
+            if ident in self.counts:
+                self.sums[ident] += total
+                self.counts[ident] += count
+                self.mins[ident] = min(self.mins[ident], minimum)
+                self.maxs[ident] = max(self.maxs[ident], maximum)
+            else:
+                self.sums[ident] = total
+                self.counts[ident] = count
+                self.mins[ident] = minimum
+                self.maxs[ident] = maximum
+
+    def result(self) -> dict:
+        """
+        Returns the value of the KPI for each group.
+
+        Returns:
+            dict: The value of the KPI by ident.
+        """
+        if self.aggregation == "sum":
+            return dict(self.sums)
+        if self.aggregation == "avg":
+            return {
+                ident: total / self.counts[ident] for ident, total in self.sums.items()
+            }
+        if self.aggregation == "min":
+            return dict(self.mins)
+        if self.aggregation == "max":
+            return dict(self.maxs)
+        return dict(self.counts)
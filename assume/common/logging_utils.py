@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+from collections import Counter, defaultdict
+
+
+class WarningSummary:
+    """
+    Counts repeated warnings per agent and reason and logs them as one summary.
+
+    Hot paths like the validation of orderbooks can produce the same warning for thousands of orders.
+    Instead of logging each of them, the occurrences are counted with :meth:`add` and logged once per
+    reason when :meth:`flush` is called, e.g. once per clearing. Nothing is counted or formatted if the
+    level is not enabled for the logger.
+
+    Attributes:
+        logger (logging.Logger): The logger to write the summary to.
+        level (int): The level of the summary.
+        max_agents (int): The maximum number of agents listed per reason.
+        counts (collections.Counter): The number of occurrences per agent and reason.
+
+    Args:
+        logger (logging.Logger): The logger to write the summary to.
+        level (int, optional): The level of the summary. Defaults to logging.WARNING.
+        max_agents (int, optional): The maximum number of agents listed per reason. Defaults to 5.
+
+    Example:
+        >>> summary = WarningSummary(logger)
+        >>> summary.add(agent_id, "price above maximum_bid_price", 3)
+        >>> summary.flush("market %s", market_id)
+    """
+
+    def __init__(
+        self, logger: logging.Logger, level: int = logging.WARNING, max_agents: int = 5
+    ):
+        self.logger = logger
+        self.level = level
+        self.max_agents = max_agents
+        self.counts = Counter()
+
+    def add(self, agent, reason: str, count: int = 1) -> None:
+        """
+        Counts occurrences of a warning.
+
+        Args:
+            agent: The agent which caused the warning.
+            reason (str): The reason of the warning.
+            count (int, optional): The number of occurrences. Defaults to 1.
+        """
+        if count and self.logger.isEnabledFor(self.level):
+            self.counts[agent, reason] += int(count)
+
+    def flush(self, msg: str = "", *args) -> None:
+        """
+        Logs one summary line per reason and resets the counts.
+
+        Args:
+            msg (str, optional): A prefix of the summary, formatted with args like a logging message.
+            *args: The arguments of the prefix.
+        """
+        if not self.counts:
+            return
+        by_reason = defaultdict(Counter)
+        for (agent, reason), count in self.counts.items():
+            by_reason[reason][agent] += count
+        self.counts = Counter()
+
+        prefix = msg % args if args else msg
+        for reason, agents in by_reason.items():
+            listed = ", ".join(
+                f"{agent}: {count}"
+                for agent, count in agents.most_common(self.max_agents)
+            )
+            if len(agents) > self.max_agents:
+                listed += f", ... ({len(agents) - self.max_agents} more agents)"
+            self.logger.log(
+                self.level,
+                "%s%s: %d times by %d agents (%s)",
+                f"{prefix} - " if prefix else "",
+                reason,
+                sum(agents.values()),
+                len(agents),
+                listed,
+            )
@@ -3,12 +3,28 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import pickle
-from datetime import datetime
+import struct
+from datetime import datetime, timedelta, timezone
 
-from mango.messages.codecs import JSON, GenericProtoMsg
+import numpy as np
+import pandas as pd
+from mango.messages.codecs import JSON, Codec, GenericProtoMsg
+from mango.messages.message import ACLMessage, Performatives, enum_serializer
+from pandas.api.types import infer_dtype, is_object_dtype
 
 from assume.common.utils import datetime2timestamp, timestamp2datetime
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    # pandas objects are sent as Arrow IPC streams if pyarrow is installed
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 
 def datetime_json_serializer():
     def __tostring__(dt: datetime):
@@ -45,7 +61,229 @@ def generic_pb_serializer():
     return object, __tostring__, __fromstring__
 
 
-def mango_codec_factory():
+EPOCH = datetime(1970, 1, 1)
+
+
+class MsgPack(Codec):
+    """
+    A binary :class:`mango.messages.codecs.Codec` based on msgpack.
+
+    Compared to the JSON codec, objects without a JSON representation are not pickled and hex encoded,
+    but written as msgpack extension types:
+
+    - datetimes and timedeltas as integer microseconds, pandas timestamps as integer nanoseconds
+    - numpy arrays as their raw buffer together with dtype and shape, decoded arrays are read-only views on the message
+    - pandas Series and DataFrames as Arrow IPC streams if pyarrow is installed, unless they contain objects
+      other than strings or can not be converted to Arrow, then they are pickled
+    - objects with a serializer added by :meth:`add_serializer`, e.g. the ACLMessage itself
+    - any other object is pickled as a fallback
+
+    Orders are plain dicts and are encoded as msgpack maps, so the datetimes used as keys of block orders are kept.
+    Unlike JSON, tuples like the agent_id of an order are decoded as tuples.
+    """
+
+    DATETIME = 1
+    TIMESTAMP = 2
+    TIMEDELTA = 3
+    NDARRAY = 4
+    DATAFRAME = 5
+    SERIES = 6
+    SERIALIZED = 7
+    PICKLE = 8
+    TUPLE = 9
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError(
+                "The msgpack codec requires msgpack, install it with `pip install msgpack`"
+            )
+        super().__init__()
+        self.add_serializer(*ACLMessage.__json_serializer__())
+        self.add_serializer(*enum_serializer(Performatives))
+
+    def encode(self, data) -> bytes:
+        # objects like the timestamps or agent ids of orders are often shared between many orders,
+        # so the extension of each object is only created once per message
+        memo = {}
+
+        def default(obj):
+            cached = memo.get(id(obj))
+            if cached is None:
+                # the object is kept in the memo, so that its id is not reused
+                cached = memo[id(obj)] = obj, self._default(obj, pack)
+            return cached[1]
+
+        def pack(obj):
+            # strict types pass tuples and subclasses of builtin types to the default hook
+            return msgpack.packb(
+                obj, default=default, use_bin_type=True, strict_types=True
+            )
+
+        return pack(data)
+
+    def decode(self, data: bytes):
+        # equal immutable extensions are only decoded once per message
+        memo = {}
+
+        def ext_hook(code, ext_data):
+            key = code, ext_data
+            obj = memo.get(key)
+            if obj is None:
+                obj = self._ext_hook(code, ext_data, unpack)
+                if code in (self.DATETIME, self.TIMEDELTA) or (
+                    code == self.TUPLE and _is_hashable(obj)
+                ):
+                    memo[key] = obj
+            return obj
+
+        def unpack(ext_data):
+            return msgpack.unpackb(
+                ext_data, ext_hook=ext_hook, raw=False, strict_map_key=False
+            )
+
+        return unpack(data)
+
+    def _default(self, obj, pack):
+        if type(obj) in self._serializers:
+            typeid, serialize = self._serializers[type(obj)]
+            return msgpack.ExtType(self.SERIALIZED, pack([typeid, serialize(obj)]))
+        if isinstance(obj, tuple):
+            return msgpack.ExtType(self.TUPLE, pack(list(obj)))
+        if isinstance(obj, pd.Timestamp):
+            tz = str(obj.tz) if obj.tz is not None else None
+            return msgpack.ExtType(self.TIMESTAMP, pack([obj.value, tz]))
+        if isinstance(obj, datetime):
+            offset = obj.utcoffset()
+            naive = obj.replace(tzinfo=None) - offset if offset is not None else obj
+            micros = (naive - EPOCH) // timedelta(microseconds=1)
+            if offset is None:
+                return msgpack.ExtType(self.DATETIME, struct.pack(">q", micros))
+            seconds = int(offset.total_seconds())
+            return msgpack.ExtType(self.DATETIME, struct.pack(">qi", micros, seconds))
+        if isinstance(obj, timedelta):
+            micros = obj // timedelta(microseconds=1)
+            return msgpack.ExtType(self.TIMEDELTA, struct.pack(">q", micros))
+        if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+            header = pack([obj.dtype.str, obj.shape])
+            buffer = np.ascontiguousarray(obj).data
+            return msgpack.ExtType(
+                self.NDARRAY,
+                struct.pack(">H", len(header)) + header + buffer.tobytes(),
+            )
+        if pa is not None and isinstance(obj, pd.DataFrame | pd.Series):
+            ipc = self._to_arrow(obj)
+            if ipc is not None:
+                return ipc
+        if isinstance(obj, np.generic):
+            return obj.item()
+        for base in (bool, int, float, str, bytes, dict, list):
+            if isinstance(obj, base):
+                return base(obj)
+        return msgpack.ExtType(self.PICKLE, pickle.dumps(obj))
+
+    def _ext_hook(self, code: int, data: bytes, unpack):
+        if code == self.DATETIME:
+            if len(data) == 8:
+                return EPOCH + timedelta(microseconds=struct.unpack(">q", data)[0])
+            micros, seconds = struct.unpack(">qi", data)
+            tz = timezone(timedelta(seconds=seconds))
+            return (
+                EPOCH + timedelta(microseconds=micros + seconds * 1_000_000)
+            ).replace(tzinfo=tz)
+        if code == self.TIMESTAMP:
+            value, tz = unpack(data)
+            return (
+                pd.Timestamp(value, tz="UTC").tz_convert(tz)
+                if tz
+                else pd.Timestamp(value)
+            )
+        if code == self.TIMEDELTA:
+            return timedelta(microseconds=struct.unpack(">q", data)[0])
+        if code == self.NDARRAY:
+            (header_len,) = struct.unpack(">H", data[:2])
+            dtype, shape = unpack(data[2 : 2 + header_len])
+            buffer = memoryview(data)[2 + header_len :]
+            return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape)
+        if code in (self.DATAFRAME, self.SERIES):
+            table = pa.ipc.open_stream(data).read_all()
+            metadata = table.schema.metadata
+            df = table.to_pandas()
+            if b"assume_freq" in metadata:
+                df.index.freq = metadata[b"assume_freq"].decode()
+            if code == self.SERIES:
+                series = df.iloc[:, 0]
+                series.name = metadata.get(b"assume_series_name", b"").decode() or None
+                return series
+            return df
+        if code == self.SERIALIZED:
+            typeid, serialized = unpack(data)
+            return self._deserializers[typeid](serialized)
+        if code == self.TUPLE:
+            return tuple(unpack(data))
+        if code == self.PICKLE:
+            return pickle.loads(data)
+        return msgpack.ExtType(code, data)
+
+    def _to_arrow(self, obj: pd.DataFrame | pd.Series):
+        if isinstance(obj, pd.Series):
+            if obj.name is not None and not isinstance(obj.name, str):
+                return None
+            code, df = self.SERIES, obj.to_frame(name="values")
+        else:
+            # arrow only supports string column names
+            if not all(isinstance(column, str) for column in obj.columns):
+                return None
+            code, df = self.DATAFRAME, obj
+        # objects other than strings, like dicts, are converted to other arrow types
+        # and would not be the same when decoded
+        for column, dtype in df.dtypes.items():
+            if not is_object_dtype(dtype):
+                continue
+            if infer_dtype(df[column], skipna=True) not in ("string", "empty"):
+                return None
+        try:
+            table = pa.Table.from_pandas(df)
+        except pa.ArrowException:
+            # e.g. an index of mixed types, the object is pickled instead
+            return None
+        # the series name and the frequency of the index are not part of the pandas metadata of arrow
+        metadata = dict(table.schema.metadata)
+        if code == self.SERIES and obj.name is not None:
+            metadata[b"assume_series_name"] = obj.name.encode()
+        if getattr(obj.index, "freq", None) is not None:
+            metadata[b"assume_freq"] = obj.index.freqstr.encode()
+        table = table.replace_schema_metadata(metadata)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return msgpack.ExtType(code, sink.getvalue().to_pybytes())
+
+
+def _is_hashable(obj) -> bool:
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def mango_codec_factory(codec: str = "json") -> Codec:
+    """
+    Creates the codec used to encode the messages between containers.
+
+    Args:
+        codec (str, optional): The name of the codec, either "json" or "msgpack". Defaults to "json".
+
+    Returns:
+        mango.messages.codecs.Codec: The codec.
+
+    Raises:
+        ValueError: If the codec is unknown.
+    """
+    if codec == "msgpack":
+        return MsgPack()
+    if codec != "json":
+        raise ValueError(f"Unknown codec '{codec}', use 'json' or 'msgpack'")
     codec = JSON()
     codec.add_serializer(*datetime_json_serializer())
     codec.add_serializer(*generic_json_serializer())
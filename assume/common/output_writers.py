@@ -0,0 +1,800 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import hashlib
+import io
+import logging
+import re
+from collections.abc import Callable, Collection, Iterable, Sequence
+from itertools import repeat
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import (
+    infer_dtype,
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+)
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# declared columns of the output tables, further columns are added when they are first written
+TABLE_SCHEMAS: dict[str, dict[str, str]] = {
+    "market_meta": {
+        "index": "bigint",
+        "supply_volume": "double precision",
+        "demand_volume": "double precision",
+        "demand_volume_energy": "double precision",
+        "supply_volume_energy": "double precision",
+        "price": "double precision",
+        "max_price": "double precision",
+        "min_price": "double precision",
+        "node": "text",
+        "product_start": "timestamp",
+        "product_end": "timestamp",
+        "only_hours": "text",
+        "market_id": "text",
+        "time": "timestamp",
+        "simulation": "text",
+    },
+    "market_orders": {
+        "start_time": "timestamp",
+        "end_time": "timestamp",
+        "price": "double precision",
+        "volume": "double precision",
+        "accepted_price": "double precision",
+        "accepted_volume": "double precision",
+        "bid_id": "text",
+        "unit_id": "text",
+        "bid_type": "text",
+        "node": "text",
+        "simulation": "text",
+        "market_id": "text",
+    },
+    "market_dispatch": {
+        "index": "bigint",
+        "datetime": "timestamp",
+        "power": "double precision",
+        "market_id": "text",
+        "unit_id": "text",
+        "simulation": "text",
+    },
+    "unit_dispatch": {
+        "index": "timestamp",
+        "power": "double precision",
+        "unit": "text",
+        "simulation": "text",
+    },
+    "rl_params": {
+        "datetime": "timestamp",
+        "unit": "text",
+        "profit": "double precision",
+        "reward": "double precision",
+        "regret": "double precision",
+        "simulation": "text",
+        "learning_mode": "boolean",
+        "perform_evaluation": "boolean",
+        "episode": "bigint",
+    },
+}
+
+# nullable columns of the parquet export which are only written by some units and market mechanisms
+PARQUET_OPTIONAL_COLUMNS: dict[str, dict[str, str]] = {
+    "market_orders": {
+        "min_acceptance_ratio": "double precision",
+        "max_power": "double precision",
+        "min_power": "double precision",
+        "parent_bid_id": "text",
+        "block_id": "text",
+        "link": "text",
+        "exclusive_id": "text",
+    },
+    "unit_dispatch": {
+        "energy_cashflow": "double precision",
+        "total_costs": "double precision",
+        "soc": "double precision",
+        "capacity_pos_cashflow": "double precision",
+        "capacity_neg_cashflow": "double precision",
+    },
+}
+
+# nullable column families of the parquet export, like the actions of the learning strategies,
+# whose number depends on the learning config, and the outputs of each product type of the units
+PARQUET_COLUMN_PATTERNS: dict[str, dict[str, str]] = {
+    # the units operator exports the outputs which contain one of its UNIT_DISPATCH_OUTPUTS
+    "unit_dispatch": {
+        r".*(soc|cashflow|marginal_costs|total_costs).*": "double precision",
+    },
+    "rl_params": {
+        r"actions_\d+": "double precision",
+        r"exploration_noise_\d+": "double precision",
+    },
+}
+
+# indexes of the output tables used by the KPIs and dashboards
+TABLE_INDEXES: dict[str, list[tuple[str, ...]]] = {
+    "market_meta": [("simulation", "market_id", "time")],
+    "market_orders": [
+        ("simulation", "market_id", "start_time"),
+        ("simulation", "unit_id", "start_time"),
+    ],
+    "market_dispatch": [
+        ("simulation", "market_id", "datetime"),
+        ("simulation", "unit_id", "datetime"),
+    ],
+    "unit_dispatch": [("simulation", "unit", "index")],
+    "rl_params": [("simulation", "episode", "unit")],
+}
+
+# stores the mode of the managed output schema of a database
+SCHEMA_TABLE = "assume_schema"
+SCHEMA_MODES = ("indexed", "partitioned")
+
+
+def get_sql_type(series: pd.Series) -> str:
+    """
+    Returns the PostgreSQL type of a column.
+
+    Args:
+        series (pandas.Series): The column.
+
+    Returns:
+        str: The name of the PostgreSQL type.
+    """
+    if is_bool_dtype(series):
+        return "boolean"
+    if is_integer_dtype(series):
+        return "bigint"
+    if is_float_dtype(series):
+        return "double precision"
+    if is_datetime64_any_dtype(series):
+        return "timestamp"
+    inferred = infer_dtype(series, skipna=True)
+    if inferred in ("datetime", "datetime64"):
+        return "timestamp"
+    if inferred == "boolean":
+        return "boolean"
+    if inferred in ("floating", "integer", "mixed-integer-float", "decimal"):
+        return "double precision"
+    return "text"
+
+
+def get_arrow_type(sql_type: str) -> "pa.DataType":
+    """
+    Returns the parquet type of a PostgreSQL type.
+
+    Args:
+        sql_type (str): The name of the PostgreSQL type.
+
+    Returns:
+        pyarrow.DataType: The type of the parquet column.
+    """
+    arrow_types = {
+        "bigint": pa.int64(),
+        "double precision": pa.float64(),
+        "text": pa.string(),
+        "timestamp": pa.timestamp("ns"),
+        "boolean": pa.bool_(),
+    }
+    return arrow_types[sql_type]
+
+
+def get_arrow_schema(table: str) -> "pa.Schema | None":
+    """
+    Returns the parquet schema of a declared output table.
+
+    Args:
+        table (str): The name of the table.
+
+    Returns:
+        pyarrow.Schema | None: The declared and optional columns of the table, None if the table is not declared.
+    """
+    if table not in TABLE_SCHEMAS:
+        return None
+    columns = {**TABLE_SCHEMAS[table], **PARQUET_OPTIONAL_COLUMNS.get(table, {})}
+    return pa.schema(
+        [
+            pa.field(column, get_arrow_type(sql_type), nullable=True)
+            for column, sql_type in columns.items()
+        ]
+    )
+
+
+class ColumnBuffer:
+    """
+    Append-only column buffer of one output table.
+
+    The handlers of the output agent append the raw records of each message to one list per column,
+    instead of creating a data frame per message. A single data frame is materialised per flush with
+    :meth:`to_frame`. Columns which are missing in a record are filled with None, columns which appear
+    later are padded for the earlier rows. The order of the columns is kept by :meth:`take`, so that
+    every flush of a table has the same columns in the same order.
+
+    Attributes:
+        columns (dict[str, list]): The buffered values of each column.
+        index (str | None): The column which is used as index of the data frame, a column named ``index`` is used as unnamed index.
+        skip (Collection[str]): The keys of the records which are not stored.
+        converters (dict[str, Callable]): Functions applied to the values of a column when the data frame is created.
+
+    Args:
+        columns (Iterable[str], optional): The declared columns of the table. Defaults to ().
+        index (str, optional): The column which is used as index of the data frame. Defaults to None.
+        skip (Collection[str], optional): The keys of the records which are not stored. Defaults to ().
+        converters (dict[str, Callable], optional): Functions applied to the values of a column
+            when the data frame is created. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        columns: Iterable[str] = (),
+        index: str | None = None,
+        skip: Collection[str] = (),
+        converters: dict[str, Callable] | None = None,
+    ):
+        self.columns: dict[str, list] = {column: [] for column in columns}
+        self.index = index
+        self.skip = skip
+        self.converters = converters or {}
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, record: dict, **values) -> None:
+        """
+        Appends a record.
+
+        Args:
+            record (dict): The values of the record by column.
+            **values: Values of further columns, which override the record.
+        """
+        self.extend([record], **values)
+
+    def extend(self, records: Sequence[dict], **values) -> None:
+        """
+        Appends records.
+
+        Args:
+            records (Sequence[dict]): The records, each mapping the columns to its values.
+            **values: Values of further columns which are the same for all records.
+        """
+        if not records:
+            return
+        for record in records:
+            for column in record:
+                if column not in self.columns and column not in self.skip:
+                    self._add_column(column)
+        for column in values:
+            if column not in self.columns:
+                self._add_column(column)
+
+        n = len(records)
+        for column, data in self.columns.items():
+            if column in values:
+                data.extend(repeat(values[column], n))
+            else:
+                data.extend([record.get(column) for record in records])
+        self.length += n
+
+    def extend_rows(
+        self, rows: Sequence[Sequence], columns: Sequence[str], **values
+    ) -> None:
+        """
+        Appends rows given as sequences of values.
+
+        Args:
+            rows (Sequence[Sequence]): The rows, each containing a value for each of the columns.
+            columns (Sequence[str]): The columns of the values in the rows.
+            **values: Values of further columns which are the same for all rows.
+        """
+        if not rows:
+            return
+        for column in (*columns, *values):
+            if column not in self.columns:
+                self._add_column(column)
+
+        n = len(rows)
+        given = dict(zip(columns, zip(*rows)))
+        for column, data in self.columns.items():
+            if column in values:
+                data.extend(repeat(values[column], n))
+            elif column in given:
+                data.extend(given[column])
+            else:
+                data.extend(repeat(None, n))
+        self.length += n
+
+    def take(self) -> "ColumnBuffer":
+        """
+        Moves the buffered records into a new buffer and empties this buffer.
+
+        Returns:
+            ColumnBuffer: The buffer holding the records.
+        """
+        taken = ColumnBuffer(
+            index=self.index, skip=self.skip, converters=self.converters
+        )
+        taken.columns = self.columns
+        taken.length = self.length
+        self.columns = {column: [] for column in taken.columns}
+        self.length = 0
+        return taken
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Creates a data frame of the buffered records.
+
+        Returns:
+            pandas.DataFrame: The records, indexed by the index column if it is given.
+        """
+        df = pd.DataFrame(self.columns)
+        for column, converter in self.converters.items():
+            if column in df.columns:
+                df[column] = df[column].map(converter, na_action="ignore")
+        if self.index in df.columns:
+            df = df.set_index(self.index)
+            if self.index == "index":
+                # like a default index, which is written as index column to the database
+                df.index.name = None
+        return df
+
+    def _add_column(self, column: str) -> None:
+        self.columns[column] = [None] * self.length
+
+
+class ParquetTableWriter:
+    """
+    Streams the batches of one output table into Parquet files.
+
+    The table is stored as a directory of Parquet files, which can be read at once with ``pandas.read_parquet``.
+    The schema of a declared table consists of the columns of :data:`TABLE_SCHEMAS` and the nullable columns of
+    :data:`PARQUET_OPTIONAL_COLUMNS`, the schema of other tables starts empty.
+    Columns which are not part of the schema are added with the type of :data:`PARQUET_COLUMN_PATTERNS`
+    or the type of the batch, columns which only contain None are stored as strings.
+    As the schema of a file is fixed, a batch which adds columns after the first write starts a new file.
+    The schema of the last file contains all columns, so that the table is read with
+    ``pandas.read_parquet(path, schema=pyarrow.parquet.read_schema(last_file))`` in that case.
+    Every batch is cast to the schema, columns which are missing in a batch are filled with nulls.
+    Each batch is written as a row group, so that the data is on disk after every save interval.
+    String columns like ids are dictionary encoded.
+
+    Attributes:
+        path (pathlib.Path): The directory of the table.
+        schema (pyarrow.Schema | None): The schema of the table.
+        part (int): The number of the current file.
+
+    Args:
+        path (str | pathlib.Path): The directory of the parquet export.
+        table_name (str): The name of the table.
+    """
+
+    def __init__(self, path: str | Path, table_name: str):
+        if pa is None:
+            raise ImportError(
+                "The parquet export requires pyarrow, install it with `pip install pyarrow`"
+            )
+        self.path = Path(path, table_name)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.schema = get_arrow_schema(table_name) or pa.schema([])
+        self.patterns = PARQUET_COLUMN_PATTERNS.get(table_name, {})
+        self.part = 0
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Writes a batch of the table as a row group.
+
+        Args:
+            df (pandas.DataFrame): The batch, a named index is stored as a column.
+        """
+        table = self._to_arrow(df)
+        new_fields = [
+            self._new_field(field)
+            for field in table.schema
+            if field.name not in self.schema.names
+        ]
+        if new_fields:
+            # the schema of an open file can not be changed, the wider schema is written to a new file
+            self.close()
+            self.schema = pa.schema([*self.schema, *new_fields])
+        table = self._cast(table)
+        if self._writer is None:
+            self._open()
+        self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+
+    def close(self) -> None:
+        """
+        Closes the current file, a following write starts a new file.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self.part += 1
+
+    def _open(self) -> None:
+        string_columns = [
+            field.name
+            for field in self.schema
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+        ]
+        self._writer = pq.ParquetWriter(
+            self.path / f"part-{self.part:05d}.parquet",
+            self.schema,
+            use_dictionary=string_columns,
+        )
+
+    def _to_arrow(self, df: pd.DataFrame) -> "pa.Table":
+        # a default integer index carries no information unless it is a declared column
+        declared_index = "index" in self.schema.names
+        if df.index.name is None and declared_index:
+            df = df.rename_axis("index").reset_index()
+        elif df.index.name is None and is_integer_dtype(df.index):
+            df = df.reset_index(drop=True)
+        else:
+            df = df.reset_index()
+        df.columns = [str(column) for column in df.columns]
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # objects without an arrow type are stored as their string representation
+            for column in df.select_dtypes(include="object").columns:
+                df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        return table.replace_schema_metadata(None)
+
+    def _new_field(self, field: "pa.Field") -> "pa.Field":
+        for pattern, sql_type in self.patterns.items():
+            if re.fullmatch(pattern, field.name):
+                return pa.field(field.name, get_arrow_type(sql_type), nullable=True)
+        if pa.types.is_null(field.type):
+            # columns which only contain None are stored as strings
+            return pa.field(field.name, pa.string(), nullable=True)
+        return field
+
+    def _cast(self, table: "pa.Table") -> "pa.Table":
+        columns = [
+            table[field.name].cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in self.schema
+        ]
+        return pa.Table.from_arrays(columns, schema=self.schema)
+
+
+class PostgresCopyWriter:
+    """
+    Writes output tables to PostgreSQL using ``COPY ... FROM STDIN``.
+
+    The declared tables of :data:`TABLE_SCHEMAS` and their indexes are created by :meth:`prepare`.
+    The columns of each table are read once from the database, so that columns which are not declared
+    can be added before they are first written, instead of reacting to failed inserts.
+    Each batch is streamed as CSV through a connection of the pool of the engine.
+
+    Attributes:
+        db (sqlalchemy.engine.Engine): The database engine.
+        columns (dict[str, set[str]]): The known columns of each table.
+
+    Args:
+        db_engine (sqlalchemy.engine.Engine): The database engine, has to use PostgreSQL with psycopg2.
+    """
+
+    def __init__(self, db_engine):
+        self.db = db_engine
+        self.columns: dict[str, set[str]] = {}
+
+    def prepare(self) -> None:
+        """
+        Creates the declared tables and their indexes if they do not exist yet.
+        """
+        with self.db.begin() as db:
+            for table, columns in TABLE_SCHEMAS.items():
+                db.execute(text(create_table_statement(table, columns)))
+                for index_columns in TABLE_INDEXES.get(table, []):
+                    db.execute(text(create_index_statement(table, index_columns)))
+
+    def write(self, table: str, df: pd.DataFrame) -> None:
+        """
+        Appends a data frame to a table, the index is written as a column like ``DataFrame.to_sql`` does.
+
+        Args:
+            table (str): The name of the table.
+            df (pandas.DataFrame): The data to be written.
+        """
+        df = df.reset_index()
+        df.columns = [str(column) for column in df.columns]
+        self.ensure_columns(table, df)
+
+        buffer = io.StringIO()
+        df.to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+
+        connection = self.db.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f'COPY "{table}" ({columns}) FROM STDIN WITH (FORMAT csv)', buffer
+                )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            # returns the connection to the pool
+            connection.close()
+
+    def ensure_columns(self, table: str, df: pd.DataFrame) -> None:
+        """
+        Creates the table or adds the columns of the data frame which are missing in the table.
+
+        Args:
+            table (str): The name of the table.
+            df (pandas.DataFrame): The data to be written.
+        """
+        if table not in self.columns:
+            with self.db.begin() as db:
+                rows = db.execute(
+                    text(
+                        "select column_name from information_schema.columns where table_name = :table"
+                    ),
+                    {"table": table},
+                ).fetchall()
+            self.columns[table] = {row[0] for row in rows}
+
+        missing = [column for column in df.columns if column not in self.columns[table]]
+        if not missing:
+            return
+        with self.db.begin() as db:
+            if not self.columns[table]:
+                columns = {column: get_sql_type(df[column]) for column in df.columns}
+                db.execute(text(create_table_statement(table, columns)))
+            else:
+                for column in missing:
+                    db.execute(
+                        text(
+                            f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS "{column}" {get_sql_type(df[column])}'
+                        )
+                    )
+        self.columns[table].update(missing)
+
+
+def create_table_statement(table: str, columns: dict[str, str]) -> str:
+    """
+    Returns the statement to create a table if it does not exist.
+
+    Args:
+        table (str): The name of the table.
+        columns (dict[str, str]): The PostgreSQL types by column name.
+
+    Returns:
+        str: The SQL statement.
+    """
+    definitions = ", ".join(
+        f'"{column}" {sql_type}' for column, sql_type in columns.items()
+    )
+    return f'CREATE TABLE IF NOT EXISTS "{table}" ({definitions})'
+
+
+def create_index_statement(table: str, columns: tuple[str, ...]) -> str:
+    """
+    Returns the statement to create an index if it does not exist.
+
+    Args:
+        table (str): The name of the table.
+        columns (tuple[str, ...]): The indexed columns.
+
+    Returns:
+        str: The SQL statement.
+    """
+    name = "_".join((table, *columns, "idx"))
+    indexed = ", ".join(f'"{column}"' for column in columns)
+    return f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({indexed})'
+
+
+def partition_name(table: str, simulation: str) -> str:
+    """
+    Returns the name of the partition of a table holding the outputs of a simulation.
+
+    The simulation id is hashed, as it can contain any characters and identifiers are limited in length.
+
+    Args:
+        table (str): The name of the table.
+        simulation (str): The id of the simulation.
+
+    Returns:
+        str: The name of the partition.
+    """
+    digest = hashlib.md5(simulation.encode()).hexdigest()[:16]
+    return f"{table}_{digest}"
+
+
+def create_partition_statement(table: str, simulation: str) -> str:
+    """
+    Returns the statement to create the partition of a simulation if it does not exist.
+
+    Args:
+        table (str): The name of the partitioned table.
+        simulation (str): The id of the simulation.
+
+    Returns:
+        str: The SQL statement.
+    """
+    value = simulation.replace("'", "''")
+    return f'CREATE TABLE IF NOT EXISTS "{partition_name(table, simulation)}" PARTITION OF "{table}" FOR VALUES IN (\'{value}\')'
+
+
+def is_managed_table(table: str) -> bool:
+    """
+    Checks if a table is part of the managed output schema, including the partitions of the tables.
+
+    Args:
+        table (str): The name of the table.
+
+    Returns:
+        bool: True if the table is managed.
+    """
+    if table == SCHEMA_TABLE or table in TABLE_SCHEMAS:
+        return True
+    return any(
+        re.fullmatch(rf"{managed}_([0-9a-f]{{16}}|default)", table)
+        for managed in TABLE_SCHEMAS
+    )
+
+
+def get_schema_mode(db_engine) -> str | None:
+    """
+    Returns the mode of the managed output schema of a database.
+
+    Args:
+        db_engine (sqlalchemy.engine.Engine): The database engine.
+
+    Returns:
+        str | None: "indexed" or "partitioned", None if the schema has not been migrated.
+    """
+    try:
+        with db_engine.begin() as db:
+            row = db.execute(text(f'SELECT mode FROM "{SCHEMA_TABLE}"')).fetchone()
+    except (ProgrammingError, OperationalError):
+        return None
+    return row[0] if row else None
+
+
+def migrate_output_schema(db_engine, partitioned: bool = False) -> str:
+    """
+    Migrates the output tables of a database to the managed schema. This only needs to be run once per database.
+
+    The declared tables of :data:`TABLE_SCHEMAS` are created with the composite indexes of :data:`TABLE_INDEXES`,
+    which start with the simulation, so that the single column indexes on the simulation are dropped.
+    With ``partitioned``, the tables use PostgreSQL list partitioning by simulation with one partition per
+    simulation and a default partition. Existing tables are converted and their data is moved to the partitions.
+    Removing the outputs of a simulation then drops its partitions instead of deleting the rows.
+
+    Args:
+        db_engine (sqlalchemy.engine.Engine): The database engine.
+        partitioned (bool, optional): Whether the tables are partitioned by simulation, requires PostgreSQL. Defaults to False.
+
+    Returns:
+        str: The mode of the schema, "indexed" or "partitioned".
+    """
+    if partitioned and db_engine.dialect.name != "postgresql":
+        raise ValueError("partitioning the output tables requires PostgreSQL")
+    mode = "partitioned" if partitioned else "indexed"
+
+    with db_engine.begin() as db:
+        existing_tables = set(inspect(db).get_table_names())
+        for table, columns in TABLE_SCHEMAS.items():
+            if partitioned:
+                partition_table(db, table, columns, table in existing_tables)
+            elif table not in existing_tables:
+                db.execute(text(create_table_statement(table, columns)))
+            for index_columns in TABLE_INDEXES.get(table, []):
+                db.execute(text(create_index_statement(table, index_columns)))
+            # covered by the composite indexes
+            db.execute(text(f'DROP INDEX IF EXISTS "{table}_scenario"'))
+
+        db.execute(text(f'CREATE TABLE IF NOT EXISTS "{SCHEMA_TABLE}" (mode text)'))
+        db.execute(text(f'DELETE FROM "{SCHEMA_TABLE}"'))
+        db.execute(
+            text(f'INSERT INTO "{SCHEMA_TABLE}" (mode) VALUES (:mode)'), {"mode": mode}
+        )
+    logger.info("migrated output schema to %s mode", mode)
+    return mode
+
+
+def partition_table(db, table: str, columns: dict[str, str], exists: bool) -> None:
+    """
+    Creates a table partitioned by simulation or converts an existing table.
+
+    Args:
+        db (sqlalchemy.engine.Connection): The connection of the migration.
+        table (str): The name of the table.
+        columns (dict[str, str]): The declared PostgreSQL types by column name.
+        exists (bool): Whether the table exists already.
+    """
+    if exists:
+        is_partitioned = db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"
+            ),
+            {"table": table},
+        ).first()
+        if is_partitioned:
+            return
+        rows = db.execute(
+            text(
+                "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = :table ORDER BY ordinal_position"
+            ),
+            {"table": table},
+        ).fetchall()
+        # the types of the existing columns are kept
+        columns = {**columns, **dict(rows)}
+        legacy = f"{table}_unpartitioned"
+        db.execute(text(f'ALTER TABLE "{table}" RENAME TO "{legacy}"'))
+
+    db.execute(
+        text(create_table_statement(table, columns) + " PARTITION BY LIST (simulation)")
+    )
+    db.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS "{table}_default" PARTITION OF "{table}" DEFAULT'
+        )
+    )
+    if not exists:
+        return
+
+    simulations = db.execute(
+        text(f'SELECT DISTINCT simulation FROM "{legacy}" WHERE simulation IS NOT NULL')
+    ).fetchall()
+    for (simulation,) in simulations:
+        db.execute(text(create_partition_statement(table, simulation)))
+    column_list = ", ".join(f'"{column}"' for column in dict(rows))
+    db.execute(
+        text(
+            f'INSERT INTO "{table}" ({column_list}) SELECT {column_list} FROM "{legacy}"'
+        )
+    )
+    db.execute(text(f'DROP TABLE "{legacy}"'))
+
+
+def clear_simulation(db_engine, simulation: str, mode: str) -> None:
+    """
+    Removes the outputs of a simulation from the tables of the managed schema.
+
+    In the partitioned mode, the partitions of the simulation are dropped and created again.
+
+    Args:
+        db_engine (sqlalchemy.engine.Engine): The database engine.
+        simulation (str): The id of the simulation.
+        mode (str): The mode of the schema, "indexed" or "partitioned".
+    """
+    with db_engine.begin() as db:
+        for table in TABLE_SCHEMAS:
+            if mode == "partitioned":
+                db.execute(
+                    text(f'DROP TABLE IF EXISTS "{partition_name(table, simulation)}"')
+                )
+                # rows written before the partition existed
+                db.execute(
+                    text(
+                        f'DELETE FROM "{table}_default" WHERE simulation = :simulation'
+                    ),
+                    {"simulation": simulation},
+                )
+                db.execute(text(create_partition_statement(table, simulation)))
+            else:
+                db.execute(
+                    text(f'DELETE FROM "{table}" WHERE simulation = :simulation'),
+                    {"simulation": simulation},
+                )
@@ -2,12 +2,15 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import asyncio
 import logging
 import shutil
 from collections import defaultdict
 from datetime import datetime
 from multiprocessing import Lock
 from pathlib import Path
+from queue import Full, Queue
+from threading import Thread
 from typing import TypedDict
 
 import numpy as np
@@ -19,7 +22,17 @@ from psycopg2.errors import UndefinedColumn
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import DataError, OperationalError, ProgrammingError
 
+from assume.common.kpis import KpiAccumulator
 from assume.common.market_objects import MetaDict
+from assume.common.output_writers import (
+    TABLE_SCHEMAS,
+    ColumnBuffer,
+    ParquetTableWriter,
+    PostgresCopyWriter,
+    clear_simulation,
+    get_schema_mode,
+    is_managed_table,
+)
 from assume.common.utils import check_for_tensors, separate_orders
 
 logger = logging.getLogger(__name__)
@@ -41,10 +54,14 @@ class WriteOutput(Role):
         end (datetime.datetime): The end datetime of the simulation run.
         db_engine: The database engine. Defaults to None.
         export_csv_path (str, optional): The path for exporting CSV files, no path results in not writing the csv. Defaults to "".
+        export_parquet_path (str, optional): The path for exporting Parquet files, no path results in not writing parquet. Defaults to "".
         save_frequency_hours (int): The frequency in hours for storing data in the db and/or csv files. Defaults to None.
         learning_mode (bool, optional): Indicates if the simulation is in learning mode. Defaults to False.
         perform_evaluation (bool, optional): Indicates if the simulation is in evaluation mode. Defaults to False.
-        additional_kpis (dict[str, OutputDef], optional): makes it possible to define additional kpis evaluated
+        additional_kpis (dict[str, OutputDef | KpiAccumulator], optional): makes it possible to define additional kpis evaluated
+            at the end of the simulation, either accumulated from the written outputs or queried from the database.
+        writer_queue_size (int, optional): The number of save intervals which can be queued for the writer thread
+            before the simulation waits for the writer. 0 writes directly in the event loop. Defaults to 2.
     """
 
     def __init__(
@@ -57,7 +74,9 @@ class WriteOutput(Role):
         save_frequency_hours: int = None,
         learning_mode: bool = False,
         perform_evaluation: bool = False,
-        additional_kpis: dict[str, OutputDef] = {},
+        additional_kpis: dict[str, OutputDef | KpiAccumulator] = {},
+        export_parquet_path: str = "",
+        writer_queue_size: int = 2,
     ):
         super().__init__()
 
@@ -74,7 +93,18 @@ class WriteOutput(Role):
         else:
             self.export_csv_path = None
 
+        # each table is streamed into parquet files by its own writer
+        if export_parquet_path:
+            self.export_parquet_path = Path(export_parquet_path, simulation_id)
+            shutil.rmtree(self.export_parquet_path, ignore_errors=True)
+            self.export_parquet_path.mkdir(parents=True)
+        else:
+            self.export_parquet_path = None
+        self.parquet_writers: dict[str, ParquetTableWriter] = {}
+
         self.db = db_engine
+        # the mode of the managed output schema, if the database has been migrated
+        self.schema_mode = get_schema_mode(self.db) if self.db is not None else None
 
         self.learning_mode = learning_mode
         self.perform_evaluation = perform_evaluation
@@ -95,39 +125,102 @@ class WriteOutput(Role):
         self.end = end
         # initalizes dfs for storing and writing asynchron
         self.write_dfs: dict = defaultdict(list)
+        # records of the messages are appended to column buffers, one data frame is created per flush
+        self.write_buffers: dict[str, ColumnBuffer] = {
+            "market_orders": self.create_buffer(
+                "market_orders",
+                index="start_time",
+                skip=("only_hours", "agent_id"),
+                converters={
+                    "eligible_lambda": lambda x: x.__name__,
+                    "evaluation_frequency": repr,
+                },
+            ),
+            "market_meta": self.create_buffer("market_meta"),
+            "market_dispatch": self.create_buffer("market_dispatch"),
+            "rl_params": self.create_buffer("rl_params", index="datetime"),
+        }
         self.locks = defaultdict(lambda: Lock())
+        # the buffered data is written by a background thread
+        self.writer_queue_size = writer_queue_size
+        self.writer_queue = Queue(maxsize=writer_queue_size)
+        # keeps the batches in order while one of them waits for a free queue slot
+        self.writer_queue_lock = asyncio.Lock()
+        self.writer_thread = None
+        # the first error of the writer thread, raised again in the event loop
+        self.writer_error = None
 
         if self.db is not None:
             self.delete_db_scenario(self.simulation_id)
 
-        self.kpi_defs: dict[str, OutputDef] = {
-            "avg_price": {
-                "value": "avg(price)",
-                "from_table": "market_meta",
-            },
-            "total_cost": {
-                "value": "sum(price*demand_volume_energy)",
-                "from_table": "market_meta",
-            },
-            "total_volume": {
-                "value": "sum(demand_volume_energy)",
-                "from_table": "market_meta",
-            },
-            "capacity_factor": {
-                "value": "avg(power/max_power)",
-                "from_table": 'market_dispatch ud join power_plant_meta um on ud.unit_id = um."index" and ud.simulation=um.simulation',
-                "group_bys": ["market_id", "variable"],
-            },
+        # PostgreSQL tables are created up front and written with COPY
+        self.copy_writer = None
+        if self.db is not None and self.db.dialect.name == "postgresql":
+            self.copy_writer = PostgresCopyWriter(self.db)
+            # the tables of a managed schema exist already
+            if self.schema_mode is None:
+                self.copy_writer.prepare()
+
+        # KPIs are accumulated while the outputs are written
+        self.unit_max_power: dict[str, float] = {}
+        self.kpi_accumulators: dict[str, KpiAccumulator] = {
+            "avg_price": KpiAccumulator("market_meta", "price", "avg"),
+            "total_cost": KpiAccumulator(
+                "market_meta", lambda df: df["price"] * df["demand_volume_energy"]
+            ),
+            "total_volume": KpiAccumulator("market_meta", "demand_volume_energy"),
+            "capacity_factor": KpiAccumulator(
+                "market_dispatch",
+                lambda df: df["power"] / df["unit_id"].map(self.unit_max_power),
+                "avg",
+            ),
         }
-        self.kpi_defs.update(additional_kpis)
+        if self.episode:
+            for column in ["reward", "regret", "profit"]:
+                self.kpi_accumulators[f"sum_{column}"] = KpiAccumulator(
+                    "rl_params", column, group_by="simulation"
+                )
+        # KPIs defined as SQL are queried from the database at the end of the simulation
+        self.kpi_defs: dict[str, OutputDef] = {}
+        for variable, kpi_def in additional_kpis.items():
+            if isinstance(kpi_def, KpiAccumulator):
+                self.kpi_defs.pop(variable, None)
+                self.kpi_accumulators[variable] = kpi_def
+            else:
+                self.kpi_accumulators.pop(variable, None)
+                self.kpi_defs[variable] = kpi_def
+
+    @staticmethod
+    def create_buffer(table: str, index: str | None = None, **kwargs) -> ColumnBuffer:
+        """
+        Creates the column buffer of a table with the declared columns of the table.
+
+        Args:
+            table (str): The name of the table.
+            index (str, optional): The column which is used as index. Defaults to None.
+            **kwargs: Further arguments of the ColumnBuffer.
+
+        Returns:
+            ColumnBuffer: The empty buffer.
+        """
+        # the default index is created when the data frame is materialised
+        columns = [
+            column for column in TABLE_SCHEMAS.get(table, {}) if column != "index"
+        ]
+        return ColumnBuffer(columns, index=index, **kwargs)
 
     def delete_db_scenario(self, simulation_id: str):
         """
         Deletes all data from the database for the given simulation id.
 
+        The tables of a managed output schema are cleared by dropping the partitions of the simulation
+        or by using the composite indexes, see :func:`assume.common.output_writers.migrate_output_schema`.
+
         Args:
             simulation_id (str): The ID of the simulation as a unique classifier.
         """
+        if self.schema_mode is not None:
+            clear_simulation(self.db, simulation_id, self.schema_mode)
 
         # Loop throuph all database tables
         # Get list of table names in database
@@ -137,6 +230,8 @@ class WriteOutput(Role):
             # ignore postgis table
             if "spatial_ref_sys" == table_name:
                 continue
+            if self.schema_mode is not None and is_managed_table(table_name):
+                continue
             try:
                 with self.db.begin() as db:
                     # create index on table
@@ -194,9 +289,8 @@ class WriteOutput(Role):
             until=self.end,
             cache=True,
         )
-        self.context.schedule_recurrent_task(
-            self.store_dfs, recurrency_task, src="no_wait"
-        )
+        # the clock waits for this task, so the simulation waits while the writer queue is full
+        self.context.schedule_recurrent_task(self.store_dfs, recurrency_task)
 
     def handle_message(self, content: dict, meta: MetaDict):
         """
@@ -236,16 +330,13 @@ class WriteOutput(Role):
             rl_params (dict): The RL parameters.
         """
 
-        df = pd.DataFrame.from_records(rl_params, index="datetime")
-        if df.empty:
-            return
-
-        df["simulation"] = self.simulation_id
-        df["learning_mode"] = self.learning_mode
-        df["perform_evaluation"] = self.perform_evaluation
-        df["episode"] = self.episode
-
-        self.write_dfs["rl_params"].append(df)
+        self.write_buffers["rl_params"].extend(
+            rl_params,
+            simulation=self.simulation_id,
+            learning_mode=self.learning_mode,
+            perform_evaluation=self.perform_evaluation,
+            episode=self.episode,
+        )
 
     def write_market_results(self, market_meta: dict):
         """
@@ -255,51 +346,182 @@ class WriteOutput(Role):
             market_meta (dict): The market metadata, which includes the clearing price and volume.
         """
 
-        df = pd.DataFrame(market_meta)
-        if df.empty:
-            return
-        df["simulation"] = self.simulation_id
-        self.write_dfs["market_meta"].append(df)
+        self.write_buffers["market_meta"].extend(
+            market_meta, simulation=self.simulation_id
+        )
 
     async def store_dfs(self):
         """
         Stores the data frames to CSV files and the database. Is scheduled as a recurrent task based on the frequency.
+
+        The buffered data frames are swapped out and handed to the writer thread, so that the serialization and
+        the I/O do not block the event loop. If the queue of the writer is full, this waits until the writer
+        has caught up, and as the clock waits for this task, the simulation does not advance in the meantime.
+        Without a queue, the data is written directly.
+
+        Raises:
+            RuntimeError: If the writer thread failed to write earlier batches.
         """
-        if not self.db and not self.export_csv_path:
+        if not self.db and not self.export_csv_path and not self.export_parquet_path:
             return
 
-        for table in self.write_dfs.keys():
+        batches = defaultdict(list)
+        for table in list(self.write_dfs.keys()):
             with self.locks[table]:
-                if len(self.write_dfs[table]) == 0:
-                    continue
-
-                df = pd.concat(self.write_dfs[table], axis=0)
-                df.reset_index()
-                if df.empty:
-                    continue
-
-                df = df.apply(check_for_tensors)
-
-                if self.export_csv_path:
-                    data_path = self.export_csv_path / f"{table}.csv"
-                    df.to_csv(
-                        data_path,
-                        mode="a",
-                        header=not data_path.exists(),
-                        float_format="%.5g",
-                    )
+                if self.write_dfs[table]:
+                    batches[table] = self.write_dfs[table]
+                    self.write_dfs[table] = []
+        for table, buffer in list(self.write_buffers.items()):
+            with self.locks[table]:
+                if len(buffer):
+                    batches[table].append(buffer.take())
+        if not batches:
+            return
+
+        if not self.writer_queue_size:
+            self.write_batches(batches)
+            return
+
+        if self.writer_thread is None:
+            self.writer_thread = Thread(
+                target=self.run_writer,
+                name=f"{self.simulation_id}_writer",
+                daemon=True,
+            )
+            self.writer_thread.start()
+        await self.put_writer_queue(batches)
+
+    async def put_writer_queue(self, batches: dict | None):
+        """
+        Puts batches into the writer queue.
+
+        If the queue is full, the slot is awaited in a worker thread. This applies backpressure on the
+        caller while the event loop and the other agents of the container keep running.
+
+        Args:
+            batches (dict | None): The batches to write, or None to stop the writer thread.
+
+        Raises:
+            RuntimeError: If the writer thread failed to write earlier batches.
+        """
+        if batches is not None:
+            self.raise_writer_error()
+        async with self.writer_queue_lock:
+            try:
+                self.writer_queue.put_nowait(batches)
+            except Full:
+                logger.debug("output writer is behind, waiting for free queue slot")
+                await asyncio.to_thread(self.writer_queue.put, batches)
+
+    def run_writer(self):
+        """
+        Writes the batches of the queue until None is received. Runs in the writer thread.
+        """
+        while True:
+            batches = self.writer_queue.get()
+            try:
+                if batches is None:
+                    return
+                self.write_batches(batches)
+            except Exception as e:
+                logger.exception("error writing output")
+                if self.writer_error is None:
+                    self.writer_error = e
+            finally:
+                self.writer_queue.task_done()
+
+    def raise_writer_error(self):
+        """
+        Raises the first error of the writer thread, so that lost outputs do not go unnoticed.
+
+        Raises:
+            RuntimeError: If the writer thread failed to write a batch.
+        """
+        if self.writer_error is not None:
+            raise RuntimeError("writing the outputs failed") from self.writer_error
+
+    async def drain_writer(self):
+        """
+        Waits until all queued batches are written and stops the writer thread.
+        """
+        if self.writer_thread is None:
+            return
+        await self.put_writer_queue(None)
+        await asyncio.to_thread(self.writer_thread.join)
+        self.writer_thread = None
+
+    def write_batches(self, batches: dict[str, list[pd.DataFrame | ColumnBuffer]]):
+        """
+        Writes the buffered data of each table to CSV files, parquet files and the database.
+
+        Args:
+            batches (dict[str, list[pandas.DataFrame | ColumnBuffer]]): The data frames and column buffers by table.
+        """
+        for table, dfs in batches.items():
+            dfs = [
+                buffer.to_frame() if isinstance(buffer, ColumnBuffer) else buffer
+                for buffer in dfs
+            ]
+            df = dfs[0] if len(dfs) == 1 else pd.concat(dfs, axis=0)
+            if df.empty:
+                continue
+
+            df = check_for_tensors(df)
+            self.update_kpis(table, df)
+
+            if self.export_csv_path:
+                data_path = self.export_csv_path / f"{table}.csv"
+                df.to_csv(
+                    data_path,
+                    mode="a",
+                    header=not data_path.exists(),
+                    float_format="%.5g",
+                )
+
+            if self.export_parquet_path:
+                self.write_parquet(table, df)
+
+            if self.copy_writer is not None:
+                self.copy_writer.write(table, df)
+            elif self.db is not None:
+                try:
+                    with self.db.begin() as db:
+                        df.to_sql(table, db, if_exists="append")
+                except (ProgrammingError, OperationalError, DataError):
+                    self.check_columns(table, df)
+                    # now try again
+                    with self.db.begin() as db:
+                        df.to_sql(table, db, if_exists="append")
+
+    def update_kpis(self, table: str, df: pd.DataFrame):
+        """
+        Updates the KPIs which are calculated from the given table.
+
+        Args:
+            table (str): The name of the table.
+            df (pandas.DataFrame): The data written to the table.
+        """
+        for variable, accumulator in self.kpi_accumulators.items():
+            if accumulator.table != table:
+                continue
+            try:
+                accumulator.update(df)
+            except Exception:
+                logger.exception("could not update kpi %s", variable)
 
-                if self.db is not None:
-                    try:
-                        with self.db.begin() as db:
-                            df.to_sql(table, db, if_exists="append")
-                    except (ProgrammingError, OperationalError, DataError):
-                        self.check_columns(table, df)
-                        # now try again
-                        with self.db.begin() as db:
-                            df.to_sql(table, db, if_exists="append")
+    def write_parquet(self, table: str, df: pd.DataFrame):
+        """
+        Appends a data frame to the parquet files of the table as a new row group.
 
-                self.write_dfs[table] = []
+        Args:
+            table (str): The name of the table.
+            df (pandas.DataFrame): The data to be written.
+        """
+        if table not in self.parquet_writers:
+            self.parquet_writers[table] = ParquetTableWriter(
+                self.export_parquet_path, table
+            )
+        self.parquet_writers[table].write(df)
 
     def store_grid(
         self,
@@ -415,28 +637,10 @@ class WriteOutput(Role):
             return
 
         market_orders = separate_orders(market_orders)
-        df = pd.DataFrame.from_records(market_orders, index="start_time")
-        if "eligible_lambda" in df.columns:
-            df["eligible_lambda"] = df["eligible_lambda"].apply(lambda x: x.__name__)
-        if "evaluation_frequency" in df.columns:
-            df["evaluation_frequency"] = df["evaluation_frequency"].apply(
-                lambda x: repr(x)
-            )
-
-        del df["only_hours"]
-        del df["agent_id"]
-
-        if "bid_type" not in df.columns:
-            df["bid_type"] = None
-
-        if "node" not in df.columns:
-            df["node"] = None
-
-        df["simulation"] = self.simulation_id
-        df["market_id"] = market_id
-
         with self.locks["market_orders"]:
-            self.write_dfs["market_orders"].append(df)
+            self.write_buffers["market_orders"].extend(
+                market_orders, simulation=self.simulation_id, market_id=market_id
+            )
 
     def write_units_definition(self, unit_info: dict):
         """
@@ -452,12 +656,19 @@ class WriteOutput(Role):
             logger.info(f"unknown {unit_info['unit_type']} is not exported")
             return False
         del unit_info["unit_type"]
-        unit_info["simulation"] = self.simulation_id
-        u_info = {unit_info["id"]: unit_info}
-        del unit_info["id"]
+        unit_id = unit_info.pop("id")
+
+        if table_name == "power_plant_meta" and "max_power" in unit_info:
+            self.unit_max_power[unit_id] = unit_info["max_power"]
 
         with self.locks[table_name]:
-            self.write_dfs[table_name].append(pd.DataFrame(u_info).T)
+            if table_name not in self.write_buffers:
+                self.write_buffers[table_name] = self.create_buffer(
+                    table_name, index="index"
+                )
+            self.write_buffers[table_name].append(
+                unit_info, index=unit_id, simulation=self.simulation_id
+            )
 
     def write_market_dispatch(self, data: any):
         """
@@ -466,10 +677,11 @@ class WriteOutput(Role):
         Args:
             data (any): The records to be put into the table. Formatted like, "datetime, power, market_id, unit_id".
         """
-        df = pd.DataFrame(data, columns=["datetime", "power", "market_id", "unit_id"])
-        if not df.empty:
-            df["simulation"] = self.simulation_id
-            self.write_dfs["market_dispatch"].append(df)
+        self.write_buffers["market_dispatch"].extend_rows(
+            data,
+            ["datetime", "power", "market_id", "unit_id"],
+            simulation=self.simulation_id,
+        )
 
     def write_unit_dispatch(self, data: any):
         """
@@ -484,44 +696,36 @@ class WriteOutput(Role):
     async def on_stop(self):
         """
         This function makes it possible to calculate Key Performance Indicators.
-        It is called when the simulation is finished. It collects average price, total cost, total volume and capacity factors
-        and uses them to calculate the KPIs. The KPIs are then stored in the database and CSV files.
+        It is called when the simulation is finished. The average price, total cost, total volume and capacity factors
+        are accumulated while the outputs are written, so that the stored data does not need to be read again.
+        KPIs defined as SQL are queried from the database. The KPIs are then stored in the database, CSV and parquet files.
         """
         await super().on_stop()
 
-        # insert left records into db
-        await self.store_dfs()
-
-        if self.db is None:
-            return
-
-        queries = []
-        for variable, kpi_def in self.kpi_defs.items():
-            group_bys = ",".join(kpi_def.get("group_bys", ["market_id"]))
-            queries.append(
-                f"select '{variable}' as variable, market_id as ident, {kpi_def['value']} as value from {kpi_def['from_table']} where simulation = '{self.simulation_id}' group by {group_bys}"
-            )
-
-        if self.episode:
-            queries.extend(
-                [
-                    f"SELECT 'sum_reward' as variable, simulation as ident, sum(reward) as value FROM rl_params WHERE episode='{self.episode}' AND simulation='{self.simulation_id}' GROUP BY simulation",
-                    f"SELECT 'sum_regret' as variable, simulation as ident, sum(regret) as value FROM rl_params WHERE episode='{self.episode}' AND simulation='{self.simulation_id}' GROUP BY simulation",
-                    f"SELECT 'sum_profit' as variable, simulation as ident, sum(profit) as value FROM rl_params WHERE episode='{self.episode}' AND simulation='{self.simulation_id}' GROUP BY simulation",
-                ]
+        # insert left records into db and wait until everything is written
+        try:
+            await self.store_dfs()
+        finally:
+            # the writer is stopped and the files are closed, also if writing failed
+            await self.drain_writer()
+            self.close_parquet_writers()
+        self.raise_writer_error()
+
+        dfs = [
+            pd.DataFrame(
+                {
+                    "variable": variable,
+                    "ident": list(result.keys()),
+                    "value": list(result.values()),
+                }
             )
+            for variable, accumulator in self.kpi_accumulators.items()
+            if (result := accumulator.result())
+        ]
 
-        dfs = []
-        for query in queries:
-            try:
-                df = pd.read_sql(query, self.db)
-            except (ProgrammingError, OperationalError, DataError):
-                continue
-            except Exception as e:
-                logger.error("could not read query: %s", e)
-                continue
-
-            dfs.append(df)
+        # KPIs defined as SQL can only be evaluated with a database
+        if self.db is not None:
+            dfs.extend(self.query_kpis())
 
         # remove all empty dataframes
         dfs = [df for df in dfs if not df.empty and df["value"].notna().all()]
@@ -542,10 +746,41 @@ class WriteOutput(Role):
                 float_format="%.5g",
             )
 
+        if self.export_parquet_path:
+            self.write_parquet("kpis", df.reset_index(drop=True))
+            self.close_parquet_writers()
+
         if self.db is not None and not df.empty:
             with self.db.begin() as db:
                 df.to_sql("kpis", db, if_exists="append", index=None)
 
+    def query_kpis(self) -> list[pd.DataFrame]:
+        """
+        Queries the KPIs which are defined as SQL from the database.
+
+        Returns:
+            list[pandas.DataFrame]: The values of the KPIs.
+        """
+        dfs = []
+        for variable, kpi_def in self.kpi_defs.items():
+            group_bys = ",".join(kpi_def.get("group_bys", ["market_id"]))
+            query = f"select '{variable}' as variable, market_id as ident, {kpi_def['value']} as value from {kpi_def['from_table']} where simulation = '{self.simulation_id}' group by {group_bys}"
+            try:
+                dfs.append(pd.read_sql(query, self.db))
+            except (ProgrammingError, OperationalError, DataError):
+                continue
+            except Exception as e:
+                logger.error("could not read query: %s", e)
+        return dfs
+
+    def close_parquet_writers(self):
+        """
+        Closes the parquet files of all tables.
+        """
+        for writer in self.parquet_writers.values():
+            writer.close()
+        self.parquet_writers = {}
+
     def get_sum_reward(self):
         """
         Retrieves the total reward for each learning unit.
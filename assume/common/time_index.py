@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+class TimeIndex:
+    """
+    Translates timestamps of the simulation into integer positions.
+
+    For an index with a fixed frequency, positions are calculated arithmetically from the start of
+    the index, so no hashing of timestamps or searching in the index is needed. Other indexes fall
+    back to the lookup methods of pandas. Integers are treated as positions and passed through, so
+    that methods using the time index accept both timestamps and positions.
+
+    Attributes:
+        index (pandas.DatetimeIndex): The index of the simulation.
+        freq (pandas.DateOffset | None): The frequency of the index.
+
+    Args:
+        index (pandas.DatetimeIndex | TimeIndex): The index of the simulation.
+
+    Example:
+        >>> time_index = TimeIndex(pd.date_range("2022-01-01", periods=24, freq="h"))
+        >>> time_index.get_pos(datetime(2022, 1, 1, 5))
+        5
+        >>> time_index.get_product_slice(datetime(2022, 1, 1, 5), datetime(2022, 1, 1, 8))
+        slice(5, 8, None)
+    """
+
+    def __init__(self, index: pd.DatetimeIndex):
+        if isinstance(index, TimeIndex):
+            index = index.index
+        self.index = index
+        self.freq = getattr(index, "freq", None)
+
+        self._start = None
+        self._step = None
+        # arithmetic is only valid for fixed frequencies on naive indexes
+        # as subtracting aware datetimes of the same timezone ignores DST changes
+        if (
+            isinstance(index, pd.DatetimeIndex)
+            and isinstance(self.freq, pd.offsets.Tick)
+            and index.tz is None
+            and len(index) > 0
+        ):
+            self._start = index[0].to_pydatetime()
+            self._step = pd.Timedelta(self.freq).to_pytimedelta()
+            # pandas timestamps are compared by their integer nanoseconds, which is much faster
+            self._start_ns = index[0].value
+            self._step_ns = pd.Timedelta(self.freq).value
+
+    @property
+    def step(self) -> timedelta | None:
+        """
+        The fixed duration of one timestep, or None if the index has no fixed frequency.
+        """
+        return self._step
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, pos):
+        return self.index[pos]
+
+    def get_offset(self, dt: datetime | int) -> int:
+        """
+        Returns the number of timesteps between the start of the index and the given timestamp.
+
+        Unlike :meth:`get_pos`, the timestamp does not need to be part of the index, so the offset can
+        be negative or larger than the length of the index. For indexes without a fixed frequency,
+        timestamps before or after the index are mapped to -1 and the length of the index.
+
+        Args:
+            dt (datetime.datetime | int): The timestamp or a position.
+
+        Returns:
+            int: The offset of the timestamp.
+        """
+        if isinstance(dt, int | np.integer):
+            return int(dt)
+        if self._step is not None:
+            offset, remainder = self._divmod(dt)
+            if remainder:
+                raise KeyError(dt)
+            return offset
+        if dt < self.index[0]:
+            return -1
+        if dt > self.index[-1]:
+            return len(self.index)
+        return self.index.get_loc(dt)
+
+    def get_pos(self, dt: datetime | int) -> int:
+        """
+        Returns the position of the given timestamp in the index.
+
+        Args:
+            dt (datetime.datetime | int): The timestamp or a position.
+
+        Returns:
+            int: The position of the timestamp.
+
+        Raises:
+            KeyError: If the timestamp is not part of the index.
+        """
+        if isinstance(dt, int | np.integer):
+            return int(dt)
+        if self._step is None:
+            return self.index.get_loc(dt)
+        pos = self.get_offset(dt)
+        if not 0 <= pos < len(self.index):
+            raise KeyError(dt)
+        return pos
+
+    def get_slice(self, start: datetime | int, end: datetime | int) -> slice:
+        """
+        Returns the positions of the timesteps between start and end as a slice.
+
+        Like label based indexing, the end is inclusive and timestamps outside of the index are clipped.
+
+        Args:
+            start (datetime.datetime | int): The first timestamp or position.
+            end (datetime.datetime | int): The last timestamp or position (inclusive).
+
+        Returns:
+            slice: The positional slice.
+        """
+        if isinstance(end, int | np.integer):
+            end = int(end) + 1
+        elif self._step is None:
+            return self.index.slice_indexer(
+                self.index[start] if isinstance(start, int | np.integer) else start,
+                end,
+            )
+        else:
+            end = self._divmod(end)[0] + 1
+        return self._clip(self._ceil_pos(start), end)
+
+    def get_product_slice(self, start: datetime | int, end: datetime | int) -> slice:
+        """
+        Returns the positions covered by a product as a slice.
+
+        Unlike :meth:`get_slice`, the end of a product is exclusive.
+
+        Args:
+            start (datetime.datetime | int): The start of the product as timestamp or position.
+            end (datetime.datetime | int): The end of the product as timestamp or position (exclusive).
+
+        Returns:
+            slice: The positional slice.
+        """
+        return self._clip(self._ceil_pos(start), self._ceil_pos(end))
+
+    def get_positions(self, timestamps) -> np.ndarray:
+        """
+        Returns the positions of multiple timestamps at once.
+
+        Args:
+            timestamps (Iterable[datetime.datetime]): The timestamps.
+
+        Returns:
+            numpy.ndarray: The positions of the timestamps.
+
+        Raises:
+            KeyError: If any of the timestamps is not part of the index.
+        """
+        timestamps = pd.DatetimeIndex(timestamps)
+        if self._step is None:
+            positions = self.index.get_indexer(timestamps)
+            missing = positions < 0
+        else:
+            # asi8 is given in the unit of the index, which is not always nanoseconds
+            positions, remainder = np.divmod(
+                timestamps.as_unit("ns").asi8 - self._start_ns, self._step_ns
+            )
+            missing = (remainder != 0) | (positions < 0) | (positions >= len(self))
+        if missing.any():
+            raise KeyError(list(timestamps[missing]))
+        return positions
+
+    def _divmod(self, dt: datetime) -> tuple:
+        if isinstance(dt, pd.Timestamp):
+            return divmod(dt.value - self._start_ns, self._step_ns)
+        return divmod(dt - self._start, self._step)
+
+    def _ceil_pos(self, dt: datetime | int) -> int:
+        if isinstance(dt, int | np.integer):
+            return int(dt)
+        if self._step is None:
+            return self.index.searchsorted(dt, side="left")
+        offset, remainder = self._divmod(dt)
+        return offset + 1 if remainder else offset
+
+    def _clip(self, start: int, stop: int) -> slice:
+        length = len(self.index)
+        start = min(max(start, 0), length)
+        stop = min(max(stop, start), length)
+        return slice(start, stop)
@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from collections.abc import Iterable, Iterator, MutableMapping, Sequence
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from assume.common.time_index import TimeIndex
+
+
+class UnitOutputs(MutableMapping):
+    """
+    Columnar store for the time series outputs of a unit.
+
+    All declared columns share one preallocated float64 matrix with one row per column, so that each
+    column is a contiguous array which can be addressed by integer timesteps. Columns which are not
+    declared are allocated on first access, like with a ``defaultdict``. Accessing a column by key
+    returns a pandas Series which is a view on the underlying array, so existing code reading or
+    writing through ``outputs["energy"]`` keeps working while internal hot paths can operate on the
+    arrays directly. Values which are not float timeseries (e.g. lists or object Series used for
+    reinforcement learning) are stored as they are.
+
+    Attributes:
+        index (pandas.DatetimeIndex): The index of the outputs.
+        time_index (TimeIndex): Translates timestamps of the index into positions.
+        data (numpy.ndarray): The matrix holding all declared columns with shape (columns, timesteps).
+        column_positions (dict[str, int]): The row of each declared column in the data matrix.
+
+    Args:
+        index (pandas.DatetimeIndex | TimeIndex): The index of the outputs.
+        columns (Iterable[str], optional): The columns for which space is preallocated. Defaults to ().
+
+    Example:
+        >>> outputs = UnitOutputs(pd.date_range("2022-01-01", periods=4, freq="h"), ["energy"])
+        >>> outputs.get_array("energy")[1:3] += 100
+        >>> outputs["energy"].at[pd.Timestamp("2022-01-01 01:00")]
+        100.0
+    """
+
+    def __init__(
+        self, index: pd.DatetimeIndex | TimeIndex, columns: Iterable[str] = ()
+    ):
+        self.column_positions: dict[str, int] = {}
+        for column in columns:
+            self.column_positions.setdefault(column, len(self.column_positions))
+
+        # arrays of all materialized float columns
+        self._arrays: dict[str, np.ndarray] = {}
+        # materialized values in insertion order, either views on the arrays or arbitrary objects
+        self._values: dict = {}
+        self.index = index
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self.time_index.index
+
+    @index.setter
+    def index(self, index: pd.DatetimeIndex | TimeIndex):
+        # float outputs are bound to the previous index and are dropped
+        for key in self._arrays:
+            del self._values[key]
+        self._arrays.clear()
+        self._data = None
+        self.time_index = index if isinstance(index, TimeIndex) else TimeIndex(index)
+
+    @property
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            self._data = np.zeros((len(self.column_positions), len(self.index)))
+        return self._data
+
+    def _materialize(self, key: str) -> np.ndarray:
+        if key in self.column_positions:
+            array = self.data[self.column_positions[key]]
+        else:
+            array = np.zeros(len(self.index))
+        self._arrays[key] = array
+        self._values[key] = pd.Series(array, index=self.index, copy=False)
+        return array
+
+    def get_array(self, key: str) -> np.ndarray:
+        """
+        Returns the array backing the given float column, creating the column if needed.
+
+        Args:
+            key (str): The name of the column.
+
+        Returns:
+            numpy.ndarray: The array of the column, changes are reflected in the outputs.
+        """
+        self[key]
+        array = self._arrays.get(key)
+        if array is None:
+            raise TypeError(f"output {key} is not a float timeseries")
+        return array
+
+    def get_block(
+        self, keys: Sequence[str], positions: slice | np.ndarray
+    ) -> np.ndarray:
+        """
+        Returns the values of several columns at the given positions as one block.
+
+        Declared float columns are sliced from the data matrix at once, other columns are copied one by one.
+
+        Args:
+            keys (Sequence[str]): The names of the columns.
+            positions (slice | numpy.ndarray): The positions of the timesteps.
+
+        Returns:
+            numpy.ndarray: The values with shape (timesteps, keys).
+        """
+        if isinstance(positions, slice):
+            n_steps = len(range(len(self.index))[positions])
+        else:
+            n_steps = len(positions)
+        block = np.empty((n_steps, len(keys)))
+        matrix_keys = []
+        for i, key in enumerate(keys):
+            value = self[key]
+            if key in self.column_positions and key in self._arrays:
+                matrix_keys.append(i)
+            elif key in self._arrays:
+                block[:, i] = self._arrays[key][positions]
+            else:
+                block[:, i] = value.iloc[positions].to_numpy(dtype=float)
+        if matrix_keys:
+            rows = [self.column_positions[keys[i]] for i in matrix_keys]
+            block[:, matrix_keys] = self.data[:, positions][rows].T
+        return block
+
+    def get_slice(self, start: datetime | int, end: datetime | int) -> slice:
+        """
+        Returns the positions of the timesteps between start and end as a slice.
+
+        Like label based indexing, the end is inclusive and timestamps outside of the index are clipped.
+
+        Args:
+            start (datetime.datetime | int): The first timestamp or position.
+            end (datetime.datetime | int): The last timestamp or position (inclusive).
+
+        Returns:
+            slice: The positional slice.
+        """
+        return self.time_index.get_slice(start, end)
+
+    def get_pos(self, dt: datetime | int) -> int:
+        """
+        Returns the position of the given timestamp in the index.
+
+        Args:
+            dt (datetime.datetime | int): The timestamp or a position.
+
+        Returns:
+            int: The position of the timestamp.
+        """
+        return self.time_index.get_pos(dt)
+
+    def __getitem__(self, key: str):
+        if key not in self._values:
+            self._materialize(key)
+            return self._values[key]
+        value = self._values[key]
+        array = self._arrays.get(key)
+        if array is None:
+            return value
+        if value.dtype != np.float64:
+            # the series was upcasted by an assignment and no longer shares memory
+            del self._arrays[key]
+        elif not np.may_share_memory(value.to_numpy(), array):
+            # with copy on write, a write through the series copied its values
+            array[:] = value.to_numpy()
+            value = self._values[key] = pd.Series(array, index=self.index, copy=False)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        if (
+            isinstance(value, pd.Series)
+            and value.dtype.kind in "fiub"
+            and value.index.equals(self.index)
+        ):
+            array = self._arrays.get(key)
+            if array is None or self._values[key].dtype != np.float64:
+                self._values.pop(key, None)
+                array = self._materialize(key)
+            array[:] = value.to_numpy(dtype=float)
+            return
+        self._arrays.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._values[key]
+        self._arrays.pop(key, None)
+
+    def __contains__(self, key) -> bool:
+        return key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(columns={list(self._values)})"
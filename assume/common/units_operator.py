@@ -8,10 +8,12 @@ from datetime import datetime
 from itertools import groupby
 from operator import itemgetter
 
+import numpy as np
 import pandas as pd
 from mango import Role
 from mango.messages.message import Performatives
 
+from assume.common.dispatch_timeline import DispatchTimeline
 from assume.common.market_objects import (
     ClearingMessage,
     DataRequestMessage,
@@ -21,15 +23,15 @@ from assume.common.market_objects import (
     Orderbook,
     RegistrationMessage,
 )
-from assume.common.utils import (
-    aggregate_step_amount,
-    timestamp2datetime,
-)
+from assume.common.utils import timestamp2datetime
 from assume.strategies import BaseStrategy
 from assume.units import BaseUnit
 
 logger = logging.getLogger(__name__)
 
+# outputs of the units which are exported with their dispatch, matched as substring of the output key
+UNIT_DISPATCH_OUTPUTS = ("soc", "cashflow", "marginal_costs", "total_costs")
+
 
 class UnitsOperator(Role):
     """
@@ -42,8 +44,9 @@ class UnitsOperator(Role):
         last_sent_dispatch (int): The last sent dispatch.
         use_portfolio_opt (bool): Whether to use portfolio optimization.
         portfolio_strategy (BaseStrategy): The portfolio strategy.
-        valid_orders (defaultdict): The valid orders.
+        dispatch_timelines (dict[str, DispatchTimeline]): The accepted volume per market and unit for each product type.
         units (dict[str, BaseUnit]): The units.
+        unit_output_keys (dict[str, tuple[int, list[str]]]): The number of outputs and the exported output keys of each unit.
         id (str): The id of the agent.
         context (Context): The context of the agent.
 
@@ -70,9 +73,10 @@ class UnitsOperator(Role):
             self.use_portfolio_opt = opt_portfolio[0]
             self.portfolio_strategy = opt_portfolio[1]
 
-        # valid_orders per product_type
-        self.valid_orders = defaultdict(list)
+        # accepted volume per product_type
+        self.dispatch_timelines: dict[str, DispatchTimeline] = {}
         self.units: dict[str, BaseUnit] = {}
+        self.unit_output_keys: dict[str, tuple[int, list[str]]] = {}
 
     def setup(self):
         super().setup()
@@ -119,6 +123,7 @@ class UnitsOperator(Role):
             unit (BaseUnit): The unit to be added.
         """
         self.units[unit.id] = unit
+        self.get_output_keys(unit)
 
         db_aid = self.context.data.get("output_agent_id")
         db_addr = self.context.data.get("output_agent_addr")
@@ -174,7 +179,7 @@ class UnitsOperator(Role):
                 "reply_with": market.market_id,
             },
         )
-        logger.debug(f"{self.id} sent market registration to {market.market_id}")
+        logger.debug("%s sent market registration to %s", self.id, market.market_id)
 
     def handle_opening(self, opening: OpeningMessage, meta: MetaDict) -> None:
         """
@@ -185,7 +190,11 @@ class UnitsOperator(Role):
             meta (MetaDict): The meta data of the market.
         """
         logger.debug(
-            f'{self.id} received opening from: {opening["market_id"]} {opening["start_time"]} until: {opening["end_time"]}.'
+            "%s received opening from: %s %s until: %s.",
+            self.id,
+            opening["market_id"],
+            opening["start_time"],
+            opening["end_time"],
         )
         self.context.schedule_instant_task(coroutine=self.submit_bids(opening, meta))
 
@@ -197,7 +206,8 @@ class UnitsOperator(Role):
             content (ClearingMessage): The content of the clearing message.
             meta (MetaDict): The meta data of the market.
         """
-        logger.debug(f"{self.id} got market result: {content}")
+        # the content is only formatted if debug logging is enabled
+        logger.debug("%s got market result: %s", self.id, content)
         accepted_orders: Orderbook = content["accepted_orders"]
         rejected_orders: Orderbook = content["rejected_orders"]
         orderbook = accepted_orders + rejected_orders
@@ -206,10 +216,26 @@ class UnitsOperator(Role):
             order["market_id"] = content["market_id"]
 
         marketconfig = self.registered_markets[content["market_id"]]
-        self.valid_orders[marketconfig.product_type].extend(orderbook)
+        self.add_to_dispatch_timeline(orderbook, marketconfig.product_type)
         self.set_unit_dispatch(orderbook, marketconfig)
         self.write_actual_dispatch(marketconfig.product_type)
 
+    def add_to_dispatch_timeline(self, orderbook: Orderbook, product_type: str) -> None:
+        """
+        Adds the accepted volume of the orders to the dispatch timeline of the product type.
+
+        Args:
+            orderbook (Orderbook): The orders of the market feedback.
+            product_type (str): The type of the product.
+        """
+        if not orderbook:
+            return
+        if product_type not in self.dispatch_timelines:
+            # all units share the index of the simulation
+            unit = self.units[orderbook[0]["unit_id"]]
+            self.dispatch_timelines[product_type] = DispatchTimeline(unit.time_index)
+        self.dispatch_timelines[product_type].add_orders(orderbook)
+
     def handle_registration_feedback(
         self, content: RegistrationMessage, meta: MetaDict
     ) -> None:
@@ -285,51 +311,103 @@ class UnitsOperator(Role):
                 orderbook=orderbook,
             )
 
+    def get_output_keys(self, unit: BaseUnit) -> list[str]:
+        """
+        Returns the keys of the outputs of a unit which are exported with its dispatch.
+
+        The keys are resolved when the unit is added and only resolved again
+        if outputs were created afterwards, e.g. the total costs of a product.
+
+        Args:
+            unit (BaseUnit): The unit.
+
+        Returns:
+            list[str]: The exported output keys.
+        """
+        n_outputs, keys = self.unit_output_keys.get(unit.id, (None, []))
+        if n_outputs != len(unit.outputs):
+            keys = [
+                key
+                for key in unit.outputs.keys()
+                if any(output in key for output in UNIT_DISPATCH_OUTPUTS)
+            ]
+            self.unit_output_keys[unit.id] = (len(unit.outputs), keys)
+        return keys
+
     def get_actual_dispatch(
         self, product_type: str, last: datetime
-    ) -> tuple[pd.DataFrame, list[pd.DataFrame]]:
+    ) -> tuple[list, pd.DataFrame | None]:
         """
         Retrieves the actual dispatch and commits it in the unit.
         We calculate the series of the actual market results dataframe with accepted bids.
         And the unit_dispatch for all units taken care of in the UnitsOperator.
 
+        The unit dispatch is collected in one block with a row per unit and timestep and a column per output,
+        from which a single dataframe is built. The outputs of each unit are taken from its output matrix
+        with :meth:`assume.common.unit_outputs.UnitOutputs.get_block`.
+
         Args:
             product_type (str): The product type for which this is done
             last (datetime): the last date until which the dispatch was already sent
 
         Returns:
-            tuple[pd.DataFrame, list[pd.DataFrame]]: market_dispatch and unit_dispatch dataframes
+            tuple[list, pd.DataFrame | None]: market_dispatch records and the unit_dispatch dataframe,
+            which is None if the operator has no units
         """
         now = timestamp2datetime(self.context.current_timestamp)
         start = timestamp2datetime(last + 1)
 
-        market_dispatch = aggregate_step_amount(
-            orderbook=self.valid_orders[product_type],
-            begin=timestamp2datetime(last),
-            end=now,
-            groupby=["market_id", "unit_id"],
-        )
-
-        unit_dispatch_dfs = []
-        for unit_id, unit in self.units.items():
-            current_dispatch = unit.execute_current_dispatch(start, now)
-            end = now
-            current_dispatch.name = "power"
-            data = pd.DataFrame(current_dispatch)
-
-            # TODO: this needs to be fixed. For now it is consuming too much time and is deactivated
-            # unit.calculate_generation_cost(start, now, "energy")
-            valid_outputs = ["soc", "cashflow", "marginal_costs", "total_costs"]
-
-            for key in unit.outputs.keys():
-                for output in valid_outputs:
-                    if output in key:
-                        data[key] = unit.outputs[key][start:end]
-
-            data["unit"] = unit_id
-            unit_dispatch_dfs.append(data)
+        market_dispatch = []
+        if product_type in self.dispatch_timelines:
+            timeline = self.dispatch_timelines[product_type]
+            market_dispatch = timeline.get_dispatch(
+                begin=timestamp2datetime(last), end=now
+            )
+            # the next dispatch is sent beginning at now
+            timeline.discard_before(now)
+
+        if not self.units:
+            return market_dispatch, None
+
+        # TODO: this needs to be fixed. For now it is consuming too much time and is deactivated
+        # unit.calculate_generation_cost(start, now, "energy")
+        dispatches = [
+            unit.execute_current_dispatch(start, now) for unit in self.units.values()
+        ]
+        # the columns are ordered like a concatenation of one dataframe per unit
+        names = {}
+        for unit in self.units.values():
+            names.update(dict.fromkeys(["power", *self.get_output_keys(unit), "unit"]))
+        names = list(names)
+        unit_column = names.index("unit")
+        names.remove("unit")
+        columns = {key: i for i, key in enumerate(names)}
+
+        lengths = [len(dispatch) for dispatch in dispatches]
+        offsets = np.cumsum([0, *lengths])
+        block = np.full((offsets[-1], len(columns)), np.nan)
+        for unit, dispatch, offset, length in zip(
+            self.units.values(), dispatches, offsets, lengths
+        ):
+            rows = slice(offset, offset + length)
+            block[rows, 0] = dispatch.to_numpy(dtype=float)
+            keys = self.unit_output_keys[unit.id][1]
+            if not keys or not length:
+                continue
+            positions = unit.outputs.get_slice(start, now)
+            if positions.stop - positions.start != length:
+                positions = unit.outputs.time_index.get_positions(dispatch.index)
+            block[rows, [columns[key] for key in keys]] = unit.outputs.get_block(
+                keys, positions
+            )
 
-        return market_dispatch, unit_dispatch_dfs
+        unit_dispatch = pd.DataFrame(
+            block,
+            index=dispatches[0].index.append([d.index for d in dispatches[1:]]),
+            columns=names,
+        )
+        unit_dispatch.insert(unit_column, "unit", np.repeat(list(self.units), lengths))
+        return market_dispatch, unit_dispatch
 
     def write_actual_dispatch(self, product_type: str) -> None:
         """
@@ -345,17 +423,7 @@ class UnitsOperator(Role):
             return
         self.last_sent_dispatch[product_type] = self.context.current_timestamp
 
-        market_dispatch, unit_dispatch_dfs = self.get_actual_dispatch(
-            product_type, last
-        )
-
-        now = timestamp2datetime(self.context.current_timestamp)
-        self.valid_orders[product_type] = list(
-            filter(
-                lambda x: x["end_time"] > now,
-                self.valid_orders[product_type],
-            )
-        )
+        market_dispatch, unit_dispatch = self.get_actual_dispatch(product_type, last)
 
         db_aid = self.context.data.get("output_agent_id")
         db_addr = self.context.data.get("output_agent_addr")
@@ -369,8 +437,7 @@ class UnitsOperator(Role):
                     "data": market_dispatch,
                 },
             )
-            if unit_dispatch_dfs:
-                unit_dispatch = pd.concat(unit_dispatch_dfs)
+            if unit_dispatch is not None:
                 self.context.schedule_instant_acl_message(
                     receiver_id=db_aid,
                     receiver_addr=db_addr,
@@ -395,7 +462,7 @@ class UnitsOperator(Role):
 
         products = opening["products"]
         market = self.registered_markets[opening["market_id"]]
-        logger.debug(f"{self.id} setting bids for {market.market_id} - {products}")
+        logger.debug("%s setting bids for %s - %s", self.id, market.market_id, products)
 
         # the given products just became available on our market
         # and we need to provide bids
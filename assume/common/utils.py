@@ -5,6 +5,8 @@
 import calendar
 import inspect
 import logging
+import sys
+import warnings
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from functools import wraps
@@ -15,6 +17,7 @@ import dateutil.rrule as rr
 import numpy as np
 import pandas as pd
 import yaml
+from pandas.api.types import is_object_dtype
 
 from assume.common.base import BaseStrategy, LearningStrategy
 from assume.common.market_objects import MarketProduct, Orderbook
@@ -256,6 +259,9 @@ def aggregate_step_amount(orderbook: Orderbook, begin=None, end=None, groupby=No
     """
     Step function with bought volume, allows setting timeframe through begin and end, and group by columns in groupby.
 
+    Deprecated, the units operator aggregates the accepted volume with
+    :class:`assume.common.dispatch_timeline.DispatchTimeline`.
+
     Args:
         orderbook (Orderbook): The orderbook.
         begin (datetime, optional): The begin time. Defaults to None.
@@ -269,6 +275,11 @@ def aggregate_step_amount(orderbook: Orderbook, begin=None, end=None, groupby=No
         If called without groupby, this returns the aggregated orderbook timeseries
     """
 
+    warnings.warn(
+        "aggregate_step_amount is deprecated, use assume.common.dispatch_timeline.DispatchTimeline instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     if groupby is None:
         groupby = []
     deltas = []
@@ -285,7 +296,7 @@ def aggregate_step_amount(orderbook: Orderbook, begin=None, end=None, groupby=No
         elif isinstance(bid["accepted_volume"], dict):
             start_hour = bid["start_time"]
             end_hour = bid["end_time"]
-            duration = (start_hour - end_hour) / len(bid["accepted_volume"])
+            duration = (end_hour - start_hour) / len(bid["accepted_volume"])
             for key in bid["accepted_volume"].keys():
                 deltas.append((key, bid["accepted_volume"][key]) + add)
                 deltas.append((key + duration, -bid["accepted_volume"][key]) + add)
@@ -603,39 +614,47 @@ def check_for_tensors(data):
     """
     Checks if the data contains tensors and converts them to native Python types.
 
-    Supports both pandas.Series and list of dictionaries.
+    Supports pandas.DataFrame, pandas.Series and list of dictionaries.
+    Only columns of object dtype can hold tensors, numeric columns are returned without being scanned.
 
     Args:
-        data (pandas.Series or list of dicts): The data to be checked.
+        data (pandas.DataFrame, pandas.Series or list of dicts): The data to be checked.
 
     Returns:
         The data with tensors converted to native Python types.
     """
-    try:
-        import torch as th
-
-        if isinstance(data, pd.Series):
-            # Vectorized check for tensors
-            tensor_mask = data.apply(lambda x: isinstance(x, th.Tensor))
-            if tensor_mask.any():
-                # Convert tensors to their scalar values
-                data[tensor_mask] = data[tensor_mask].apply(lambda x: x.item())
-
-        elif isinstance(data, list):
-            # Check if it's a list of dictionaries
-            if all(isinstance(item, dict) for item in data):
-                for d in data:
-                    for key, value in d.items():
-                        if isinstance(value, th.Tensor):
-                            d[key] = value.item()
-
-        else:
-            # If data is a single value, check its type directly
-            if isinstance(data, th.Tensor):
-                data = data.item()
+    # tensors can only exist if torch has been imported already
+    th = sys.modules.get("torch")
+    if th is None:
+        return data
+
+    if isinstance(data, pd.DataFrame):
+        for column in data.select_dtypes(include="object").columns:
+            data[column] = check_for_tensors(data[column])
+
+    elif isinstance(data, pd.Series):
+        if not is_object_dtype(data):
+            return data
+        values = data.to_numpy()
+        tensor_mask = np.fromiter(
+            (isinstance(x, th.Tensor) for x in values), dtype=bool, count=len(values)
+        )
+        if tensor_mask.any():
+            # Convert tensors to their scalar values
+            data[tensor_mask] = [x.item() for x in values[tensor_mask]]
+            data = data.infer_objects()
+
+    elif isinstance(data, list):
+        # Check if it's a list of dictionaries
+        if all(isinstance(item, dict) for item in data):
+            for d in data:
+                for key, value in d.items():
+                    if isinstance(value, th.Tensor):
+                        d[key] = value.item()
 
-    except ImportError:
-        # If torch is not installed, return the data unchanged
-        pass
+    else:
+        # If data is a single value, check its type directly
+        if isinstance(data, th.Tensor):
+            data = data.item()
 
     return data
@@ -2,13 +2,18 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import copy
 import logging
 import math
+import random
+from concurrent.futures import ThreadPoolExecutor
 from itertools import groupby
 from operator import itemgetter
 
+import numpy as np
 from mango import Role
 
+from assume.common.logging_utils import WarningSummary
 from assume.common.market_objects import (
     ClearingMessage,
     DataRequestMessage,
@@ -27,6 +32,7 @@ from assume.common.utils import (
     separate_orders,
     timestamp2datetime,
 )
+from assume.markets.order_book import OrderBook, get_product_key, group_by_product
 
 logger = logging.getLogger(__name__)
 
@@ -40,21 +46,44 @@ class MarketMechanism:
     In the Marketmechanism, all data needed for the clearing is present.
 
     Attributes:
-        all_orders (Orderbook): The list of all orders.
+        all_orders (OrderBook): All orders, sorted into price-sorted buckets per product when they are submitted.
         marketconfig (MarketConfig): The configuration of the market.
         open_auctions (set): The list of open auctions.
         results (list[dict]): The list of market metadata.
+        warning_summary (WarningSummary): Counts the warnings of the orderbook validation until the next clearing.
+        tie_breaker (Callable[[], float]): Random number generator used to break ties between equal prices.
+        parallel_products (int): Number of threads to clear products in parallel, set by ``parallel_products`` in the param_dict.
+            Only used by mechanisms with independent products, 0 clears all products sequentially.
 
     Args:
         marketconfig (MarketConfig): The configuration of the market.
     """
 
+    # whether each product can be cleared on its own, which allows to clear products in parallel
+    independent_products: bool = False
+
     def __init__(self, marketconfig: MarketConfig):
         super().__init__()
         self.marketconfig = marketconfig
         self.open_auctions = set()
-        self.all_orders = []
+        self.all_orders = OrderBook()
         self.results = []
+        self.warning_summary = WarningSummary(logger)
+        self.tie_breaker = random.random
+        self.parallel_products = int(
+            marketconfig.param_dict.get("parallel_products", 0)
+        )
+        self._executor = None
+
+    @property
+    def all_orders(self) -> OrderBook:
+        return self._all_orders
+
+    @all_orders.setter
+    def all_orders(self, orders: Orderbook):
+        self._all_orders = (
+            orders if isinstance(orders, OrderBook) else OrderBook(orders)
+        )
 
     def validate_registration(
         self, content: RegistrationMessage, meta: MetaDict
@@ -82,6 +111,8 @@ class MarketMechanism:
         Validates a given orderbook.
 
         This is needed to check if all required fields for this mechanism are present.
+        The price and volume limits as well as the open auctions are checked for all orders at once.
+        Adjusted orders are counted per agent in the warning_summary, which is logged after the clearing.
 
         Args:
             orderbook (Orderbook): The orderbook to be validated.
@@ -132,48 +163,59 @@ class MarketMechanism:
                         f"Missing required field '{field}' for order {order} in market '{market_id}'."
                     )
 
-        # Process separated orders
+        # Process separated orders as arrays
         sep_orders = separate_orders(orderbook.copy())
-        for order in sep_orders:
-            # Adjust order price if it exceeds max_price or is below min_price
-            if order["price"] > max_price:
-                logger.warning(
-                    f"Order price {order['price']} exceeds maximum price {max_price} in market '{market_id}'. Setting to max_price."
-                )
-                order["price"] = max_price
-            elif order["price"] < min_price:
-                logger.warning(
-                    f"Order price {order['price']} is below minimum price {min_price} in market '{market_id}'. Setting to min_price."
-                )
-                order["price"] = min_price
-
-            # Check that the product is part of an open auction
-            product = (order["start_time"], order["end_time"], order["only_hours"])
-            if product not in self.open_auctions:
-                logger.warning(
-                    f"Product {product} is not part of an open auction in market '{market_id}'. Skipping this order."
-                )
-                continue  # Skip to the next order
-
-            # Adjust order volume if it exceeds max_volume
-            if abs(order["volume"]) > max_volume:
-                logger.warning(
-                    f"Order volume {order['volume']} exceeds max_volume {max_volume} in market '{market_id}'. Adjusting volume."
-                )
-                order["volume"] = max_volume if order["volume"] > 0 else -max_volume
+        if not sep_orders:
+            return
+        prices = np.array([order["price"] for order in sep_orders], dtype=float)
+        volumes = np.array([order["volume"] for order in sep_orders], dtype=float)
+        in_auction = np.fromiter(
+            (get_product_key(order) in self.open_auctions for order in sep_orders),
+            dtype=bool,
+            count=len(sep_orders),
+        )
 
-            # Ensure 'price' is an integer if price_tick is set
-            if self.marketconfig.price_tick:
-                if not isinstance(order["price"], int):
-                    raise TypeError(
-                        f"Order price {order['price']} must be an integer when price_tick is set in market '{market_id}'."
-                    )
+        # Adjust order prices exceeding max_price or below min_price
+        no_orders = np.zeros(len(sep_orders), dtype=bool)
+        too_high = prices > max_price if max_price is not None else no_orders
+        too_low = (
+            ~too_high & (prices < min_price) if min_price is not None else no_orders
+        )
+        # Volumes are only adjusted for products which are part of an open auction
+        too_large = (
+            in_auction & (np.abs(volumes) > max_volume)
+            if max_volume is not None
+            else no_orders
+        )
 
-            # Ensure 'volume' is an integer if volume_tick is set
-            if self.marketconfig.volume_tick:
-                if not isinstance(order["volume"], int):
+        for i in np.flatnonzero(too_high):
+            sep_orders[i]["price"] = max_price
+        for i in np.flatnonzero(too_low):
+            sep_orders[i]["price"] = min_price
+        for i in np.flatnonzero(too_large):
+            sep_orders[i]["volume"] = max_volume if volumes[i] > 0 else -max_volume
+
+        # Count the adjusted orders, they are logged as a summary after the clearing
+        for reason, mask in (
+            ("price above maximum_bid_price", too_high),
+            ("price below minimum_bid_price", too_low),
+            ("product not part of an open auction", ~in_auction),
+            ("volume above maximum_bid_volume", too_large),
+        ):
+            self.warning_summary.add(agent_tuple, reason, mask.sum())
+
+        # Ensure 'price' and 'volume' are integers if price_tick or volume_tick is set
+        checked_orders = [sep_orders[i] for i in np.flatnonzero(in_auction)]
+        for field, tick in (
+            ("price", self.marketconfig.price_tick),
+            ("volume", self.marketconfig.volume_tick),
+        ):
+            if not tick:
+                continue
+            for order in checked_orders:
+                if not isinstance(order[field], int):
                     raise TypeError(
-                        f"Order volume {order['volume']} must be an integer when volume_tick is set in market '{market_id}'."
+                        f"Order {field} {order[field]} must be an integer when {field}_tick is set in market '{market_id}'."
                     )
 
     def clear(
@@ -191,6 +233,53 @@ class MarketMechanism:
         """
         return [], [], []
 
+    def clear_parallel(
+        self, orderbook: Orderbook, market_products: list[MarketProduct]
+    ) -> tuple[Orderbook, Orderbook, list[dict]]:
+        """
+        Clears the products of the orderbook in parallel using a thread pool.
+
+        The orderbook is partitioned by product and each partition is cleared with :meth:`clear` on a copy of the
+        mechanism. Each partition gets its own tie-breaking random number generator, which is seeded in product order,
+        and the results are merged in product order, so the result does not depend on the scheduling of the threads.
+
+        Args:
+            orderbook (Orderbook): The orderbook to be cleared.
+            market_products (list[MarketProduct]): The products to be traded.
+
+        Returns:
+            (Orderbook, Orderbook, list[dict]): The accepted orderbook, the rejected orderbook and the market metadata.
+        """
+        partitions = [orders for _, orders in group_by_product(orderbook)]
+        seeds = [self.tie_breaker() for _ in partitions]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.parallel_products,
+                thread_name_prefix=f"{self.marketconfig.market_id}_clearing",
+            )
+        futures = [
+            self._executor.submit(
+                self._clear_partition, partition, market_products, seed
+            )
+            for partition, seed in zip(partitions, seeds)
+        ]
+
+        accepted_orderbook, rejected_orderbook, market_meta = [], [], []
+        for future in futures:
+            accepted, rejected, meta = future.result()
+            accepted_orderbook.extend(accepted)
+            rejected_orderbook.extend(rejected)
+            market_meta.extend(meta)
+        return accepted_orderbook, rejected_orderbook, market_meta
+
+    def _clear_partition(
+        self, orderbook: Orderbook, market_products: list[MarketProduct], seed: float
+    ) -> tuple[Orderbook, Orderbook, list[dict]]:
+        mechanism = copy.copy(self)
+        mechanism.tie_breaker = random.Random(seed).random
+        return mechanism.clear(orderbook, market_products)
+
 
 class MarketRole(MarketMechanism, Role):
     """
@@ -458,7 +547,10 @@ class MarketRole(MarketMechanism, Role):
             },
         )
         logger.debug(
-            f"Sent registration reply to agent '{agent_id}' at '{agent_addr}': {msg}"
+            "Sent registration reply to agent '%s' at '%s': %s",
+            agent_id,
+            agent_addr,
+            msg,
         )
 
     def handle_orderbook(self, content: OrderBookMessage, meta: MetaDict):
@@ -494,14 +586,16 @@ class MarketRole(MarketMechanism, Role):
             # Validate the order book
             self.validate_orderbook(orderbook, (agent_addr, agent_id))
 
-            # Add each validated order to 'all_orders'
-            for order in orderbook:
-                self.all_orders.append(order)
+            # Insert each validated order into the bucket of its product
+            self.all_orders.extend(orderbook)
 
         except Exception as e:
             # Log the error with agent details for better traceability
             logger.error(
-                f"Error handling orderbook message from agent '{agent_id}' at '{agent_addr}': {e}"
+                "Error handling orderbook message from agent '%s' at '%s': %s",
+                agent_id,
+                agent_addr,
+                e,
             )
 
             # Prepare a rejection message with a generic error description
@@ -522,7 +616,10 @@ class MarketRole(MarketMechanism, Role):
                 },
             )
             logger.debug(
-                f"Sent rejection message to agent '{agent_id}' at '{agent_addr}': {rejection_message}"
+                "Sent rejection message to agent '%s' at '%s': %s",
+                agent_id,
+                agent_addr,
+                rejection_message,
             )
 
     def handle_data_request(self, content: DataRequestMessage, meta: MetaDict):
@@ -579,17 +676,9 @@ class MarketRole(MarketMechanism, Role):
             agent_id = meta["sender_id"]
 
             if order:
-
-                def order_matches_req(o):
-                    return (
-                        o.get("start_time") == order.get("start_time")
-                        and o.get("end_time") == order.get("end_time")
-                        and o.get("only_hours") == order.get("only_hours")
-                    )
-
-                available_orders = list(filter(order_matches_req, self.all_orders))
+                available_orders = self.all_orders.get_orders(get_product_key(order))
             else:
-                available_orders = self.all_orders
+                available_orders = list(self.all_orders)
 
             self.context.schedule_instant_acl_message(
                 content={
@@ -605,7 +694,7 @@ class MarketRole(MarketMechanism, Role):
                 },
             )
             logger.debug(
-                f"Sent unmatched orders to agent '{agent_id}' at '{agent_addr}'."
+                "Sent unmatched orders to agent '%s' at '%s'.", agent_id, agent_addr
             )
 
         except KeyError as ke:
@@ -619,17 +708,24 @@ class MarketRole(MarketMechanism, Role):
         Args:
             market_products (list[MarketProduct]): The products to be traded.
         """
+        if self.parallel_products and self.independent_products:
+            clear = self.clear_parallel
+        else:
+            clear = self.clear
         try:
             (
                 accepted_orderbook,
                 rejected_orderbook,
                 market_meta,
-            ) = self.clear(self.all_orders, market_products)
+            ) = clear(self.all_orders, market_products)
         except Exception as e:
             logger.error("clearing failed: %s", e)
             raise e
+        finally:
+            # the warnings belong to this clearing, even if it failed
+            self.warning_summary.flush("market %s", self.marketconfig.market_id)
 
-        self.all_orders = []
+        self.all_orders = OrderBook()
 
         for order in rejected_orderbook:
             if "accepted_volume" not in order and "accepted_price" not in order:
@@ -677,7 +773,10 @@ class MarketRole(MarketMechanism, Role):
         # store order book in db agent
         if not accepted_orderbook:
             logger.warning(
-                f"{self.context.current_timestamp} Market result {market_products} for market {self.marketconfig.market_id} are empty!"
+                "%s Market result %s for market %s are empty!",
+                self.context.current_timestamp,
+                market_products,
+                self.marketconfig.market_id,
             )
         all_orders = accepted_orderbook + rejected_orderbook
         await self.store_order_book(all_orders)
@@ -745,3 +844,12 @@ class MarketRole(MarketMechanism, Role):
                 receiver_addr=db_addr,
                 content=message,
             )
+
+    async def on_stop(self):
+        """
+        Shuts down the thread pool used for parallel clearing, if it was started.
+        """
+        await super().on_stop()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
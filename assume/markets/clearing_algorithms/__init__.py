@@ -8,6 +8,7 @@ from assume.markets.base_market import MarketRole
 from .all_or_nothing import PayAsBidAonRole, PayAsClearAonRole
 from .contracts import PayAsBidContractRole
 from .simple import PayAsBidRole, PayAsClearRole
+from .vectorized import VectorizedPayAsBidRole, VectorizedPayAsClearRole
 
 clearing_mechanisms: dict[str, MarketRole] = {
     "pay_as_clear": PayAsClearRole,
@@ -15,6 +16,8 @@ clearing_mechanisms: dict[str, MarketRole] = {
     "pay_as_bid_aon": PayAsBidAonRole,
     "pay_as_clear_aon": PayAsClearAonRole,
     "pay_as_bid_contract": PayAsBidContractRole,
+    "pay_as_clear_vectorized": VectorizedPayAsClearRole,
+    "pay_as_bid_vectorized": VectorizedPayAsBidRole,
 }
 
 # try importing pyomo if it is installed
@@ -34,6 +34,9 @@ def cumsum(orderbook: Orderbook):
 # does not allow to have partially accepted bids
 # all or nothing
 class PayAsClearAonRole(MarketRole):
+    # the clearing price is carried over from one product to the next
+    independent_products = False
+
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
 
@@ -119,6 +122,8 @@ class PayAsClearAonRole(MarketRole):
 
 # does not allow to have partial accepted bids
 class PayAsBidAonRole(MarketRole):
+    independent_products = True
+
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
 
@@ -3,13 +3,12 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import logging
-import random
 from datetime import timedelta
-from itertools import groupby
 from operator import itemgetter
 
 from assume.common.market_objects import MarketConfig, MarketProduct, Orderbook
 from assume.markets.base_market import MarketRole
+from assume.markets.order_book import group_by_product
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +42,8 @@ def calculate_meta(accepted_supply_orders, accepted_demand_orders, product):
 
 
 class PayAsClearRole(MarketRole):
+    independent_products = True
+
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
 
@@ -60,16 +61,14 @@ class PayAsClearRole(MarketRole):
         Returns:
             tuple: accepted orderbook, rejected orderbook and clearing meta data
         """
-        market_getter = itemgetter("start_time", "end_time", "only_hours")
         accepted_orders: Orderbook = []
         rejected_orders: Orderbook = []
         clear_price = 0
         meta = []
-        orderbook.sort(key=market_getter)
-        for product, product_orders in groupby(orderbook, market_getter):
+        # the orders are taken from the product buckets of the orderbook
+        for product, product_orders in group_by_product(orderbook):
             accepted_demand_orders: Orderbook = []
             accepted_supply_orders: Orderbook = []
-            product_orders = list(product_orders)
             if product not in market_products:
                 rejected_orders.extend(product_orders)
                 # logger.debug(f'found unwanted bids for {product} should be {market_products}')
@@ -80,11 +79,11 @@ class PayAsClearRole(MarketRole):
             # volume 0 is ignored/invalid
 
             # Sort supply orders by price with randomness for tie-breaking
-            supply_orders.sort(key=lambda x: (x["price"], random.random()))
+            supply_orders.sort(key=lambda x: (x["price"], self.tie_breaker()))
 
             # Sort demand orders by price in descending order with randomness for tie-breaking
             demand_orders.sort(
-                key=lambda x: (x["price"], random.random()), reverse=True
+                key=lambda x: (x["price"], self.tie_breaker()), reverse=True
             )
 
             dem_vol, gen_vol = 0, 0
@@ -170,6 +169,8 @@ class PayAsClearRole(MarketRole):
 
 
 class PayAsBidRole(MarketRole):
+    independent_products = True
+
     def __init__(self, marketconfig: MarketConfig):
         super().__init__(marketconfig)
 
@@ -187,12 +188,11 @@ class PayAsBidRole(MarketRole):
             tuple[Orderbook, Orderbook, list[dict]]: accepted orderbook, rejected orderbook and clearing meta data
         """
 
-        market_getter = itemgetter("start_time", "end_time", "only_hours")
         accepted_orders: Orderbook = []
         rejected_orders: Orderbook = []
         meta = []
-        orderbook.sort(key=market_getter)
-        for product, product_orders in groupby(orderbook, market_getter):
+        # the orders are taken from the product buckets of the orderbook
+        for product, product_orders in group_by_product(orderbook):
             accepted_demand_orders: Orderbook = []
             accepted_supply_orders: Orderbook = []
             if product not in market_products:
@@ -200,16 +200,15 @@ class PayAsBidRole(MarketRole):
                 # logger.debug(f'found unwanted bids for {product} should be {market_products}')
                 continue
 
-            product_orders = list(product_orders)
             supply_orders = [x for x in product_orders if x["volume"] > 0]
             demand_orders = [x for x in product_orders if x["volume"] < 0]
             # volume 0 is ignored/invalid
 
             # Sort supply orders by price with randomness for tie-breaking
-            supply_orders.sort(key=lambda i: (i["price"], random.random()))
+            supply_orders.sort(key=lambda i: (i["price"], self.tie_breaker()))
             # Sort demand orders by price in descending order with randomness for tie-breaking
             demand_orders.sort(
-                key=lambda i: (i["price"], random.random()), reverse=True
+                key=lambda i: (i["price"], self.tie_breaker()), reverse=True
             )
 
             dem_vol, gen_vol = 0, 0
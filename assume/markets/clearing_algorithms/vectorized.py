@@ -0,0 +1,378 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+import random
+from collections.abc import Callable
+from operator import itemgetter
+
+import numpy as np
+
+from assume.common.market_objects import MarketConfig, MarketProduct, Orderbook
+from assume.markets.clearing_algorithms.simple import (
+    PayAsBidRole,
+    PayAsClearRole,
+    calculate_meta,
+)
+from assume.markets.order_book import group_by_product
+
+logger = logging.getLogger(__name__)
+
+
+class MeritOrder:
+    """
+    Sorted supply and demand orders of a single product as NumPy arrays.
+
+    Supply orders are sorted by ascending and demand orders by descending price. Ties are broken
+    with draws of the tie breaker in the same order as the list based clearing roles, so that the
+    same seed gives the same merit order for both implementations.
+
+    The intersection is found on the cumulative volumes: ``demand_cover[i]`` is the position of the
+    supply order which covers the cumulative demand of the first ``i + 1`` demand orders, and
+    ``matched`` is the number of demand orders which are fully served before the price curves cross
+    or the supply runs out.
+
+    Attributes:
+        supply_orders (Orderbook): The supply orders in merit order.
+        demand_orders (Orderbook): The demand orders in merit order.
+        supply_prices (numpy.ndarray): The prices of the sorted supply orders.
+        demand_prices (numpy.ndarray): The prices of the sorted demand orders.
+        supply_volume (numpy.ndarray): The cumulative volume of the sorted supply orders.
+        demand_volume (numpy.ndarray): The cumulative (positive) volume of the sorted demand orders.
+        demand_cover (numpy.ndarray): The position of the supply order covering each cumulative demand.
+        matched (int): The number of demand orders which are fully served.
+
+    Args:
+        product_orders (Orderbook): The orders of a single product, orders with a volume of 0 are ignored.
+        tie_breaker (Callable[[], float], optional): Random number generator to break ties. Defaults to random.random.
+    """
+
+    def __init__(
+        self,
+        product_orders: Orderbook,
+        tie_breaker: Callable[[], float] = random.random,
+    ):
+        supply_orders = [x for x in product_orders if x["volume"] > 0]
+        demand_orders = [x for x in product_orders if x["volume"] < 0]
+
+        # same draws as the sort keys of the list based roles
+        supply_ties = [tie_breaker() for _ in supply_orders]
+        demand_ties = [tie_breaker() for _ in demand_orders]
+
+        supply_prices = np.array([x["price"] for x in supply_orders], dtype=float)
+        demand_prices = np.array([x["price"] for x in demand_orders], dtype=float)
+        supply_order = np.lexsort((supply_ties, supply_prices))
+        demand_order = np.lexsort((demand_ties, demand_prices))[::-1]
+
+        self.supply_orders = [supply_orders[i] for i in supply_order]
+        self.demand_orders = [demand_orders[i] for i in demand_order]
+        self.supply_prices = supply_prices[supply_order]
+        self.demand_prices = demand_prices[demand_order]
+        self.supply_volume = np.cumsum(
+            np.array([x["volume"] for x in self.supply_orders], dtype=float)
+        )
+        self.demand_volume = np.cumsum(
+            np.array([-x["volume"] for x in self.demand_orders], dtype=float)
+        )
+
+        self.demand_cover = np.searchsorted(
+            self.supply_volume, self.demand_volume, side="left"
+        )
+        covered = self.demand_cover < len(self.supply_orders)
+        served = covered.copy()
+        served[covered] = (
+            self.supply_prices[self.demand_cover[covered]]
+            <= self.demand_prices[covered]
+        )
+        # supply prices rise and demand prices fall along the merit order,
+        # so the served demand orders are a prefix of the demand orders
+        self.matched = int(np.argmin(served)) if not served.all() else len(served)
+
+    def excess(self, demand_pos: int) -> float:
+        """
+        Returns the supply volume of the covering supply order exceeding the given cumulative demand.
+
+        Args:
+            demand_pos (int): The position of the demand order.
+
+        Returns:
+            float: The excess volume of the covering supply order.
+        """
+        return float(
+            self.supply_volume[self.demand_cover[demand_pos]]
+            - self.demand_volume[demand_pos]
+        )
+
+    def served_demand(self) -> float:
+        """
+        Returns the cumulative demand volume of the fully served demand orders.
+
+        Returns:
+            float: The cumulative volume, 0 if no demand order is served.
+        """
+        return float(self.demand_volume[self.matched - 1]) if self.matched else 0.0
+
+    def affordable(self, start: int) -> int:
+        """
+        Returns the position of the first supply order after start which is more expensive than the
+        first unserved demand order.
+
+        Args:
+            start (int): The position of the first supply order which is considered.
+
+        Returns:
+            int: The position of the first supply order which is not accepted.
+        """
+        cross = np.searchsorted(
+            self.supply_prices, self.demand_prices[self.matched], side="right"
+        )
+        return max(int(cross), start)
+
+
+class VectorizedPayAsClearRole(PayAsClearRole):
+    """
+    Pay-as-clear market clearing on NumPy arrays.
+
+    Gives the same results as :class:`PayAsClearRole`, but finds the intersection of supply and
+    demand with ``lexsort``, ``cumsum`` and ``searchsorted`` instead of popping orders from sorted
+    lists, which takes quadratic time for large orderbooks. Accepted volumes are calculated from the
+    cumulative volumes, so they can differ from the list based role by floating point rounding.
+    """
+
+    def __init__(self, marketconfig: MarketConfig):
+        super().__init__(marketconfig)
+
+    def clear(
+        self, orderbook: Orderbook, market_products: list[MarketProduct]
+    ) -> (Orderbook, Orderbook, list[dict]):
+        """
+        Performs electricity market clearing using a pay-as-clear mechanism. This means that the clearing price is the
+        highest price that is still accepted. The clearing price is the same for all accepted orders.
+
+        Args:
+            orderbook (Orderbook): the orders to be cleared as an orderbook
+            market_products (list[MarketProduct]): the list of products which are cleared in this clearing
+
+        Returns:
+            tuple: accepted orderbook, rejected orderbook and clearing meta data
+        """
+        accepted_orders: Orderbook = []
+        rejected_orders: Orderbook = []
+        meta = []
+        # the orders are taken from the product buckets of the orderbook
+        for product, product_orders in group_by_product(orderbook):
+            if product not in market_products:
+                rejected_orders.extend(product_orders)
+                continue
+
+            merit_order = MeritOrder(product_orders, self.tie_breaker)
+            supply_orders = merit_order.supply_orders
+            demand_orders = merit_order.demand_orders
+            accepted_demand_orders = demand_orders[: merit_order.matched]
+            accepted_supply_orders: Orderbook = []
+
+            # fully served demand orders are covered by the supply orders up to the last cover
+            # the last of them is accepted partially, if it exceeds the demand
+            next_supply = 0
+            partial_supply = None
+            if merit_order.matched:
+                next_supply = int(merit_order.demand_cover[merit_order.matched - 1]) + 1
+                for supply_order in supply_orders[:next_supply]:
+                    if not supply_order.get("accepted_volume"):
+                        accepted_supply_orders.append(supply_order)
+                    supply_order["accepted_volume"] = supply_order["volume"]
+                excess = merit_order.excess(merit_order.matched - 1)
+                if excess > 0:
+                    partial_supply = supply_orders[next_supply - 1]
+                    partial_supply["accepted_volume"] = (
+                        partial_supply["volume"] - excess
+                    )
+            for demand_order in accepted_demand_orders:
+                demand_order["accepted_volume"] = demand_order["volume"]
+
+            # the supply orders which are left, starting with the partially accepted one
+            left_supply = supply_orders[next_supply:]
+            if partial_supply is not None:
+                left_supply.insert(0, partial_supply)
+                next_supply -= 1
+
+            if merit_order.matched < len(demand_orders):
+                demand_order = demand_orders[merit_order.matched]
+                if left_supply:
+                    # the unserved demand order takes all supply orders which are cheap enough
+                    end = merit_order.affordable(next_supply)
+                    gen_vol = merit_order.served_demand()
+                    for supply_order in supply_orders[next_supply:end]:
+                        gen_vol += supply_order["volume"] - supply_order.get(
+                            "accepted_volume", 0
+                        )
+                        if not supply_order.get("accepted_volume"):
+                            accepted_supply_orders.append(supply_order)
+                        supply_order["accepted_volume"] = supply_order["volume"]
+                    rejected_orders.extend(supply_orders[end:])
+                    left_supply = []
+
+                    diff = gen_vol - float(
+                        merit_order.demand_volume[merit_order.matched]
+                    )
+                    demand_order["accepted_volume"] = demand_order["volume"] - diff
+                    accepted_demand_orders.append(demand_order)
+                    rejected_orders.extend(demand_orders[merit_order.matched + 1 :])
+                else:
+                    # no generation is left - reject left over demand
+                    rejected_orders.extend(demand_orders[merit_order.matched :])
+
+            for order in left_supply:
+                # if the order was not accepted partially, it is rejected
+                if not order.get("accepted_volume"):
+                    rejected_orders.append(order)
+
+            # set clearing price - merit order - uniform pricing
+            if accepted_supply_orders:
+                clear_price = float(
+                    max(map(itemgetter("price"), accepted_supply_orders))
+                )
+            else:
+                clear_price = 0
+
+            accepted_product_orders = accepted_demand_orders + accepted_supply_orders
+            for order in accepted_product_orders:
+                order["accepted_price"] = clear_price
+            accepted_orders.extend(accepted_product_orders)
+
+            meta.append(
+                calculate_meta(
+                    accepted_supply_orders,
+                    accepted_demand_orders,
+                    product,
+                )
+            )
+
+        return accepted_orders, rejected_orders, meta
+
+
+class VectorizedPayAsBidRole(PayAsBidRole):
+    """
+    Pay-as-bid market clearing on NumPy arrays.
+
+    Gives the same results as :class:`PayAsBidRole`, but finds the intersection of supply and demand
+    with ``lexsort``, ``cumsum`` and ``searchsorted`` instead of popping orders from sorted lists.
+    Supply orders which serve multiple demand orders are split like in the list based role.
+    Accepted volumes are calculated from the cumulative volumes, so they can differ from the list
+    based role by floating point rounding.
+    """
+
+    def __init__(self, marketconfig: MarketConfig):
+        super().__init__(marketconfig)
+
+    def clear(
+        self, orderbook: Orderbook, market_products: list[MarketProduct]
+    ) -> (Orderbook, Orderbook, list[dict]):
+        """
+        Simulates electricity market clearing using a pay-as-bid mechanism.
+
+        Args:
+            orderbook (Orderbook): the orders to be cleared as an orderbook
+            market_products (list[MarketProduct]): the list of products which are cleared in this clearing
+
+        Returns:
+            tuple[Orderbook, Orderbook, list[dict]]: accepted orderbook, rejected orderbook and clearing meta data
+        """
+        accepted_orders: Orderbook = []
+        rejected_orders: Orderbook = []
+        meta = []
+        # the orders are taken from the product buckets of the orderbook
+        for product, product_orders in group_by_product(orderbook):
+            if product not in market_products:
+                rejected_orders.extend(product_orders)
+                continue
+
+            merit_order = MeritOrder(product_orders, self.tie_breaker)
+            supply_orders = merit_order.supply_orders
+            demand_orders = merit_order.demand_orders
+            accepted_demand_orders: Orderbook = []
+            accepted_supply_orders: Orderbook = []
+
+            # the left over of a supply order which was split for the previous demand order
+            split_supply_order = None
+            next_supply = 0
+            for demand_pos in range(merit_order.matched):
+                demand_order = demand_orders[demand_pos]
+                cover = int(merit_order.demand_cover[demand_pos])
+                to_commit: Orderbook = []
+                if split_supply_order is not None:
+                    to_commit.append(split_supply_order)
+                to_commit.extend(supply_orders[next_supply : cover + 1])
+                next_supply = max(next_supply, cover + 1)
+                for supply_order in to_commit:
+                    supply_order["accepted_volume"] = supply_order["volume"]
+
+                split_supply_order = None
+                excess = merit_order.excess(demand_pos)
+                if excess > 0:
+                    # generation left over - split generation
+                    supply_order = to_commit[-1]
+                    split_supply_order = supply_order.copy()
+                    split_supply_order["volume"] = excess
+                    supply_order["accepted_volume"] = supply_order["volume"] - excess
+                demand_order["accepted_volume"] = demand_order["volume"]
+
+                accepted_demand_orders.append(demand_order)
+                # pay as bid
+                for supply_order in to_commit:
+                    supply_order["accepted_price"] = supply_order["price"]
+                    demand_order["accepted_price"] = supply_order["price"]
+                accepted_supply_orders.extend(to_commit)
+
+            left_supply = supply_orders[next_supply:]
+            if split_supply_order is not None:
+                left_supply.insert(0, split_supply_order)
+
+            if merit_order.matched < len(demand_orders):
+                demand_order = demand_orders[merit_order.matched]
+                if left_supply:
+                    # the unserved demand order takes all supply orders which are cheap enough
+                    start = next_supply - (split_supply_order is not None)
+                    count = merit_order.affordable(start) - start
+                    to_commit = left_supply[:count]
+                    rejected_orders.extend(left_supply[count:])
+                    left_supply = []
+
+                    gen_vol = merit_order.served_demand()
+                    for supply_order in to_commit:
+                        supply_order["accepted_volume"] = supply_order["volume"]
+                        gen_vol += supply_order["volume"]
+
+                    # generation is not enough - split demand
+                    diff = gen_vol - float(
+                        merit_order.demand_volume[merit_order.matched]
+                    )
+                    split_demand_order = demand_order.copy()
+                    split_demand_order["accepted_volume"] = diff
+                    demand_order["accepted_volume"] = demand_order["volume"] - diff
+                    rejected_orders.append(split_demand_order)
+
+                    accepted_demand_orders.append(demand_order)
+                    for supply_order in to_commit:
+                        supply_order["accepted_price"] = supply_order["price"]
+                        demand_order["accepted_price"] = supply_order["price"]
+                    accepted_supply_orders.extend(to_commit)
+                    rejected_orders.extend(demand_orders[merit_order.matched + 1 :])
+                else:
+                    # no generation is left - reject left over demand
+                    rejected_orders.extend(demand_orders[merit_order.matched :])
+
+            rejected_orders.extend(left_supply)
+
+            accepted_product_orders = accepted_demand_orders + accepted_supply_orders
+
+            accepted_orders.extend(accepted_product_orders)
+            meta.append(
+                calculate_meta(
+                    accepted_supply_orders,
+                    accepted_demand_orders,
+                    product,
+                )
+            )
+        return accepted_orders, rejected_orders, meta
@@ -0,0 +1,376 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from itertools import groupby
+
+from assume.common.market_objects import Order, Orderbook
+
+
+def get_product_key(order: Order) -> tuple:
+    """
+    Returns the key of the product an order belongs to.
+
+    Args:
+        order (Order): The order.
+
+    Returns:
+        tuple: The start time, end time and only hours of the order.
+    """
+    return order.get("start_time"), order.get("end_time"), order.get("only_hours")
+
+
+def is_supply(order: Order) -> bool:
+    """
+    Checks if an order is a supply order.
+
+    Block orders have a volume per timestep and count as supply if any of the volumes is positive.
+
+    Args:
+        order (Order): The order.
+
+    Returns:
+        bool: True if the order is a supply order, False if it is a demand order.
+    """
+    volume = order["volume"]
+    if isinstance(volume, dict):
+        return any(v > 0 for v in volume.values())
+    return volume > 0
+
+
+class OrderBookSide:
+    """
+    The orders of one side of a product, sorted by price.
+
+    Supply orders are sorted by ascending price and demand orders by descending price, so that the best order
+    is always the first one. Orders with the same price keep the order of their submission.
+    Added orders are appended and the side is sorted once when it is queried, so that submitting n orders
+    does not need n insertions into the sorted list.
+
+    Attributes:
+        orders (list[Order]): The sorted orders.
+        keys (list[float]): The sort keys of the orders.
+
+    Args:
+        ascending (bool): Whether the orders are sorted by ascending price.
+    """
+
+    def __init__(self, ascending: bool):
+        self.ascending = ascending
+        self._orders = []
+        self._keys = []
+        self._sorted = True
+
+    def _key(self, price: float) -> float:
+        return price if self.ascending else -price
+
+    def _sort(self) -> None:
+        if not self._sorted:
+            # the sort is stable, so equal prices keep the order of submission
+            self._orders.sort(key=lambda order: self._key(order["price"]))
+            self._keys = [self._key(order["price"]) for order in self._orders]
+            self._sorted = True
+
+    @property
+    def orders(self) -> list[Order]:
+        self._sort()
+        return self._orders
+
+    @property
+    def keys(self) -> list[float]:
+        self._sort()
+        return self._keys
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self):
+        return iter(self.orders)
+
+    def add(self, order: Order) -> None:
+        """
+        Adds an order, which is sorted into its price position with the next query.
+
+        Args:
+            order (Order): The order to add.
+        """
+        key = self._key(order["price"])
+        if self._keys and key < self._keys[-1]:
+            self._sorted = False
+        self._keys.append(key)
+        self._orders.append(order)
+
+    def remove(self, order: Order) -> None:
+        """
+        Removes an order.
+
+        Args:
+            order (Order): The order to remove.
+        """
+        pos = len(self._orders)
+        if self._sorted:
+            key = self._key(order["price"])
+            pos = bisect_left(self._keys, key)
+            end = bisect_right(self._keys, key)
+            while pos < end and self._orders[pos] is not order:
+                pos += 1
+            if pos == end:
+                pos = len(self._orders)
+        if pos == len(self._orders):
+            # the side is not sorted or the price was changed after the order was added
+            pos = next(i for i, other in enumerate(self._orders) if other is order)
+        del self._keys[pos]
+        del self._orders[pos]
+
+    def best(self) -> Order | None:
+        """
+        Returns the order with the best price, or None if the side is empty.
+        """
+        return self.orders[0] if self._orders else None
+
+    def up_to(self, price: float) -> list[Order]:
+        """
+        Returns all orders which are at least as good as the given price.
+
+        For supply orders these are the orders with a price lower or equal to the given price,
+        for demand orders the orders with a price higher or equal to the given price.
+
+        Args:
+            price (float): The limit price.
+
+        Returns:
+            list[Order]: The orders sorted by price.
+        """
+        return self.orders[: bisect_right(self.keys, self._key(price))]
+
+
+class ProductOrders:
+    """
+    The orders of a single product.
+
+    Attributes:
+        orders (list[Order]): The orders in the order of their submission.
+        supply (OrderBookSide): The supply orders sorted by ascending price.
+        demand (OrderBookSide): The demand orders sorted by descending price.
+    """
+
+    def __init__(self):
+        self.orders = []
+        self.supply = OrderBookSide(ascending=True)
+        self.demand = OrderBookSide(ascending=False)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def side(self, order: Order) -> OrderBookSide:
+        return self.supply if is_supply(order) else self.demand
+
+
+class OrderBook(list):
+    """
+    An orderbook which sorts the orders into buckets per product when they are submitted.
+
+    Each product, identified by its start time, end time and only hours, keeps its supply and demand orders,
+    which are sorted by price once when they are queried, so that queries for the orders of a product or for
+    the best prices do not need to scan or sort all orders. The orderbook is still a list of all orders in the order of their submission,
+    so it can be passed to the clearing of the market mechanisms as before.
+
+    The methods of the list which add or remove orders also update the buckets.
+
+    Args:
+        orders (Iterable[Order], optional): The initial orders.
+
+    Example:
+        >>> orderbook = OrderBook()
+        >>> orderbook.append(order)
+        >>> orderbook.get_orders((start, end, None))
+        [order]
+    """
+
+    def __init__(self, orders: Iterable[Order] = ()):
+        super().__init__()
+        self.products: dict[tuple, ProductOrders] = {}
+        self.extend(orders)
+
+    def _add(self, order: Order) -> None:
+        key = get_product_key(order)
+        product = self.products.get(key)
+        if product is None:
+            product = self.products[key] = ProductOrders()
+        product.orders.append(order)
+        product.side(order).add(order)
+
+    def _discard(self, order: Order) -> None:
+        key = get_product_key(order)
+        product = self.products[key]
+        for i, other in enumerate(product.orders):
+            if other is order:
+                del product.orders[i]
+                break
+        product.side(order).remove(order)
+        if not product.orders:
+            del self.products[key]
+
+    def _rebuild(self) -> None:
+        self.products = {}
+        for order in self:
+            self._add(order)
+
+    def append(self, order: Order) -> None:
+        super().append(order)
+        self._add(order)
+
+    def extend(self, orders: Iterable[Order]) -> None:
+        orders = list(orders)
+        super().extend(orders)
+        for order in orders:
+            self._add(order)
+
+    def __iadd__(self, orders: Iterable[Order]):
+        self.extend(orders)
+        return self
+
+    def insert(self, index: int, order: Order) -> None:
+        super().insert(index, order)
+        self._add(order)
+
+    def remove(self, order: Order) -> None:
+        super().remove(order)
+        self._discard(order)
+
+    def pop(self, index: int = -1) -> Order:
+        order = super().pop(index)
+        self._discard(order)
+        return order
+
+    def clear(self) -> None:
+        super().clear()
+        self.products = {}
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._rebuild()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._rebuild()
+
+    def get_orders(self, product: tuple) -> Orderbook:
+        """
+        Returns the orders of a product in the order of their submission.
+
+        Args:
+            product (tuple): The start time, end time and only hours of the product.
+
+        Returns:
+            Orderbook: The orders of the product.
+        """
+        bucket = self.products.get(product)
+        return list(bucket.orders) if bucket else []
+
+    def get_supply(self, product: tuple, max_price: float | None = None) -> Orderbook:
+        """
+        Returns the supply orders of a product sorted by ascending price.
+
+        Args:
+            product (tuple): The start time, end time and only hours of the product.
+            max_price (float, optional): Only return orders with a price lower or equal to this price.
+
+        Returns:
+            Orderbook: The supply orders of the product.
+        """
+        bucket = self.products.get(product)
+        if bucket is None:
+            return []
+        if max_price is None:
+            return list(bucket.supply.orders)
+        return bucket.supply.up_to(max_price)
+
+    def get_demand(self, product: tuple, min_price: float | None = None) -> Orderbook:
+        """
+        Returns the demand orders of a product sorted by descending price.
+
+        Args:
+            product (tuple): The start time, end time and only hours of the product.
+            min_price (float, optional): Only return orders with a price higher or equal to this price.
+
+        Returns:
+            Orderbook: The demand orders of the product.
+        """
+        bucket = self.products.get(product)
+        if bucket is None:
+            return []
+        if min_price is None:
+            return list(bucket.demand.orders)
+        return bucket.demand.up_to(min_price)
+
+    def best_prices(self, product: tuple) -> tuple[float | None, float | None]:
+        """
+        Returns the lowest supply price and the highest demand price of a product.
+
+        Args:
+            product (tuple): The start time, end time and only hours of the product.
+
+        Returns:
+            tuple[float | None, float | None]: The best supply and demand price, None if a side has no orders.
+        """
+        bucket = self.products.get(product)
+        if bucket is None:
+            return None, None
+        supply, demand = bucket.supply.best(), bucket.demand.best()
+        return (
+            supply["price"] if supply else None,
+            demand["price"] if demand else None,
+        )
+
+    def product_orders(self) -> list[tuple[tuple, Orderbook]]:
+        """
+        Returns the orders of each product, with the products sorted by start time, end time and only hours.
+
+        Returns:
+            list[tuple[tuple, Orderbook]]: The key and the orders of each product in the order of their submission.
+        """
+        return [
+            (key, list(self.products[key].orders))
+            for key in sorted(self.products, key=_sortable_key)
+        ]
+
+    def partitions(self) -> list[Orderbook]:
+        """
+        Returns the orders grouped by product, with the products sorted by start time, end time and only hours.
+
+        Returns:
+            list[Orderbook]: The orders of each product in the order of their submission.
+        """
+        return [orders for _, orders in self.product_orders()]
+
+
+def group_by_product(orderbook: Orderbook) -> list[tuple[tuple, Orderbook]]:
+    """
+    Groups the orders by product, with the products sorted by start time, end time and only hours.
+
+    The buckets of an :class:`OrderBook` are used directly, other orderbooks are sorted by product.
+    The orders of each product keep the order of their submission in both cases.
+
+    Args:
+        orderbook (Orderbook): The orders.
+
+    Returns:
+        list[tuple[tuple, Orderbook]]: The key and the orders of each product.
+    """
+    if isinstance(orderbook, OrderBook):
+        return orderbook.product_orders()
+    orderbook.sort(key=_sortable_order_key)
+    return [(key, list(orders)) for key, orders in groupby(orderbook, get_product_key)]
+
+
+def _sortable_order_key(order: Order) -> tuple:
+    return _sortable_key(get_product_key(order))
+
+
+def _sortable_key(key: tuple) -> tuple:
+    # only_hours is None for most products, which can not be compared with tuples
+    start, end, only_hours = key
+    return start, end, only_hours is not None, only_hours or ()
@@ -49,6 +49,7 @@ class RLUnitsOperator(UnitsOperator):
             unit (BaseUnit): The unit to be added.
         """
         self.units[unit.id] = unit
+        self.get_output_keys(unit)
 
         # check if unit has learning strategy for any of the available markets
         for market in self.available_markets:
@@ -102,7 +103,7 @@ class RLUnitsOperator(UnitsOperator):
             order["market_id"] = content["market_id"]
 
         marketconfig = self.registered_markets[content["market_id"]]
-        self.valid_orders[marketconfig.product_type].extend(orderbook)
+        self.add_to_dispatch_timeline(orderbook, marketconfig.product_type)
         self.set_unit_dispatch(orderbook, marketconfig)
         self.write_learning_to_output(orderbook, marketconfig.market_id)
         self.write_actual_dispatch(marketconfig.product_type)
@@ -153,17 +154,7 @@ class RLUnitsOperator(UnitsOperator):
                         }
                     )
 
-                action_tuple = unit.outputs["actions"].loc[start]
-                noise_tuple = unit.outputs["exploration_noise"].loc[start]
-                action_dim = action_tuple.numel()
-
-                for i in range(action_dim):
-                    output_dict[f"exploration_noise_{i}"] = (
-                        noise_tuple[i] if action_dim > 1 else noise_tuple
-                    )
-                    output_dict[f"actions_{i}"] = (
-                        action_tuple[i] if action_dim > 1 else action_tuple
-                    )
+                output_dict.update(strategy.get_actions_output(unit, start))
 
                 output_agent_list.append(output_dict)
 
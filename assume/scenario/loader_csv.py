@@ -3,9 +3,13 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import copy
+import hashlib
+import json
 import logging
+import os
 from collections import defaultdict
 from datetime import datetime, timedelta
+from importlib.metadata import version
 from pathlib import Path
 
 import dateutil.rrule as rr
@@ -16,7 +20,7 @@ from tqdm import tqdm
 
 from assume.common.base import LearningConfig
 from assume.common.exceptions import AssumeException
-from assume.common.forecasts import CsvForecaster, Forecaster
+from assume.common.forecasts import FORECASTS_VERSION, CsvForecaster, Forecaster
 from assume.common.market_objects import MarketConfig, MarketProduct
 from assume.common.utils import (
     adjust_unit_operator_for_learning,
@@ -399,19 +403,117 @@ def read_units(
     return units_dict
 
 
+# the files from which the forecasts are created
+FORECAST_FILES = (
+    "powerplant_units",
+    "demand_units",
+    "forecasts_df",
+    "demand_df",
+    "cross_border_flows",
+    "availability_df",
+    "electricity_prices",
+    "price_forecasts",
+    "fuel_prices_df",
+    "temperature",
+)
+
+
+def get_forecasts_hash(path: str, config: dict) -> str:
+    """
+    Returns a hash of the config of a study case and the input files from which the forecasts are created.
+
+    The files are identified by their size and modification time, so that their content does not need to be read.
+    The hash includes the package version and :data:`assume.common.forecasts.FORECASTS_VERSION`. As the package version
+    does not change in editable installs, the cache must be cleared after changing or upgrading the forecast code.
+
+    Args:
+        path (str): The path to the folder of the scenario.
+        config (dict): The config of the study case.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    digest = hashlib.sha256(
+        f"{version('assume-framework')}:{FORECASTS_VERSION}".encode()
+    )
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    for file_name in FORECAST_FILES:
+        if file_name in config:
+            if config[file_name] is None:
+                continue
+            file_path = Path(path) / config[file_name]
+        else:
+            file_path = Path(path) / f"{file_name}.csv"
+
+        if file_path.exists():
+            stat = file_path.stat()
+            digest.update(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        else:
+            digest.update(f"{file_name}:missing".encode())
+    return digest.hexdigest()
+
+
+def load_cached_forecasts(forecaster: Forecaster, cache_file: Path) -> bool:
+    """
+    Sets the forecasts of the forecaster from the cache, the cached matrix is memory-mapped read-only.
+
+    Args:
+        forecaster (Forecaster): The forecaster.
+        cache_file (pathlib.Path): The path of the cached forecasts without suffix.
+
+    Returns:
+        bool: Whether the forecasts were found in the cache.
+    """
+    data_file = cache_file.with_suffix(".npy")
+    columns_file = cache_file.with_suffix(".json")
+    if not data_file.exists() or not columns_file.exists():
+        return False
+    with open(columns_file) as f:
+        columns = json.load(f)
+    forecaster.set_data(np.load(data_file, mmap_mode="r"), columns)
+    logger.info(f"Loaded forecasts from cache {data_file}")
+    return True
+
+
+def save_cached_forecasts(forecaster: Forecaster, cache_file: Path) -> None:
+    """
+    Stores the forecasts of the forecaster in the cache.
+
+    The files are written under a temporary name first, so that runs started in parallel never read an incomplete file.
+
+    Args:
+        forecaster (Forecaster): The forecaster.
+        cache_file (pathlib.Path): The path of the cached forecasts without suffix.
+    """
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(list(forecaster.column_positions), f)
+    os.replace(tmp_file, cache_file.with_suffix(".json"))
+    with open(tmp_file, "wb") as f:
+        np.save(f, forecaster.data)
+    os.replace(tmp_file, cache_file.with_suffix(".npy"))
+
+
 def load_config_and_create_forecaster(
     inputs_path: str,
     scenario: str,
     study_case: str,
+    forecasts_cache_path: str = "",
 ) -> dict[str, object]:
     """
     Load the configuration and files for a given scenario and study case. This function
     allows us to load the files and config only once when running multiple iterations of the same scenario.
 
+    If a cache path is given, the created forecasts are stored there and later runs with the same config and input files
+    map the cached forecasts instead of reading the time series and calculating the forecasts again.
+    The cache should be cleared after upgrading ASSUME, as changes of the forecast code are not always detected.
+
     Args:
         inputs_path (str): The path to the folder containing input files necessary for the scenario.
         scenario (str): The name of the scenario to be loaded.
         study_case (str): The specific study case within the scenario to be loaded.
+        forecasts_cache_path (str, optional): The path to the folder of the forecast cache. Defaults to "", which disables the cache.
 
     Returns:
         dict[str, object]:: A dictionary containing the configuration and loaded files for the scenario and study case.
@@ -448,6 +550,49 @@ def load_config_and_create_forecaster(
     if powerplant_units is None or demand_units is None:
         raise ValueError("No power plant or no demand units were provided!")
 
+    forecaster = CsvForecaster(
+        index=index,
+        powerplants_units=powerplant_units,
+        demand_units=demand_units,
+        market_configs=config["markets_config"],
+    )
+
+    cache_file = None
+    if forecasts_cache_path:
+        cache_file = Path(forecasts_cache_path) / get_forecasts_hash(path, config)
+    if cache_file is None or not load_cached_forecasts(forecaster, cache_file):
+        create_forecasts(forecaster, path, config, index)
+        if cache_file is not None:
+            save_cached_forecasts(forecaster, cache_file)
+    forecaster.freeze()
+
+    return {
+        "config": config,
+        "sim_id": sim_id,
+        "path": path,
+        "start": start,
+        "end": end,
+        "index": index,
+        "powerplant_units": powerplant_units,
+        "storage_units": storage_units,
+        "demand_units": demand_units,
+        "industrial_dsm_units": industrial_dsm_units,
+        "forecaster": forecaster,
+    }
+
+
+def create_forecasts(
+    forecaster: CsvForecaster, path: str, config: dict, index: pd.DatetimeIndex
+) -> None:
+    """
+    Reads the time series of a study case and sets them as forecasts, missing forecasts are calculated.
+
+    Args:
+        forecaster (CsvForecaster): The forecaster.
+        path (str): The path to the folder of the scenario.
+        config (dict): The config of the study case.
+        index (pandas.DatetimeIndex): The index of the simulation.
+    """
     forecasts_df = load_file(
         path=path, config=config, file_name="forecasts_df", index=index
     )
@@ -469,7 +614,9 @@ def load_config_and_create_forecaster(
             "The availability will be normalized automatically. "
             "The quality of the automatic normalization is not guaranteed."
         )
-        availability = normalize_availability(powerplant_units, availability)
+        availability = normalize_availability(
+            forecaster.powerplants_units, availability
+        )
 
     electricity_prices_df = load_file(
         path=path, config=config, file_name="electricity_prices", index=index
@@ -484,13 +631,6 @@ def load_config_and_create_forecaster(
         path=path, config=config, file_name="temperature", index=index
     )
 
-    forecaster = CsvForecaster(
-        index=index,
-        powerplants_units=powerplant_units,
-        demand_units=demand_units,
-        market_configs=config["markets_config"],
-    )
-
     forecaster.set_forecast(forecasts_df)
     forecaster.set_forecast(demand_df)
     forecaster.set_forecast(cross_border_flows_df)
@@ -501,20 +641,6 @@ def load_config_and_create_forecaster(
     forecaster.set_forecast(temperature_df)
     forecaster.calc_forecast_if_needed()
 
-    return {
-        "config": config,
-        "sim_id": sim_id,
-        "path": path,
-        "start": start,
-        "end": end,
-        "index": index,
-        "powerplant_units": powerplant_units,
-        "storage_units": storage_units,
-        "demand_units": demand_units,
-        "industrial_dsm_units": industrial_dsm_units,
-        "forecaster": forecaster,
-    }
-
 
 async def async_setup_world(
     world: World,
@@ -725,6 +851,7 @@ def load_scenario_folder(
     terminate_learning: bool = False,
     episode: int = 1,
     eval_episode: int = 1,
+    forecasts_cache_path: str = "",
 ):
     """
     Load a scenario from a given path.
@@ -740,6 +867,7 @@ def load_scenario_folder(
         terminate_learning (bool, optional): An automatically set flag indicating that we terminated the learning process now, either because we reach the end of the episode itteration or because we triggered an early stopping.
         episode (int, optional): The episode number for learning. Defaults to 0.
         eval_episode (int, optional): The episode number for evaluation. Defaults to 0.
+        forecasts_cache_path (str, optional): The path to the folder of the forecast cache. Defaults to "", which disables the cache.
 
     Raises:
         ValueError: If the specified scenario or study case is not found in the provided inputs.
@@ -765,7 +893,9 @@ def load_scenario_folder(
     """
     logger.info(f"Starting Scenario {scenario}/{study_case} from {inputs_path}")
 
-    scenario_data = load_config_and_create_forecaster(inputs_path, scenario, study_case)
+    scenario_data = load_config_and_create_forecaster(
+        inputs_path, scenario, study_case, forecasts_cache_path
+    )
 
     setup_world(
         world=world,
@@ -896,9 +1026,11 @@ def run_learning(
     if not verbose:
         logger.setLevel(logging.WARNING)
 
-    # remove csv path so that nothing is written while learning
+    # remove csv and parquet path so that nothing is written while learning
     temp_csv_path = world.export_csv_path
     world.export_csv_path = ""
+    temp_parquet_path = world.export_parquet_path
+    world.export_parquet_path = ""
 
     # initialize policies already here to set the obs_dim and act_dim in the learning role
     actors_and_critics = None
@@ -1024,6 +1156,7 @@ def run_learning(
     logger.info("################")
     logger.info("Training finished, Start evaluation run")
     world.export_csv_path = temp_csv_path
+    world.export_parquet_path = temp_parquet_path
 
     world.reset()
 
@@ -197,9 +197,8 @@ class RLStrategy(LearningStrategy):
         unit.outputs["rl_observations"].append(next_observation)
         unit.outputs["rl_actions"].append(actions)
 
-        # store results in unit outputs as series to be written to the database by the unit operator
-        unit.outputs["actions"][start] = actions
-        unit.outputs["exploration_noise"][start] = noise
+        # store results in unit outputs as float columns to be written to the database by the unit operator
+        self.store_actions(unit, start, actions, noise)
 
         bids = self.remove_empty_bids(bids)
 
@@ -6,9 +6,11 @@ import logging
 from datetime import datetime, timedelta
 from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 from assume.common.base import SupportsMinMax
+from assume.common.dispatch_kernels import apply_ramp_constraints
 from assume.common.market_objects import MarketConfig, Orderbook
 from assume.common.utils import get_products_index
 
@@ -48,6 +50,14 @@ class PowerPlant(SupportsMinMax):
         **kwargs (dict, optional): Additional keyword arguments to be passed to the base class. Defaults to {}.
     """
 
+    output_columns = (
+        "energy",
+        "energy_cashflow",
+        "heat",
+        "capacity_pos",
+        "capacity_neg",
+    )
+
     def __init__(
         self,
         id: str,
@@ -148,19 +158,15 @@ class PowerPlant(SupportsMinMax):
             self.forecaster.get_availability(self.id)[start:end] * self.max_power
         )
 
-        for t in self.outputs["energy"][start:end].index:
-            current_power = self.outputs["energy"][t]
-
-            previous_power = self.get_output_before(t)
-            op_time = self.get_operation_time(t)
-
-            current_power = self.calculate_ramp(op_time, previous_power, current_power)
-
-            if current_power > 0:
-                current_power = min(current_power, max_power[t])
-                current_power = max(current_power, self.min_power)
-
-            self.outputs["energy"][t] = current_power
+        energy = self.outputs.get_array("energy")
+        positions = self.time_index.get_slice(start, end)
+        self.apply_ramp_constraints(
+            energy,
+            np.arange(positions.start, positions.stop),
+            max_power.loc[self.index[positions]].to_numpy(dtype=float),
+        )
+        # the executed dispatch is final
+        self.operation_counters.commit(positions.stop)
 
         return self.outputs["energy"].loc[start:end]
 
@@ -183,35 +189,27 @@ class PowerPlant(SupportsMinMax):
         )
 
         product_type = marketconfig.product_type
+        dispatch = self.outputs.get_array(product_type)
         for order in orderbook:
             start = order["start_time"]
             end = order["end_time"]
-            end_excl = end - self.index.freq
+            positions = self.time_index.get_product_slice(start, end)
             if isinstance(order["accepted_volume"], dict):
-                self.outputs[product_type].loc[start:end_excl] += [
+                dispatch[positions] += [
                     order["accepted_volume"][key]
                     for key in order["accepted_volume"].keys()
                 ]
             else:
-                self.outputs[product_type].loc[start:end_excl] += order[
-                    "accepted_volume"
-                ]
+                dispatch[positions] += order["accepted_volume"]
 
         self.calculate_cashflow(product_type, orderbook)
 
-        for start in products_index:
-            current_power = self.outputs[product_type][start]
-
-            previous_power = self.get_output_before(start)
-            op_time = self.get_operation_time(start)
-
-            current_power = self.calculate_ramp(op_time, previous_power, current_power)
-
-            if current_power > 0:
-                current_power = min(current_power, max_power[start])
-                current_power = max(current_power, self.min_power)
-
-            self.outputs[product_type][start] = current_power
+        if len(products_index):
+            self.apply_ramp_constraints(
+                dispatch,
+                self.time_index.get_positions(products_index),
+                max_power.to_numpy(dtype=float),
+            )
 
         self.bidding_strategies[marketconfig.market_id].calculate_reward(
             unit=self,
@@ -219,6 +217,49 @@ class PowerPlant(SupportsMinMax):
             orderbook=orderbook,
         )
 
+    def apply_ramp_constraints(
+        self,
+        dispatch: np.ndarray,
+        positions: np.ndarray,
+        available_power: np.ndarray,
+    ) -> None:
+        """
+        Corrects the dispatch at the given positions according to the ramping and operation time restrictions
+        and the available power of the unit.
+
+        The dispatch kernel inlines :meth:`calculate_ramp`, so if a subclass overrides it, the constraints are
+        applied by calling the method for each timestep instead.
+
+        Args:
+            dispatch (numpy.ndarray): The dispatch which is corrected in place.
+            positions (numpy.ndarray): The ascending positions of the timesteps to correct.
+            available_power (numpy.ndarray): The available power at each of the positions.
+        """
+        if type(self).calculate_ramp is not PowerPlant.calculate_ramp:
+            for i, pos in enumerate(positions):
+                power = self.calculate_ramp(
+                    self.get_operation_time(self.index[pos]),
+                    self.get_output_before(pos),
+                    dispatch[pos],
+                )
+                if power > 0:
+                    power = max(min(power, available_power[i]), self.min_power)
+                dispatch[pos] = power
+            return
+
+        apply_ramp_constraints(
+            dispatch,
+            self.outputs.get_array("energy"),
+            positions,
+            available_power,
+            float(self.min_power),
+            float(self.max_power),
+            float(self.ramp_up),
+            float(self.ramp_down),
+            int(self.min_operating_time),
+            int(self.min_down_time),
+        )
+
     def calc_simple_marginal_cost(
         self,
     ):
@@ -323,15 +364,18 @@ class PowerPlant(SupportsMinMax):
             The calculation does not include ramping constraints and can be used for arbitrary start times in the future.
         """
         end_excl = end - self.index.freq
+        positions = self.time_index.get_product_slice(start, end)
 
-        base_load = self.outputs["energy"][start:end_excl]
-        heat_demand = self.outputs["heat"][start:end_excl]
+        base_load = self.outputs.get_array("energy")[positions]
+        heat_demand = self.outputs.get_array("heat")[positions]
 
-        capacity_neg = self.outputs["capacity_neg"][start:end_excl]
+        capacity_neg = self.outputs.get_array("capacity_neg")[positions]
         # needed minimum + capacity_neg - what is already sold is actual minimum
         min_power = self.min_power + capacity_neg - base_load
         # min_power should be at least the heat demand at that time
-        min_power = min_power.clip(lower=heat_demand)
+        min_power = pd.Series(
+            np.maximum(min_power, heat_demand), index=self.index[positions]
+        )
 
         available_power = self.forecaster.get_availability(self.id)[start:end_excl]
         # check if available power is larger than max_power and raise an error if so
@@ -341,7 +385,7 @@ class PowerPlant(SupportsMinMax):
             )
         max_power = available_power * self.max_power
         # provide reserve for capacity_pos
-        max_power = max_power - self.outputs["capacity_pos"][start:end_excl]
+        max_power = max_power - self.outputs.get_array("capacity_pos")[positions]
         # remove what has already been bid
         max_power = max_power - base_load
         # make sure that max_power is > 0 for all timesteps
@@ -6,9 +6,11 @@ import logging
 from datetime import timedelta
 from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 from assume.common.base import SupportsMinMaxCharge
+from assume.common.dispatch_kernels import apply_soc_constraints
 from assume.common.market_objects import MarketConfig, Orderbook
 from assume.common.utils import get_products_index
 
@@ -51,6 +53,14 @@ class Storage(SupportsMinMaxCharge):
 
     """
 
+    output_columns = (
+        "energy",
+        "energy_cashflow",
+        "soc",
+        "capacity_pos",
+        "capacity_neg",
+    )
+
     def __init__(
         self,
         id: str,
@@ -173,53 +183,14 @@ class Storage(SupportsMinMaxCharge):
         Returns:
             pd.Series: The volume of the unit within the given time range.
         """
-        time_delta = self.index.freq / timedelta(hours=1)
-
-        for t in self.outputs["energy"][start : end - self.index.freq].index:
-            delta_soc = 0
-            soc = self.outputs["soc"][t]
-            if self.outputs["energy"][t] > self.max_power_discharge:
-                self.outputs["energy"][t] = self.max_power_discharge
-            elif self.outputs["energy"][t] < self.max_power_charge:
-                self.outputs["energy"][t] = self.max_power_charge
-            elif (
-                self.outputs["energy"][t] < self.min_power_discharge
-                and self.outputs["energy"][t] > self.min_power_charge
-                and self.outputs["energy"][t] != 0
-            ):
-                self.outputs["energy"][t] = 0
-
-            # discharging
-            if self.outputs["energy"][t] > 0:
-                max_soc_discharge = self.calculate_soc_max_discharge(soc)
-
-                if self.outputs["energy"][t] > max_soc_discharge:
-                    self.outputs["energy"][t] = max_soc_discharge
-
-                time_delta = self.index.freq / timedelta(hours=1)
-                delta_soc = (
-                    -self.outputs["energy"][t]
-                    * time_delta
-                    / self.efficiency_discharge
-                    / self.max_volume
-                )
-
-            # charging
-            elif self.outputs["energy"][t] < 0:
-                max_soc_charge = self.calculate_soc_max_charge(soc)
-
-                if self.outputs["energy"][t] < max_soc_charge:
-                    self.outputs["energy"][t] = max_soc_charge
-
-                time_delta = self.index.freq / timedelta(hours=1)
-                delta_soc = (
-                    -self.outputs["energy"][t]
-                    * time_delta
-                    * self.efficiency_charge
-                    / self.max_volume
-                )
-
-            self.outputs["soc"][t + self.index.freq] = soc + delta_soc
+        energy = self.outputs.get_array("energy")
+        positions = self.time_index.get_product_slice(start, end)
+        self.apply_soc_constraints(
+            energy,
+            np.arange(positions.start, positions.stop),
+            limit_power=True,
+            fill_to_end=False,
+        )
 
         return self.outputs["energy"].loc[start:end]
 
@@ -238,59 +209,125 @@ class Storage(SupportsMinMaxCharge):
         products_index = get_products_index(orderbook)
 
         product_type = marketconfig.product_type
+        dispatch = self.outputs.get_array(product_type)
         for order in orderbook:
-            start = order["start_time"]
-            end = order["end_time"]
-            end_excl = end - self.index.freq
+            positions = self.time_index.get_product_slice(
+                order["start_time"], order["end_time"]
+            )
             if isinstance(order["accepted_volume"], dict):
                 added_volume = list(order["accepted_volume"].values())
             else:
                 added_volume = order["accepted_volume"]
-            self.outputs[product_type].loc[start:end_excl] += added_volume
+            dispatch[positions] += added_volume
         self.calculate_cashflow(product_type, orderbook)
 
-        for start in products_index:
-            delta_soc = 0
-            soc = self.outputs["soc"][start]
-            current_power = self.outputs[product_type][start]
+        if len(products_index):
+            # the state of charge after the last product is kept until the end
+            self.apply_soc_constraints(
+                dispatch,
+                self.time_index.get_positions(products_index),
+                limit_power=False,
+                fill_to_end=True,
+            )
 
-            # discharging
-            if current_power > 0:
-                max_soc_discharge = self.calculate_soc_max_discharge(soc)
+        self.bidding_strategies[marketconfig.market_id].calculate_reward(
+            unit=self,
+            marketconfig=marketconfig,
+            orderbook=orderbook,
+        )
 
-                if current_power > max_soc_discharge:
-                    self.outputs[product_type][start] = max_soc_discharge
+    def apply_soc_constraints(
+        self,
+        dispatch: np.ndarray,
+        positions: np.ndarray,
+        limit_power: bool,
+        fill_to_end: bool,
+    ) -> None:
+        """
+        Corrects the dispatch at the given positions according to the state of charge and updates the state of charge.
+
+        The dispatch kernel inlines :meth:`calculate_soc_max_discharge` and :meth:`calculate_soc_max_charge`,
+        so if a subclass overrides one of them, the dispatch is corrected by calling the methods for each timestep instead.
+
+        Args:
+            dispatch (numpy.ndarray): The dispatch which is corrected in place.
+            positions (numpy.ndarray): The ascending positions of the timesteps to correct.
+            limit_power (bool): Whether the dispatch is limited to the charging and discharging power first.
+            fill_to_end (bool): Whether the last state of charge is written to the end of the index.
+        """
+        if (
+            type(self).calculate_soc_max_discharge
+            is not Storage.calculate_soc_max_discharge
+            or type(self).calculate_soc_max_charge
+            is not Storage.calculate_soc_max_charge
+        ):
+            self._apply_soc_constraints_per_step(
+                dispatch, positions, limit_power, fill_to_end
+            )
+            return
+
+        apply_soc_constraints(
+            dispatch,
+            self.outputs.get_array("energy"),
+            self.outputs.get_array("soc"),
+            positions,
+            self.index.freq / timedelta(hours=1),
+            float(self.max_volume),
+            float(self.min_volume),
+            float(self.efficiency_charge),
+            float(self.efficiency_discharge),
+            float(self.min_power_charge),
+            float(self.max_power_charge),
+            float(self.min_power_discharge),
+            float(self.max_power_discharge),
+            limit_power,
+            fill_to_end,
+        )
 
-                time_delta = self.index.freq / timedelta(hours=1)
+    def _apply_soc_constraints_per_step(
+        self,
+        dispatch: np.ndarray,
+        positions: np.ndarray,
+        limit_power: bool,
+        fill_to_end: bool,
+    ) -> None:
+        energy = self.outputs.get_array("energy")
+        socs = self.outputs.get_array("soc")
+        duration = self.index.freq / timedelta(hours=1)
+        for i, pos in enumerate(positions):
+            soc = socs[pos]
+            power = dispatch[pos]
+            if limit_power:
+                if power > self.max_power_discharge:
+                    power = self.max_power_discharge
+                elif power < self.max_power_charge:
+                    power = self.max_power_charge
+                elif self.min_power_charge < power < self.min_power_discharge:
+                    power = 0.0
+                dispatch[pos] = power
+
+            delta_soc = 0.0
+            # discharging
+            if power > 0:
+                dispatch[pos] = min(power, self.calculate_soc_max_discharge(soc))
                 delta_soc = (
-                    -self.outputs["energy"][start]
-                    * time_delta
-                    / self.efficiency_discharge
-                    / self.max_volume
+                    -energy[pos] * duration / self.efficiency_discharge / self.max_volume
                 )
-
             # charging
-            elif current_power < 0:
-                max_soc_charge = self.calculate_soc_max_charge(soc)
-
-                if current_power < max_soc_charge:
-                    self.outputs[product_type][start] = max_soc_charge
-
-                time_delta = self.index.freq / timedelta(hours=1)
+            elif power < 0:
+                dispatch[pos] = max(power, self.calculate_soc_max_charge(soc))
                 delta_soc = (
-                    -self.outputs["energy"][start]
-                    * time_delta
-                    * self.efficiency_charge
-                    / self.max_volume
+                    -energy[pos] * duration * self.efficiency_charge / self.max_volume
                 )
 
-            self.outputs["soc"][start + self.index.freq :] = soc + delta_soc
-
-        self.bidding_strategies[marketconfig.market_id].calculate_reward(
-            unit=self,
-            marketconfig=marketconfig,
-            orderbook=orderbook,
-        )
+            # the state of charge is kept up to the next position, like in the dispatch kernel
+            if i + 1 < len(positions):
+                stop = positions[i + 1] + 1
+            elif fill_to_end:
+                stop = len(socs)
+            else:
+                stop = pos + 2
+            socs[pos + 1 : stop] = soc + delta_soc
 
     @lru_cache(maxsize=256)
     def calculate_marginal_cost(
@@ -23,6 +23,7 @@ from tqdm import tqdm
 
 from assume.common import (
     Forecaster,
+    KpiAccumulator,
     MarketConfig,
     OutputDef,
     UnitsOperator,
@@ -30,6 +31,7 @@ from assume.common import (
     mango_codec_factory,
 )
 from assume.common.base import LearningConfig
+from assume.common.time_index import TimeIndex
 from assume.common.utils import create_rrule, datetime2timestamp, timestamp2datetime
 from assume.markets import MarketRole, clearing_mechanisms
 from assume.strategies import LearningStrategy, bidding_strategies
@@ -56,11 +58,15 @@ class World:
         addr (Union[tuple[str, int], str]): The address of the world, represented as a tuple of string and int or a string.
         container (mango.Container, optional): The container for the world instance.
         distributed_role (bool, optional): A boolean indicating whether distributed roles are enabled.
+        codec (str): The name of the codec used for messages between containers.
         export_csv_path (str): The path for exporting CSV data.
+        export_parquet_path (str): The path for exporting Parquet data.
+        writer_queue_size (int): The number of save intervals queued for the output writer thread.
         db (sqlalchemy.engine.base.Engine, optional): The database connection.
         market_operators (dict[str, mango.RoleAgent]): The market operators for the world instance.
         markets (dict[str, MarketConfig]): The markets for the world instance.
         unit_operators (dict[str, UnitsOperator]): The unit operators for the world instance.
+        shared_forecasters (list[Forecaster]): The forecasters mapped by units operators in subprocesses.
         unit_types (dict[str, BaseUnit]): The unit types for the world instance.
         bidding_strategies (dict[str, type[BaseStrategy]]): The bidding strategies for the world instance.
         clearing_mechanisms (dict[str, MarketRole]): The clearing mechanisms for the world instance.
@@ -76,16 +82,22 @@ class World:
         output_agent_addr (tuple[str, str]): The address of the output agent.
         bidding_params (dict): Parameters for bidding.
         index (pandas.Series): The index for the simulation.
+        time_index (TimeIndex): Translates timestamps of the index into positions, shared by all units.
 
     Args:
         addr: The address of the world, represented as a tuple of string and int or a string.
         database_uri: The URI for the database connection.
         export_csv_path: The path for exporting CSV data.
+        export_parquet_path: The path for exporting Parquet data.
         log_level: The logging level for the world instance.
         distributed_role: A boolean indicating whether distributed roles are enabled.
             If True - this world is a manager world which schedules events itself.
             If False - this world is a client world which receives schedules from a manager through the DistributedClock mechanism.
             If None (default) - this world is not distributed and does not use subprocesses
+        codec: The codec used for messages between containers, "json" (default) or the binary "msgpack" codec.
+            All worlds of a distributed simulation need to use the same codec.
+        writer_queue_size: The number of save intervals which can be queued for the output writer thread
+            before the simulation waits for the writer. 0 writes the outputs directly in the event loop.
     """
 
     def __init__(
@@ -95,13 +107,19 @@ class World:
         export_csv_path: str = "",
         log_level: str = "INFO",
         distributed_role: bool | None = None,
+        codec: str = "json",
+        export_parquet_path: str = "",
+        writer_queue_size: int = 2,
     ) -> None:
         logging.getLogger("assume").setLevel(log_level)
         self.addr = addr
         self.container = None
         self.distributed_role = distributed_role
+        self.codec = codec
 
         self.export_csv_path = export_csv_path
+        self.export_parquet_path = export_parquet_path
+        self.writer_queue_size = writer_queue_size
         # intialize db connection at beginning of simulation
         if database_uri:
             if str(database_uri).startswith("sqlite:///"):
@@ -126,6 +144,8 @@ class World:
         self.market_operators: dict[str, RoleAgent] = {}
         self.markets: dict[str, MarketConfig] = {}
         self.unit_operators: dict[str, UnitsOperator] = {}
+        # forecasters whose data is shared with units operators in subprocesses
+        self.shared_forecasters: list[Forecaster] = []
         self.unit_types = unit_types
 
         self.bidding_strategies = bidding_strategies
@@ -136,7 +156,7 @@ class World:
             )
 
         self.clearing_mechanisms: dict[str, MarketRole] = clearing_mechanisms
-        self.additional_kpis: dict[str, OutputDef] = {}
+        self.additional_kpis: dict[str, OutputDef | KpiAccumulator] = {}
         self.addresses = []
         nest_asyncio.apply()
         self.loop = asyncio.get_event_loop()
@@ -186,6 +206,8 @@ class World:
 
         self.bidding_params = bidding_params
         self.index = index
+        # translates timestamps to positions, shared by all units of this world
+        self.time_index = TimeIndex(index)
 
         # kill old container if exists
         if isinstance(self.container, Container) and self.container.running:
@@ -207,7 +229,7 @@ class World:
 
         self.container = await create_container(
             connection_type=connection_type,
-            codec=mango_codec_factory(),
+            codec=mango_codec_factory(self.codec),
             addr=self.addr,
             clock=self.clock,
             **container_kwargs,
@@ -269,9 +291,10 @@ class World:
         """
 
         logger.debug(
-            "creating output agent db=%s export_csv_path=%s",
+            "creating output agent db=%s export_csv_path=%s export_parquet_path=%s",
             self.db,
             self.export_csv_path,
+            self.export_parquet_path,
         )
         self.output_role = WriteOutput(
             simulation_id=simulation_id,
@@ -279,6 +302,8 @@ class World:
             end=self.end,
             db_engine=self.db,
             export_csv_path=self.export_csv_path,
+            export_parquet_path=self.export_parquet_path,
+            writer_queue_size=self.writer_queue_size,
             save_frequency_hours=save_frequency_hours,
             learning_mode=self.learning_mode,
             perform_evaluation=self.perform_evaluation,
@@ -415,6 +440,13 @@ class World:
         clock_agent_name = f"clock_agent_{id}"
         self.addresses.append((self.addr, clock_agent_name))
 
+        # the subprocess maps the forecasts instead of receiving a copy of them
+        for unit in units:
+            forecaster = unit["forecaster"]
+            if all(forecaster is not shared for shared in self.shared_forecasters):
+                forecaster.share()
+                self.shared_forecasters.append(forecaster)
+
         async def creator(container):
             # creating a new role agent and apply the role of a units operator
             units_operator = UnitsOperator(
@@ -460,7 +492,7 @@ class World:
         return unit_class(
             id=id,
             unit_operator=unit_operator_id,
-            index=self.index,
+            index=self.time_index,
             forecaster=forecaster,
             **unit_params,
         )
@@ -647,25 +679,31 @@ class World:
         # agent is implicit added to self.container._agents
         pbar = tqdm(total=end_ts - start_ts)
 
-        # allow registration before first opening
-        self.clock.set_time(start_ts - 1)
-        if self.distributed_role is not False:
-            await self.clock_manager.broadcast(self.clock.time)
-        prev_delta = 0
-        while self.clock.time < end_ts:
-            await asyncio.sleep(0)
-            delta = await self._step()
-            if delta or prev_delta:
-                pbar.update(delta)
-                pbar.set_description(
-                    f"{self.output_role.simulation_id} {timestamp2datetime(self.clock.time)}",
-                    refresh=False,
-                )
-            else:
-                self.clock.set_time(end_ts)
-            prev_delta = delta
-        pbar.close()
-        await self.container.shutdown()
+        try:
+            # allow registration before first opening
+            self.clock.set_time(start_ts - 1)
+            if self.distributed_role is not False:
+                await self.clock_manager.broadcast(self.clock.time)
+            prev_delta = 0
+            while self.clock.time < end_ts:
+                await asyncio.sleep(0)
+                delta = await self._step()
+                if delta or prev_delta:
+                    pbar.update(delta)
+                    pbar.set_description(
+                        f"{self.output_role.simulation_id} {timestamp2datetime(self.clock.time)}",
+                        refresh=False,
+                    )
+                else:
+                    self.clock.set_time(end_ts)
+                prev_delta = delta
+            pbar.close()
+            await self.container.shutdown()
+        finally:
+            # the mapped forecasts are removed also if the simulation fails
+            for forecaster in self.shared_forecasters:
+                forecaster.release()
+            self.shared_forecasters = []
 
     def run(self):
         """
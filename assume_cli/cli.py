@@ -78,6 +78,13 @@ def create_parser() -> argparse.ArgumentParser:
         default="",
         type=str,
     ).completer = argcomplete.DirectoriesCompleter()
+    parser.add_argument(
+        "-parquet",
+        "--parquet-export-path",
+        help="optional path to the parquet export",
+        default="",
+        type=str,
+    ).completer = argcomplete.DirectoriesCompleter()
     parser.add_argument(
         "-db",
         "--db-uri",
@@ -92,6 +99,12 @@ def create_parser() -> argparse.ArgumentParser:
         default="examples/inputs",
         type=str,
     ).completer = argcomplete.DirectoriesCompleter()
+    parser.add_argument(
+        "--forecasts-cache-path",
+        help="optional path to a cache of the forecasts, which are reused while the inputs do not change - clear it after upgrading assume",
+        default="",
+        type=str,
+    ).completer = argcomplete.DirectoriesCompleter()
     parser.add_argument(
         "-l",
         "--loglevel",
@@ -108,6 +121,13 @@ def create_parser() -> argparse.ArgumentParser:
         help="run simulation with multiple processes",
         action="store_true",
     )
+    parser.add_argument(
+        "--migrate-db",
+        help="migrate the output tables of the database to the managed schema once and exit, partitioning requires PostgreSQL",
+        default="",
+        type=str,
+        choices=["indexed", "partitioned"],
+    )
     return parser
 
 
@@ -128,6 +148,17 @@ def cli(args=None):
     warnings.filterwarnings("ignore", "coroutine.*?was never awaited.*")
     logging.getLogger("asyncio").setLevel("FATAL")
 
+    if args.migrate_db:
+        from sqlalchemy import create_engine
+
+        from assume.common.output_writers import migrate_output_schema
+
+        mode = migrate_output_schema(
+            create_engine(db_uri), partitioned=args.migrate_db == "partitioned"
+        )
+        print(f"migrated output schema of {db_uri} to {mode} mode")
+        return
+
     try:
         # import package after argcomplete.autocomplete
         # to improve autocompletion speed
@@ -146,6 +177,7 @@ def cli(args=None):
         world = World(
             database_uri=db_uri,
             export_csv_path=args.csv_export_path,
+            export_parquet_path=args.parquet_export_path,
             log_level=args.loglevel,
             distributed_role=distributed_role,
             addr=addr,
@@ -155,6 +187,7 @@ def cli(args=None):
             inputs_path=args.input_path,
             scenario=args.scenario,
             study_case=args.case_study,
+            forecasts_cache_path=args.forecasts_cache_path,
         )
 
         if world.learning_config.get("learning_mode", False):
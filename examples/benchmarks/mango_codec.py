@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Compares the message size and the encoding and decoding time of the mango codecs.
+
+Run with: python examples/benchmarks/mango_codec.py
+"""
+
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from mango.messages.message import ACLMessage, Performatives
+
+from assume.common.mango_serializer import mango_codec_factory
+
+
+def clearing_message(n_orders: int) -> ACLMessage:
+    start = datetime(2019, 1, 1)
+    orders = [
+        {
+            "start_time": start,
+            "end_time": start + timedelta(hours=1),
+            "only_hours": None,
+            "price": 10.0 + i,
+            "volume": 100.0,
+            "accepted_price": 50.0,
+            "accepted_volume": 100.0 if i % 2 else 0.0,
+            "agent_id": (("0.0.0.0", 9098), f"agent_{i}"),
+            "unit_id": f"unit_{i}",
+            "bid_id": f"unit_{i}_1",
+        }
+        for i in range(n_orders)
+    ]
+    content = {
+        "context": "clearing",
+        "market_id": "EOM",
+        "accepted_orders": orders[1::2],
+        "rejected_orders": orders[::2],
+    }
+    return ACLMessage(
+        content=content,
+        performative=Performatives.inform,
+        sender_addr=("0.0.0.0", 9097),
+        receiver_addr=("0.0.0.0", 9098),
+        receiver_id="agent",
+    )
+
+
+def data_message(n_steps: int) -> ACLMessage:
+    index = pd.date_range("2019-01-01", periods=n_steps, freq="h")
+    rng = np.random.default_rng(0)
+    forecasts = pd.DataFrame(
+        rng.random((n_steps, 10)), index=index, columns=[f"col_{i}" for i in range(10)]
+    )
+    content = {
+        "context": "data_response",
+        "data": forecasts,
+        "dispatch": rng.random(n_steps),
+        "price": forecasts["col_0"],
+    }
+    return ACLMessage(content=content, performative=Performatives.inform)
+
+
+def benchmark(name: str, message: ACLMessage, repeat: int = 20):
+    print(name)
+    for codec_name in ["json", "msgpack"]:
+        codec = mango_codec_factory(codec_name)
+        encoded = codec.encode(message)
+        encode_time = min(
+            timeit.repeat(lambda: codec.encode(message), number=1, repeat=repeat)
+        )
+        decode_time = min(
+            timeit.repeat(lambda: codec.decode(encoded), number=1, repeat=repeat)
+        )
+        print(
+            f"  {codec_name:8} {len(encoded) / 1e3:10.1f} kB "
+            f"encode {encode_time * 1e3:8.2f} ms decode {decode_time * 1e3:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    benchmark("clearing message with 10000 orders", clearing_message(10_000))
+    benchmark("data response with a year of hourly data", data_message(8760))
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Compares the sequential clearing of the products of a market with the parallel clearing of ``parallel_products``.
+
+Run with: python examples/benchmarks/parallel_clearing.py
+"""
+
+import copy
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+from dateutil import rrule as rr
+from dateutil.relativedelta import relativedelta as rd
+
+from assume.common.market_objects import MarketConfig, MarketProduct
+from assume.common.utils import get_available_products
+from assume.markets.clearing_algorithms import clearing_mechanisms
+from assume.markets.order_book import OrderBook
+
+
+def create_config(n_products: int, parallel_products: int = 0) -> MarketConfig:
+    return MarketConfig(
+        market_id="EOM",
+        market_products=[MarketProduct(rd(hours=+1), n_products, rd(hours=1))],
+        opening_hours=rr.rrule(rr.DAILY, dtstart=datetime(2019, 1, 1)),
+        opening_duration=timedelta(hours=1),
+        param_dict={"parallel_products": parallel_products},
+    )
+
+
+def create_orderbook(products, n_orders: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    orderbook = []
+    for start, end, only_hours in products:
+        volumes = rng.integers(1, 100, n_orders).astype(float)
+        volumes[n_orders // 2 :] *= -1
+        prices = rng.integers(0, 100, n_orders).astype(float)
+        orderbook.extend(
+            {
+                "start_time": start,
+                "end_time": end,
+                "only_hours": only_hours,
+                "price": price,
+                "volume": volume,
+                "agent_id": ("0.0.0.0", f"agent_{i}"),
+                "bid_id": f"bid_{i}",
+            }
+            for i, (price, volume) in enumerate(zip(prices, volumes))
+        )
+    return orderbook
+
+
+def benchmark(
+    mechanism: str, n_products: int, n_orders: int, workers=(0, 2, 4, 8), repeat=3
+):
+    products = get_available_products(
+        create_config(n_products).market_products, datetime(2019, 1, 1)
+    )
+    orderbook = create_orderbook(products, n_orders)
+    print(f"{mechanism} with {n_products} products of {n_orders} orders")
+    for parallel_products in workers:
+        role = clearing_mechanisms[mechanism](
+            create_config(n_products, parallel_products)
+        )
+        clear = role.clear_parallel if parallel_products else role.clear
+        books = [OrderBook(copy.deepcopy(orderbook)) for _ in range(repeat)]
+        duration = min(
+            timeit.repeat(lambda: clear(books.pop(), products), number=1, repeat=repeat)
+        )
+        print(f"  parallel_products={parallel_products:<3} {duration * 1e3:8.1f} ms")
+        if role._executor is not None:
+            role._executor.shutdown()
+
+
+if __name__ == "__main__":
+    for mechanism in [
+        "pay_as_clear",
+        "pay_as_bid",
+        "pay_as_clear_vectorized",
+        "pay_as_bid_vectorized",
+    ]:
+        benchmark(mechanism, n_products=96, n_orders=2000)
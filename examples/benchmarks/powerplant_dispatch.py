@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Compares the execution of the dispatch of a power plant step by step with the dispatch kernel.
+
+Run with: python examples/benchmarks/powerplant_dispatch.py
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from assume.common.forecasts import NaiveForecast
+from assume.units import PowerPlant
+
+
+def create_power_plant(n_steps: int) -> PowerPlant:
+    index = pd.date_range("2019-01-01", periods=n_steps, freq="h")
+    rng = np.random.default_rng(0)
+    power_plant = PowerPlant(
+        id="power_plant",
+        unit_operator="operator",
+        technology="coal",
+        bidding_strategies={},
+        index=index,
+        max_power=700,
+        min_power=50,
+        efficiency=0.5,
+        fuel_type="lignite",
+        ramp_down=150,
+        ramp_up=200,
+        min_operating_time=4,
+        min_down_time=3,
+        forecaster=NaiveForecast(index, availability=1, fuel_price=10, co2_price=10),
+    )
+    power_plant.outputs["energy"].loc[index] = rng.choice(
+        [0, 0, 100, 400, 700], size=n_steps
+    )
+    return power_plant
+
+
+def execute_per_step(power_plant: PowerPlant, start, end):
+    # the dispatch loop before the kernel was introduced
+    max_power = (
+        power_plant.forecaster.get_availability(power_plant.id)[start:end]
+        * power_plant.max_power
+    )
+    energy = power_plant.outputs["energy"]
+    for t in power_plant.index[power_plant.time_index.get_slice(start, end)]:
+        previous_power = power_plant.get_output_before(t)
+        op_time = power_plant.get_operation_time(t)
+        current_power = power_plant.calculate_ramp(op_time, previous_power, energy[t])
+        if current_power > 0:
+            current_power = min(current_power, max_power[t])
+            current_power = max(current_power, power_plant.min_power)
+        energy[t] = current_power
+
+
+def benchmark(n_steps: int, repeat: int = 5):
+    print(f"dispatch of {n_steps} timesteps")
+    for name, execute in [
+        ("per step", execute_per_step),
+        ("kernel", PowerPlant.execute_current_dispatch),
+    ]:
+        times = []
+        for _ in range(repeat):
+            power_plant = create_power_plant(n_steps)
+            index = power_plant.index
+            times.append(
+                timeit.timeit(
+                    lambda: execute(power_plant, index[0], index[-1]), number=1
+                )
+            )
+        print(f"  {name:10} {min(times) * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(24)
+    benchmark(8760)
@@ -4,10 +4,11 @@
 
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from assume.common.base import BaseStrategy, BaseUnit
+from assume.common.base import BaseStrategy, BaseUnit, LearningStrategy
 from assume.common.forecasts import NaiveForecast
 from assume.common.market_objects import MarketConfig, Orderbook, Product
 
@@ -234,3 +235,20 @@ def test_clear_empty_bids(base_unit, mock_market_config):
         mock_market_config.market_id
     ].remove_empty_bids(mixed_bids)
     assert mixed_bids_result == [bid for bid in mixed_bids if bid["volume"] > 0]
+
+
+def test_store_actions(base_unit):
+    strategy = LearningStrategy(obs_dim=1, act_dim=2)
+    start = base_unit.index[1]
+    strategy.store_actions(
+        base_unit, start, np.array([0.5, 0.7]), np.array([0.1, -0.1])
+    )
+
+    assert base_unit.outputs["actions_1"].dtype == np.float64
+    assert base_unit.outputs["actions_1"].tolist() == [0, 0.7, 0, 0]
+    assert strategy.get_actions_output(base_unit, start) == {
+        "exploration_noise_0": 0.1,
+        "actions_0": 0.5,
+        "exploration_noise_1": -0.1,
+        "actions_1": 0.7,
+    }
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from assume.common.dispatch_timeline import DispatchTimeline
+
+
+def create_order(start, hours, volume, unit_id, market_id="EOM"):
+    return {
+        "start_time": start,
+        "end_time": start + timedelta(hours=hours),
+        "only_hours": None,
+        "volume": volume,
+        "accepted_volume": volume,
+        "unit_id": unit_id,
+        "market_id": market_id,
+    }
+
+
+def test_dispatch_timeline_step_function():
+    index = pd.date_range("2019-01-01", periods=24, freq="h")
+    timeline = DispatchTimeline(index)
+    timeline.add_orders(
+        [
+            create_order(index[1], 3, 10, "unit_1"),
+            create_order(index[3], 2, 7, "unit_1", market_id="CRM"),
+            create_order(index[0], 2, 20, "unit_2"),
+        ]
+    )
+    # orders of later clearings are added to the same rows
+    timeline.add_orders([create_order(index[2], 4, -5, "unit_1")])
+
+    assert timeline.get_dispatch(index[0], index[-1]) == [
+        [datetime(2019, 1, 1, 1), 10.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 2), 5.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 4), -5.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 6), 0.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 3), 7.0, "CRM", "unit_1"],
+        [datetime(2019, 1, 1, 5), 0.0, "CRM", "unit_1"],
+        [datetime(2019, 1, 1, 0), 20.0, "EOM", "unit_2"],
+        [datetime(2019, 1, 1, 2), 0.0, "EOM", "unit_2"],
+    ]
+    assert timeline.get_dispatch(index[2], index[5]) == [
+        [datetime(2019, 1, 1, 2), 5.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 4), -5.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 3), 7.0, "CRM", "unit_1"],
+        [datetime(2019, 1, 1, 2), 0.0, "EOM", "unit_2"],
+    ]
+
+
+def test_dispatch_timeline_blocks_and_bounds():
+    index = pd.date_range("2019-01-01", periods=24, freq="h")
+    timeline = DispatchTimeline(index)
+    block = create_order(index[2], 2, 0, "unit_1")
+    block["accepted_volume"] = {index[2]: 10, index[3]: 20}
+    # orders after the end of the simulation are ignored
+    late = create_order(datetime(2019, 2, 1), 1, 30, "unit_1")
+    timeline.add_orders([block, late])
+
+    assert timeline.get_dispatch(index[0], index[-1]) == [
+        [datetime(2019, 1, 1, 2), 10.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 3), 20.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 4), 0.0, "EOM", "unit_1"],
+    ]
+    # the end is excluded
+    assert timeline.get_dispatch(index[0], index[3]) == [
+        [datetime(2019, 1, 1, 2), 10.0, "EOM", "unit_1"]
+    ]
+
+
+def test_dispatch_timeline_discards_sent_window():
+    index = pd.date_range("2019-01-01", periods=24 * 30, freq="h")
+    timeline = DispatchTimeline(index)
+    last = index[0].to_pydatetime()
+    for now in index[6::6].to_pydatetime():
+        # orders are accepted for the upcoming timesteps, the second one overlaps the next period
+        timeline.add_orders(
+            [
+                create_order(now + timedelta(hours=2), 3, 10, "unit_1"),
+                create_order(now + timedelta(hours=4), 4, 5, "unit_1"),
+            ]
+        )
+
+        expected = []
+        if last > index[0]:
+            expected = [
+                [last + timedelta(hours=2), 10.0, "EOM", "unit_1"],
+                [last + timedelta(hours=4), 15.0, "EOM", "unit_1"],
+                [last + timedelta(hours=5), 5.0, "EOM", "unit_1"],
+            ]
+        assert timeline.get_dispatch(last, now) == expected
+        timeline.discard_before(now)
+        last = now
+
+    assert timeline.offset == len(index) - 6
+    # only the unsent timesteps are kept
+    assert timeline.volume.shape[1] < 64
+
+
+def test_dispatch_timeline_end_of_sent_order():
+    index = pd.date_range("2019-01-01", periods=24, freq="h")
+    timeline = DispatchTimeline(index)
+    timeline.add_orders(
+        [
+            create_order(index[0], 5, 10, "unit_1"),
+            create_order(index[2], 6, 20, "unit_1"),
+            create_order(index[1], 4, 30, "unit_2"),
+        ]
+    )
+    timeline.get_dispatch(index[0], index[5])
+    timeline.discard_before(index[5])
+
+    # the orders which end at the begin of the period are returned with the remaining volume
+    assert timeline.get_dispatch(index[5], index[10]) == [
+        [datetime(2019, 1, 1, 5), 20.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 8), 0.0, "EOM", "unit_1"],
+        [datetime(2019, 1, 1, 5), 0.0, "EOM", "unit_2"],
+    ]
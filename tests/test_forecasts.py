@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import gc
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from assume.common.forecasts import (
+    CsvForecaster,
+    NaiveForecast,
+    calculate_merit_order_price,
+)
+
+
+@pytest.fixture
+def index() -> pd.DatetimeIndex:
+    return pd.date_range("2022-01-01", periods=24, freq="h")
+
+
+def test_csv_forecaster_storage(index):
+    forecaster = CsvForecaster(index)
+    forecaster.set_forecast(
+        pd.DataFrame({"demand_1": np.arange(24.0), "demand_2": 5.0}, index=index)
+    )
+    forecaster.set_forecast(
+        pd.Series(np.arange(24.0), index=index, name="EOM"), "price_"
+    )
+    forecaster.set_forecast(pd.DataFrame({"co2": [20]}), prefix="fuel_price_")
+
+    assert list(forecaster.column_positions) == [
+        "demand_1",
+        "demand_2",
+        "price_EOM",
+        "fuel_price_co2",
+    ]
+    assert forecaster.data.shape == (4, 24)
+    assert (forecaster.get_array("demand_1", 2, 5) == [2, 3, 4]).all()
+    assert (forecaster.get_array("fuel_price_co2") == 20).all()
+    assert forecaster["price_EOM"].at[index[3]] == 3
+    # the series of a column is a read-only view on the data
+    series = forecaster["price_EOM"]
+    assert np.shares_memory(series.to_numpy(), forecaster.get_array("price_EOM"))
+    with pytest.raises(ValueError):
+        series.iloc[0] = 99
+    # replacing the values of the series does not change the forecast
+    series *= 2
+    assert forecaster["price_EOM"].iloc[1] == 1
+    forecaster.set_forecast(pd.Series(1.0, index=index, name="price_EOM"))
+    assert (forecaster["price_EOM"] == 1).all()
+
+    # existing columns are not overwritten by dataframes
+    forecaster.set_forecast(pd.DataFrame({"demand_1": 0.0}, index=index))
+    assert forecaster["demand_1"].iloc[-1] == 23
+
+    pd.testing.assert_series_equal(
+        forecaster.forecasts["demand_2"], pd.Series(5.0, index, name="demand_2")
+    )
+
+
+def test_csv_forecaster_defaults(index):
+    forecaster = CsvForecaster(index)
+    availability = forecaster.get_availability("unit_1")
+    assert (availability == 1).all()
+    assert (forecaster.get_price("lignite") == 0).all()
+    # missing columns share the same read-only values
+    assert np.shares_memory(
+        forecaster.get_array("availability_unit_2"),
+        forecaster.get_array("availability_unit_1"),
+    )
+    with pytest.raises(ValueError):
+        forecaster.get_array("fuel_price_lignite")[0] = 1
+
+    forecaster.set_forecast(pd.Series(0.5, index=index, name="availability_unit_1"))
+    assert (forecaster.get_availability("unit_1") == 0.5).all()
+    assert (forecaster.get_availability("unit_2") == 1).all()
+
+
+def test_naive_forecast(index):
+    forecaster = NaiveForecast(index, availability=1, fuel_price=list(range(24)))
+    assert (forecaster.get_availability("unit_1") == 1).all()
+    assert forecaster.get_price("lignite").iloc[5] == 5
+    assert (forecaster.get_price("co2") == 10).all()
+    assert (forecaster["price_EOM"] == 50).all()
+    assert (forecaster["temperature"] == 0).all()
+    assert (forecaster.get_array("demand_1", 0, 3) == 100).all()
+    with pytest.raises(ValueError):
+        forecaster["demand_1"].iloc[0] = 0.0
+    assert np.shares_memory(
+        forecaster.get_array("fuel_price_gas"),
+        forecaster.get_array("fuel_price_lignite"),
+    )
+
+
+def test_shared_forecaster(index):
+    forecaster = CsvForecaster(index)
+    forecaster.set_forecast(
+        pd.DataFrame({"demand_1": np.arange(24.0), "demand_2": 5.0}, index=index)
+    )
+    forecaster.share()
+    assert os.path.exists(forecaster._shared_path)
+
+    # only the path of the forecasts is pickled
+    copied = pickle.loads(pickle.dumps(forecaster))
+    assert (copied["demand_1"] == forecaster["demand_1"]).all()
+    with pytest.raises(ValueError):
+        copied.get_array("demand_2")[0] = 1
+    with pytest.raises(ValueError, match="mapped read-only"):
+        copied.set_column("demand_2", 1.0)
+
+    # changes are visible in the copies
+    forecaster.set_forecast(pd.Series(1.0, index=index, name="demand_2"))
+    assert (copied.get_array("demand_2") == 1).all()
+
+    # new columns are not shared
+    forecaster.set_forecast(pd.Series(2.0, index=index, name="price_EOM"))
+    assert not os.path.exists(copied._shared_path)
+    assert (forecaster.get_array("demand_1") == np.arange(24.0)).all()
+    assert (copied["price_EOM"] == 0).all()
+    copied.release()
+
+    # the file is removed when the forecaster is garbage collected
+    forecaster.share()
+    path = forecaster._shared_path
+    del forecaster
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_merit_order_price():
+    # the merit order of the plants changes in the second timestep
+    marginal_costs = np.array([[10.0, 20.0, 30.0], [25.0, 20.0, 30.0], [10, 20, 30]])
+    power = np.array([[100.0, 100.0, 100.0], [100.0, 100.0, 100.0], [0, 100, 100]])
+    demand = np.array([150.0, 50.0, 500.0])
+    prices = calculate_merit_order_price(marginal_costs, power, demand)
+    assert prices.tolist() == [20, 20, 0]
+
+
+def test_market_price_forecast_per_node(index):
+    powerplants_units = pd.DataFrame(
+        {
+            "technology": "coal",
+            "bidding_EOM": "naive_eom",
+            "fuel_type": ["lignite", "hard coal"],
+            "emission_factor": 0.0,
+            "max_power": 100.0,
+            "efficiency": 0.5,
+            "node": ["north", "south"],
+        },
+        index=["pp_1", "pp_2"],
+    )
+    demand_units = pd.DataFrame(
+        {"bidding_EOM": "naive_eom", "node": ["north", "south"]},
+        index=["demand_1", "demand_2"],
+    )
+    forecaster = CsvForecaster(index, powerplants_units, demand_units)
+    forecaster.set_forecast(
+        pd.DataFrame({"demand_1": 50.0, "demand_2": 80.0}, index=index)
+    )
+    forecaster.set_forecast(
+        pd.DataFrame({"lignite": [10], "hard coal": [20]}), prefix="fuel_price_"
+    )
+
+    assert (forecaster.calculate_market_price_forecast("EOM") == 40).all()
+    assert (forecaster.calculate_market_price_forecast("EOM", "north") == 20).all()
+    assert (forecaster.calculate_market_price_forecast("EOM", "south") == 40).all()
+    assert (forecaster.calculate_residual_load_forecast("EOM", "south") == 80).all()
+
+
+def test_frozen_forecaster(index):
+    forecaster = CsvForecaster(index)
+    forecaster.set_columns(["demand_1", "demand_2"], np.array([[1.0], [2.0]]))
+    forecaster.set_columns(["demand_2", "demand_3"], 3.0)
+    assert list(forecaster.column_positions) == ["demand_1", "demand_2", "demand_3"]
+    assert (forecaster.data[:, 0] == [1, 3, 3]).all()
+
+    forecaster.freeze()
+    # the matrix is trimmed to the stored columns
+    assert forecaster._data.shape == (3, 24)
+    with pytest.raises(ValueError):
+        forecaster.set_column("demand_1", 0.0)
+    with pytest.raises(ValueError):
+        forecaster["demand_1"].iloc[0] = 0.0
+
+    # the copies of a frozen forecaster are read-only as well
+    copied = pickle.loads(pickle.dumps(forecaster))
+    with pytest.raises(ValueError):
+        copied.get_array("demand_2")[0] = 0.0
+    forecaster.share()
+    assert not forecaster.data.flags.writeable
+    forecaster.release()
+    assert not forecaster.data.flags.writeable
@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import pytest
+from sqlalchemy import create_engine
 
+from assume.common.output_writers import get_schema_mode
 from assume_cli.cli import cli
 
 
@@ -24,3 +26,9 @@ def test_cli_network():
 def test_cli_learning():
     args = "-s example_02a -c tiny -db sqlite:///./examples/local_db/test_mini_rl.db"
     cli(args.split(" "))
+
+
+def test_cli_migrate_db(tmp_path):
+    db_uri = f"sqlite:///{tmp_path}/test_migrate.db"
+    cli(["--migrate-db", "indexed", "-db", db_uri])
+    assert get_schema_mode(create_engine(db_uri)) == "indexed"
@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from assume.scenario import loader_csv
+from assume.scenario.loader_csv import load_config_and_create_forecaster
+
+
+def test_forecasts_cache(tmp_path, monkeypatch):
+    inputs_path = tmp_path / "inputs"
+    cache_path = tmp_path / "cache"
+    shutil.copytree("examples/inputs/example_01a", inputs_path / "example_01a")
+
+    data = load_config_and_create_forecaster(
+        inputs_path, "example_01a", "tiny", cache_path
+    )
+    assert len(list(cache_path.glob("*.npy"))) == 1
+
+    cached = load_config_and_create_forecaster(
+        inputs_path, "example_01a", "tiny", cache_path
+    )
+    assert isinstance(cached["forecaster"].data, np.memmap)
+    pd.testing.assert_frame_equal(
+        cached["forecaster"].forecasts, data["forecaster"].forecasts
+    )
+
+    # changed input files are not read from the cache
+    demand_file = inputs_path / "example_01a" / "demand_df.csv"
+    stat = demand_file.stat()
+    os.utime(demand_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    changed = load_config_and_create_forecaster(
+        inputs_path, "example_01a", "tiny", cache_path
+    )
+    assert not isinstance(changed["forecaster"].data, np.memmap)
+    assert len(list(cache_path.glob("*.npy"))) == 2
+
+    # forecasts of another version of the forecast code are not read from the cache
+    monkeypatch.setattr(
+        loader_csv, "FORECASTS_VERSION", loader_csv.FORECASTS_VERSION + 1
+    )
+    upgraded = load_config_and_create_forecaster(
+        inputs_path, "example_01a", "tiny", cache_path
+    )
+    assert not isinstance(upgraded["forecaster"].data, np.memmap)
+    assert len(list(cache_path.glob("*.npy"))) == 3
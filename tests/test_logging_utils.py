@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import logging
+
+from assume.common.logging_utils import WarningSummary
+
+logger = logging.getLogger(__name__)
+
+
+def test_warning_summary(caplog):
+    summary = WarningSummary(logger, max_agents=2)
+    with caplog.at_level(logging.WARNING):
+        for agent in ["a", "b", "c"]:
+            summary.add(agent, "too high", 2)
+        summary.add("a", "too high")
+        summary.add("a", "too low", 0)
+        summary.flush("market %s", "EOM")
+
+    assert len(caplog.records) == 1
+    assert (
+        caplog.records[0].getMessage()
+        == "market EOM - too high: 7 times by 3 agents (a: 3, b: 2, ... (1 more agents))"
+    )
+
+    # nothing is counted if the level is disabled
+    with caplog.at_level(logging.ERROR):
+        summary.add("a", "too high")
+        assert summary.counts == {}
+        summary.flush()
+    assert len(caplog.records) == 1
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from mango.messages.message import ACLMessage, Performatives
+
+from assume.common.mango_serializer import mango_codec_factory
+
+pytest.importorskip("msgpack")
+
+
+@pytest.fixture
+def codec():
+    return mango_codec_factory("msgpack")
+
+
+def test_msgpack_orders(codec):
+    start = datetime(2019, 1, 1, 0, 0, 0, 500)
+    block_order = {
+        "start_time": start,
+        "end_time": start + timedelta(hours=2),
+        "only_hours": None,
+        "price": np.float64(20.5),
+        "volume": {start: 10, start + timedelta(hours=1): np.int64(20)},
+        "agent_id": (("0.0.0.0", 9098), "agent"),
+    }
+    content = {
+        "context": "clearing",
+        "accepted_orders": [block_order],
+        "duration": timedelta(hours=1),
+    }
+    message = ACLMessage(
+        content=content,
+        performative=Performatives.inform,
+        receiver_addr=("0.0.0.0", 9098),
+    )
+
+    decoded = codec.decode(codec.encode(message))
+    assert isinstance(decoded, ACLMessage)
+    assert decoded.performative == Performatives.inform
+    assert decoded.receiver_addr == ("0.0.0.0", 9098)
+    assert decoded.content == content
+    order = decoded.content["accepted_orders"][0]
+    assert order["start_time"] == start
+    assert isinstance(order["agent_id"], tuple)
+
+
+def test_msgpack_arrays_and_timestamps(codec):
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    decoded = codec.decode(codec.encode(array))
+    assert decoded.dtype == array.dtype
+    assert (decoded == array).all()
+
+    objects = [
+        datetime(2019, 1, 1, tzinfo=timezone(timedelta(hours=2))),
+        pd.Timestamp("2019-01-01 00:00:00.000000001"),
+        pd.Timestamp("2019-06-01", tz="Europe/Berlin"),
+        {1, 2},
+    ]
+    for obj in objects:
+        assert codec.decode(codec.encode(obj)) == obj
+
+
+def test_msgpack_pandas(codec):
+    pytest.importorskip("pyarrow")
+    index = pd.date_range("2019-01-01", periods=24, freq="h")
+    df = pd.DataFrame({"a": np.arange(24.0), "b": ["x"] * 24}, index=index)
+    pd.testing.assert_frame_equal(codec.decode(codec.encode(df)), df)
+
+    series = pd.Series(np.arange(24.0), index=index, name="price")
+    pd.testing.assert_series_equal(codec.decode(codec.encode(series)), series)
+
+    # column names which are not supported by arrow are pickled
+    df = pd.DataFrame({0: [1, 2]})
+    pd.testing.assert_frame_equal(codec.decode(codec.encode(df)), df)
+
+    # objects of mixed types and dicts, which are not supported by arrow or changed by it, are pickled
+    df = pd.DataFrame({"a": [1, "x"]})
+    pd.testing.assert_frame_equal(codec.decode(codec.encode(df)), df)
+    series = pd.Series([{"a": 1}, {"b": 2}], name="orders")
+    decoded = codec.decode(codec.encode(series))
+    assert decoded.tolist() == [{"a": 1}, {"b": 2}]
+    pd.testing.assert_series_equal(decoded, series)
+    df = pd.DataFrame({"a": [1.0, 2.0]}, index=pd.Index([1, "x"], dtype=object))
+    pd.testing.assert_frame_equal(codec.decode(codec.encode(df)), df)
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        mango_codec_factory("xml")
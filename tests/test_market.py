@@ -171,6 +171,94 @@ async def test_market_max(market_role: MarketRole):
     assert market_role.all_orders[3]["volume"] == 9090
 
 
+async def test_market_validation_summary(market_role: MarketRole, caplog):
+    meta = {
+        "sender_addr": market_role.context.addr,
+        "sender_id": market_role.context.aid,
+    }
+    market_role.marketconfig.maximum_bid_price = 1000
+    market_role.marketconfig.minimum_bid_price = -500
+    market_role.marketconfig.maximum_bid_volume = 9090
+    market_role.open_auctions |= {(start, end, None)}
+
+    orderbook = [
+        {
+            "start_time": start,
+            "end_time": end,
+            "volume": volume,
+            "price": price,
+            "agent_id": "gen1",
+            "only_hours": None,
+        }
+        for volume, price in [(9091, 1001), (-9091, -501), (10, 1001), (10, 20)]
+    ]
+    # this product is not part of an open auction, so its volume is kept
+    orderbook.append({**orderbook[0], "end_time": start, "volume": 9091})
+
+    with caplog.at_level("WARNING"):
+        market_role.handle_orderbook(content={"orderbook": orderbook}, meta=meta)
+        # warnings are only counted until the clearing
+        assert caplog.records == []
+        market_role.warning_summary.flush("market %s", "Test")
+
+    assert [order["price"] for order in market_role.all_orders] == [
+        1000,
+        -500,
+        1000,
+        20,
+        1000,
+    ]
+    assert [order["volume"] for order in market_role.all_orders] == [
+        9090,
+        -9090,
+        10,
+        10,
+        9091,
+    ]
+    # one summary per reason
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 4
+    assert "price above maximum_bid_price: 3 times by 1 agents" in messages[0]
+    assert "price below minimum_bid_price: 1 times" in messages[1]
+    assert "product not part of an open auction: 1 times" in messages[2]
+    assert "volume above maximum_bid_volume: 2 times" in messages[3]
+    assert market_role.warning_summary.counts == {}
+
+
+async def test_market_validation_summary_failed_clearing(
+    market_role: MarketRole, caplog
+):
+    meta = {
+        "sender_addr": market_role.context.addr,
+        "sender_id": market_role.context.aid,
+    }
+    market_role.marketconfig.maximum_bid_price = 1000
+    product = (start, start + rd(hours=1), None)
+    market_role.open_auctions |= {product}
+    orderbook = [
+        {
+            "start_time": product[0],
+            "end_time": product[1],
+            "volume": 10,
+            "price": 1001,
+            "agent_id": "gen1",
+            "only_hours": None,
+        }
+    ]
+    market_role.handle_orderbook(content={"orderbook": orderbook}, meta=meta)
+
+    def fail(orderbook, market_products):
+        raise ValueError("clearing failed")
+
+    market_role.clear = fail
+    with caplog.at_level("WARNING"), pytest.raises(ValueError):
+        await market_role.clear_market([product])
+
+    # the warnings are reported with the failed clearing
+    assert "price above maximum_bid_price: 1 times" in caplog.records[-1].getMessage()
+    assert market_role.warning_summary.counts == {}
+
+
 async def test_market_for_BB(market_role: MarketRole):
     meta = {
         "sender_addr": market_role.context.addr,
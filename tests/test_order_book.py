@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime, timedelta
+
+from assume.markets.order_book import OrderBook, get_product_key, group_by_product
+
+start = datetime(2020, 1, 1)
+end = start + timedelta(hours=1)
+product = (start, end, None)
+
+
+def make_order(volume, price, start_time=start, end_time=end, agent_id="agent"):
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "volume": volume,
+        "price": price,
+        "agent_id": agent_id,
+        "only_hours": None,
+    }
+
+
+def test_order_book_buckets():
+    orders = [
+        make_order(10, 30),
+        make_order(-5, 100),
+        make_order(10, 10),
+        make_order(10, 20, start_time=end, end_time=end + timedelta(hours=1)),
+        make_order(-5, 200),
+        make_order(10, 10, agent_id="other"),
+    ]
+    orderbook = OrderBook(orders)
+
+    # it still behaves like the list of submitted orders
+    assert orderbook == orders
+    assert orderbook[3]["price"] == 20
+
+    assert orderbook.get_orders(product) == [o for i, o in enumerate(orders) if i != 3]
+    assert orderbook.get_orders((start, start, None)) == []
+    assert [o["price"] for o in orderbook.get_supply(product)] == [10, 10, 30]
+    # equal prices keep the order of submission
+    assert orderbook.get_supply(product)[1]["agent_id"] == "other"
+    assert [o["price"] for o in orderbook.get_supply(product, max_price=20)] == [10, 10]
+    assert [o["price"] for o in orderbook.get_demand(product)] == [200, 100]
+    assert [o["price"] for o in orderbook.get_demand(product, min_price=150)] == [200]
+    assert orderbook.best_prices(product) == (10, 200)
+
+    partitions = orderbook.partitions()
+    assert len(partitions) == 2
+    assert get_product_key(partitions[1][0]) == (end, end + timedelta(hours=1), None)
+
+
+def test_order_book_removal():
+    orders = [make_order(10, 30), make_order(10, 10), make_order(-5, 100)]
+    orderbook = OrderBook(orders)
+
+    orderbook.remove(orders[1])
+    assert orderbook.best_prices(product) == (30, 100)
+    orderbook.pop()
+    assert orderbook.get_demand(product) == []
+    del orderbook[0]
+    assert orderbook.products == {}
+
+    orderbook.append(orders[0])
+    orderbook.clear()
+    assert orderbook == []
+    assert orderbook.best_prices(product) == (None, None)
+
+
+def test_order_book_sorts_lazily():
+    orderbook = OrderBook([make_order(10, 30), make_order(10, 20)])
+    supply = orderbook.products[product].supply
+    assert not supply._sorted
+    assert [o["price"] for o in orderbook.get_supply(product)] == [20, 30]
+    assert supply._sorted
+
+    # orders which keep the side sorted do not trigger another sort
+    orderbook.append(make_order(10, 40))
+    assert supply._sorted
+    orderbook.extend([make_order(10, 10), make_order(-5, 50)])
+    assert not supply._sorted
+    orderbook.remove(orderbook[0])
+    assert [o["price"] for o in orderbook.get_supply(product)] == [10, 20, 40]
+
+
+def test_group_by_product():
+    later = (end, end + timedelta(hours=1), None)
+    orders = [
+        make_order(10, 30, *later[:2]),
+        make_order(10, 20),
+        make_order(-5, 100, *later[:2]),
+    ]
+    expected = [(product, [orders[1]]), (later, [orders[0], orders[2]])]
+    assert group_by_product(OrderBook(orders)) == expected
+    assert group_by_product(list(orders)) == expected
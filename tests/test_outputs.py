@@ -2,13 +2,34 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import asyncio
 import os
+import threading
 from datetime import datetime
+from unittest.mock import MagicMock
 
 import pandas as pd
-from sqlalchemy import create_engine
+import pytest
+from mango import RoleAgent, create_container
+from mango.util.clock import ExternalClock
+from mango.util.termination_detection import tasks_complete_or_sleeping
+from sqlalchemy import create_engine, inspect
 
+from assume.common.kpis import KpiAccumulator
+from assume.common.output_writers import (
+    ColumnBuffer,
+    ParquetTableWriter,
+    PostgresCopyWriter,
+    create_index_statement,
+    create_partition_statement,
+    get_schema_mode,
+    get_sql_type,
+    is_managed_table,
+    migrate_output_schema,
+    partition_name,
+)
 from assume.common.outputs import WriteOutput
+from assume.common.utils import datetime2timestamp
 
 os.makedirs("./examples/local_db", exist_ok=True)
 DB_URI = "sqlite:///./examples/local_db/test_outputs.db"
@@ -28,7 +49,7 @@ def test_output_market_orders():
         "data": [],
     }
     output_writer.handle_message(content, meta)
-    assert len(output_writer.write_dfs["market_orders"]) == 0
+    assert len(output_writer.write_buffers["market_orders"]) == 0
 
     orderbook = [
         {
@@ -72,7 +93,12 @@ def test_output_market_orders():
         "data": orderbook,
     }
     output_writer.handle_message(content, meta)
-    assert len(output_writer.write_dfs["market_orders"]) == 1
+    assert len(output_writer.write_buffers["market_orders"]) == 4
+    df = output_writer.write_buffers["market_orders"].to_frame()
+    assert df.index.name == "start_time"
+    assert "agent_id" not in df.columns
+    assert df["node"].isna().all()
+    assert (df["simulation"] == "test_sim").all()
 
 
 def test_output_market_results():
@@ -105,7 +131,7 @@ def test_output_market_results():
         ],
     }
     output_writer.handle_message(content, meta)
-    assert len(output_writer.write_dfs["market_meta"]) == 1, "market_meta"
+    assert len(output_writer.write_buffers["market_meta"]) == 1, "market_meta"
 
 
 def test_output_market_dispatch():
@@ -118,7 +144,7 @@ def test_output_market_dispatch():
     content = {"context": "write_results", "type": "market_dispatch", "data": []}
     output_writer.handle_message(content, meta)
     # empty dfs are discarded
-    assert len(output_writer.write_dfs["market_dispatch"]) == 0, "market_dispatch"
+    assert len(output_writer.write_buffers["market_dispatch"]) == 0, "market_dispatch"
 
     content = {
         "context": "write_results",
@@ -126,7 +152,7 @@ def test_output_market_dispatch():
         "data": [[start, 90, "EOM", "TestUnit"]],
     }
     output_writer.handle_message(content, meta)
-    assert len(output_writer.write_dfs["market_dispatch"]) == 1, "market_dispatch"
+    assert len(output_writer.write_buffers["market_dispatch"]) == 1, "market_dispatch"
 
 
 def test_output_unit_dispatch():
@@ -154,3 +180,471 @@ def test_output_unit_dispatch():
     }
     output_writer.handle_message(content, meta)
     assert len(output_writer.write_dfs["unit_dispatch"]) == 1, "unit_dispatch"
+
+
+async def test_output_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    start = datetime(2020, 1, 1)
+    end = datetime(2020, 1, 2)
+    output_writer = WriteOutput("test_sim", start, end, export_parquet_path=tmp_path)
+    meta = {"sender_id": None}
+    dispatch = {"context": "write_results", "type": "market_dispatch"}
+
+    output_writer.handle_message(
+        {
+            **dispatch,
+            "data": [[start, 90, "EOM", "Unit 1"], [end, 50, "EOM", "Unit 2"]],
+        },
+        meta,
+    )
+    await output_writer.store_dfs()
+    assert len(output_writer.write_buffers["market_dispatch"]) == 0
+
+    output_writer.handle_message({**dispatch, "data": [[end, 10, "EOM", None]]}, meta)
+    orderbook = [
+        {
+            "start_time": start,
+            "end_time": end,
+            "volume": 120,
+            "price": 120,
+            "agent_id": "gen1",
+            "only_hours": None,
+        }
+    ]
+    output_writer.handle_message(
+        {"context": "write_results", "type": "store_order_book", "data": orderbook},
+        meta,
+    )
+    await output_writer.on_stop()
+
+    path = tmp_path / "test_sim"
+    # each save interval is written as a row group of the same file
+    metadata = pq.ParquetFile(path / "market_dispatch" / "part-00000.parquet").metadata
+    assert metadata.num_row_groups == 2
+    df = pd.read_parquet(path / "market_dispatch")
+    assert df["power"].tolist() == [90, 50, 10]
+    assert df["unit_id"].tolist()[:2] == ["Unit 1", "Unit 2"]
+    assert pd.isna(df["unit_id"].iloc[2])
+    assert (df["simulation"] == "test_sim").all()
+
+    df = pd.read_parquet(path / "market_orders")
+    assert df["start_time"].tolist() == [start]
+    assert df["price"].tolist() == [120]
+
+
+def test_parquet_table_writer_schema(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    index = pd.date_range("2020-01-01", periods=2, freq="h")
+    writer = ParquetTableWriter(tmp_path, "unit_dispatch")
+    writer.write(
+        pd.DataFrame(
+            {"power": [10, 20], "total_costs": [None, None], "unit": "Unit 1"},
+            index=index,
+        )
+    )
+    writer.write(
+        pd.DataFrame(
+            {
+                "power": [-5.0, 5.0],
+                "soc": [0.5, 0.25],
+                "total_costs": [1.5, 2.5],
+                "unit": "Storage 1",
+                "undeclared": 1,
+            },
+            index=index,
+        )
+    )
+    writer.close()
+
+    # the batches are cast to the declared schema of the table
+    schema = pq.read_schema(writer.path / "part-00000.parquet")
+    assert str(schema.field("total_costs").type) == "double"
+    assert str(schema.field("index").type) == "timestamp[ns]"
+    assert "undeclared" not in schema.names
+
+    # a column which is added later widens the schema in a new file
+    assert sorted(path.name for path in writer.path.iterdir()) == [
+        "part-00000.parquet",
+        "part-00001.parquet",
+    ]
+    schema = pq.read_schema(writer.path / "part-00001.parquet")
+    assert str(schema.field("undeclared").type) == "int64"
+
+    df = pd.read_parquet(writer.path, schema=schema)
+    assert df["index"].tolist() == index.tolist() * 2
+    assert df["power"].tolist() == [10, 20, -5, 5]
+    assert df["soc"].tolist()[2:] == [0.5, 0.25]
+    assert df["soc"].isna().tolist()[:2] == [True, True]
+    assert df["total_costs"].tolist()[2:] == [1.5, 2.5]
+    assert df["undeclared"].tolist()[2:] == [1, 1]
+    assert df["undeclared"].isna().tolist()[:2] == [True, True]
+
+
+def test_parquet_table_writer_column_families(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    index = pd.date_range("2020-01-01", periods=2, freq="h")
+    writer = ParquetTableWriter(tmp_path, "unit_dispatch")
+    writer.write(
+        pd.DataFrame(
+            {
+                "power": [10.0, 20.0],
+                "energy_marginal_costs": [None, 25.0],
+                "heat_cashflow": [None, None],
+                "unit": "Unit 1",
+            },
+            index=index,
+        )
+    )
+    writer.close()
+    rl_writer = ParquetTableWriter(tmp_path, "rl_params")
+    rl_writer.write(
+        pd.DataFrame(
+            {
+                "datetime": index,
+                "unit": "Unit 1",
+                "actions_0": [0.5, None],
+                "actions_1": [-0.5, 1.0],
+                "exploration_noise_0": [None, None],
+            }
+        )
+    )
+    rl_writer.close()
+
+    # the columns of the first batch are stored in one file, with the types of their families
+    schema = pq.read_schema(writer.path / "part-00000.parquet")
+    assert str(schema.field("heat_cashflow").type) == "double"
+    df = pd.read_parquet(writer.path)
+    assert df["power"].tolist() == [10, 20]
+    assert pd.isna(df["energy_marginal_costs"].iloc[0])
+    assert df["energy_marginal_costs"].iloc[1] == 25
+
+    df = pd.read_parquet(rl_writer.path)
+    assert df["actions_0"].tolist()[:1] == [0.5]
+    assert pd.isna(df["actions_0"].iloc[1])
+    assert df["actions_1"].tolist() == [-0.5, 1.0]
+    assert df["exploration_noise_0"].dtype == float
+
+
+def test_postgres_copy_writer():
+    engine = MagicMock()
+    db = engine.begin.return_value.__enter__.return_value
+    db.execute.return_value.fetchall.return_value = [
+        (column,) for column in ["datetime", "power", "market_id", "unit_id", "index"]
+    ]
+    cursor = engine.raw_connection.return_value.cursor.return_value.__enter__
+    copied = []
+    cursor.return_value.copy_expert.side_effect = lambda sql, buffer: copied.append(
+        (sql, buffer.read())
+    )
+
+    writer = PostgresCopyWriter(engine)
+    df = pd.DataFrame(
+        {
+            "datetime": [datetime(2020, 1, 1)],
+            "power": [90.5],
+            "market_id": ["EOM"],
+            "unit_id": ["Unit 1"],
+            "simulation": ["test_sim"],
+        }
+    )
+    writer.write("market_dispatch", df)
+
+    # the missing column is added before copying
+    statements = [str(call.args[0]) for call in db.execute.call_args_list]
+    assert (
+        'ALTER TABLE "market_dispatch" ADD COLUMN IF NOT EXISTS "simulation" text'
+        in statements
+    )
+    sql, data = copied[0]
+    assert sql == (
+        'COPY "market_dispatch" ("index", "datetime", "power", "market_id", "unit_id", "simulation") '
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    assert data == "0,2020-01-01,90.5,EOM,Unit 1,test_sim\n"
+    engine.raw_connection.return_value.commit.assert_called_once()
+
+    # the columns are only read once per table
+    writer.write("market_dispatch", df)
+    assert engine.begin.call_count == 2
+
+
+def test_sql_types():
+    assert get_sql_type(pd.Series([1.0])) == "double precision"
+    assert get_sql_type(pd.Series([1])) == "bigint"
+    assert get_sql_type(pd.Series([True])) == "boolean"
+    assert get_sql_type(pd.Series([datetime(2020, 1, 1)])) == "timestamp"
+    assert get_sql_type(pd.Series([None, "a"])) == "text"
+    assert create_index_statement("market_meta", ("simulation", "time")) == (
+        'CREATE INDEX IF NOT EXISTS "market_meta_simulation_time_idx" '
+        'ON "market_meta" ("simulation", "time")'
+    )
+
+
+async def test_output_writer_thread(tmp_path):
+    start = datetime(2020, 1, 1)
+    end = datetime(2020, 1, 2)
+    output_writer = WriteOutput(
+        "test_sim", start, end, export_csv_path=tmp_path, writer_queue_size=1
+    )
+    meta = {"sender_id": None}
+    for hour in range(3):
+        output_writer.handle_message(
+            {
+                "context": "write_results",
+                "type": "market_dispatch",
+                "data": [[start + pd.Timedelta(hours=hour), 90, "EOM", "Unit 1"]],
+            },
+            meta,
+        )
+        await output_writer.store_dfs()
+        assert len(output_writer.write_buffers["market_dispatch"]) == 0
+    assert output_writer.writer_thread.is_alive()
+
+    # the queue is drained before the writer is stopped
+    await output_writer.drain_writer()
+    assert output_writer.writer_thread is None
+    df = pd.read_csv(tmp_path / "test_sim" / "market_dispatch.csv")
+    assert len(df) == 3
+
+
+async def test_output_writer_queue_full(tmp_path):
+    start = datetime(2020, 1, 1)
+    output_writer = WriteOutput(
+        "test_sim", start, start, export_csv_path=tmp_path, writer_queue_size=1
+    )
+    output_writer.writer_queue.put({})
+    store = asyncio.create_task(output_writer.put_writer_queue({"table": []}))
+
+    # the event loop keeps running while the queue is full
+    ticks = 0
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+        ticks += 1
+    assert ticks == 5
+    assert not store.done()
+
+    assert output_writer.writer_queue.get() == {}
+    await store
+    assert output_writer.writer_queue.get() == {"table": []}
+
+
+async def test_output_writer_slows_down_simulation(tmp_path):
+    start = datetime(2020, 1, 1)
+    end = datetime(2020, 1, 2)
+    clock = ExternalClock(0)
+    container = await create_container(addr=("0.0.0.0", 9112), clock=clock)
+    agent = RoleAgent(container, "export_agent")
+    output_writer = WriteOutput(
+        "test_sim",
+        start,
+        end,
+        export_csv_path=tmp_path,
+        save_frequency_hours=1,
+        writer_queue_size=1,
+    )
+    agent.add_role(output_writer)
+
+    # the writer is blocked until the event is set
+    writing = threading.Event()
+    release = threading.Event()
+    written = []
+
+    def write_batches(batches):
+        writing.set()
+        release.wait()
+        written.append(batches)
+
+    output_writer.write_batches = write_batches
+
+    async def step(hour):
+        time = start + pd.Timedelta(hours=hour)
+        output_writer.handle_message(
+            {
+                "context": "write_results",
+                "type": "market_dispatch",
+                "data": [[time, 90, "EOM", "Unit 1"]],
+            },
+            {"sender_id": None},
+        )
+        clock.set_time(datetime2timestamp(time))
+        await tasks_complete_or_sleeping(container)
+
+    # the first batch is taken by the writer, the second one fills the queue
+    await step(0)
+    await step(1)
+    assert await asyncio.to_thread(writing.wait, 1)
+    await step(2)
+    assert output_writer.writer_queue.full()
+    # the third batch waits for a free queue slot and so does the simulation
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(step(3), timeout=0.2)
+    assert len(output_writer.write_buffers["market_dispatch"]) == 0
+
+    release.set()
+    await tasks_complete_or_sleeping(container)
+    await output_writer.drain_writer()
+    assert len(written) == 3
+    await container.shutdown()
+
+
+async def test_output_writer_error(tmp_path):
+    start = datetime(2020, 1, 1)
+    output_writer = WriteOutput(
+        "test_sim", start, start, export_csv_path=tmp_path, writer_queue_size=1
+    )
+
+    def write_batches(batches):
+        raise OSError("disk full")
+
+    output_writer.write_batches = write_batches
+    data = [[start, 90, "EOM", "Unit 1"]]
+    output_writer.write_market_dispatch(data)
+    await output_writer.store_dfs()
+    await asyncio.to_thread(output_writer.writer_queue.join)
+
+    # the error of the writer thread is raised with the next batch
+    output_writer.write_market_dispatch(data)
+    with pytest.raises(RuntimeError) as error:
+        await output_writer.store_dfs()
+    assert isinstance(error.value.__cause__, OSError)
+    await output_writer.drain_writer()
+    assert output_writer.writer_thread is None
+
+
+def test_column_buffer():
+    buffer = ColumnBuffer(["a", "b"], index="a", skip=("c",))
+    buffer.extend([{"a": 1, "b": 2.0, "c": 0}, {"a": 2}], simulation="sim")
+    buffer.extend_rows([(3, "x")], ["a", "d"])
+    assert len(buffer) == 3
+
+    taken = buffer.take()
+    assert len(buffer) == 0
+    assert list(buffer.columns) == ["a", "b", "simulation", "d"]
+    df = taken.to_frame()
+    assert df.index.tolist() == [1, 2, 3]
+    assert df["b"].tolist()[0] == 2.0
+    assert df["b"].isna().tolist() == [False, True, True]
+    # missing strings are None or NaN depending on the pandas string dtype
+    assert df["simulation"].isna().tolist() == [False, False, True]
+    assert df["simulation"].iloc[0] == "sim"
+    assert df["d"].isna().tolist() == [True, True, False]
+    assert df["d"].iloc[2] == "x"
+
+
+def test_column_buffer_default_index():
+    buffer = ColumnBuffer(["a"], index="index")
+    buffer.append({"a": 1}, index="unit_1")
+    df = buffer.to_frame()
+    assert df.index.tolist() == ["unit_1"]
+    # written like an unnamed index of a data frame
+    assert df.index.name is None
+
+
+def test_kpi_accumulator():
+    avg_price = KpiAccumulator("market_meta", "price", "avg")
+    max_price = KpiAccumulator("market_meta", "price", "max")
+    for prices in [[10, 20, None], [30, 40, 50]]:
+        df = pd.DataFrame({"price": prices, "market_id": ["EOM", "EOM", "CRM"]})
+        avg_price.update(df)
+        max_price.update(df)
+    assert avg_price.result() == {"EOM": 25, "CRM": 50}
+    assert max_price.result() == {"EOM": 40, "CRM": 50}
+
+    with pytest.raises(ValueError):
+        KpiAccumulator("market_meta", "price", "median")
+
+
+async def test_output_kpis_without_db(tmp_path):
+    start = datetime(2020, 1, 1)
+    end = datetime(2020, 1, 2)
+    output_writer = WriteOutput(
+        "test_sim",
+        start,
+        end,
+        export_csv_path=tmp_path,
+        additional_kpis={
+            "max_price": KpiAccumulator("market_meta", "price", "max"),
+        },
+    )
+    meta = {"sender_id": None}
+    output_writer.handle_message(
+        {
+            "context": "write_results",
+            "type": "store_units",
+            "data": {
+                "unit_type": "power_plant",
+                "id": "Unit 1",
+                "max_power": 100,
+                "technology": "nuclear",
+            },
+        },
+        meta,
+    )
+    market_meta = [
+        {"price": price, "demand_volume_energy": 50, "market_id": "EOM"}
+        for price in [10, 30]
+    ]
+    output_writer.handle_message(
+        {
+            "context": "write_results",
+            "type": "store_market_results",
+            "data": market_meta,
+        },
+        meta,
+    )
+    output_writer.handle_message(
+        {
+            "context": "write_results",
+            "type": "market_dispatch",
+            "data": [[start, 50, "EOM", "Unit 1"], [start, -50, "EOM", "demand"]],
+        },
+        meta,
+    )
+    await output_writer.on_stop()
+
+    df = pd.read_csv(tmp_path / "test_sim" / "kpis.csv", index_col="variable")
+    assert df.loc["avg_price", "value"] == 20
+    assert df.loc["total_cost", "value"] == 2000
+    assert df.loc["total_volume", "value"] == 100
+    assert df.loc["capacity_factor", "value"] == 0.5
+    assert df.loc["max_price", "value"] == 30
+
+
+def test_managed_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/managed.db")
+    assert get_schema_mode(engine) is None
+    with pytest.raises(ValueError):
+        migrate_output_schema(engine, partitioned=True)
+
+    assert migrate_output_schema(engine) == "indexed"
+    assert get_schema_mode(engine) == "indexed"
+    indexes = {
+        index["name"] for index in inspect(engine).get_indexes("market_dispatch")
+    }
+    assert "market_dispatch_simulation_unit_id_datetime_idx" in indexes
+
+    df = pd.DataFrame(
+        {"power": [1.0, 2.0], "unit_id": "Unit 1", "simulation": ["test_sim", "other"]}
+    )
+    with engine.begin() as db:
+        df.to_sql("market_dispatch", db, if_exists="append", index=False)
+
+    output_writer = WriteOutput(
+        "test_sim", datetime(2020, 1, 1), datetime(2020, 1, 2), engine
+    )
+    assert output_writer.schema_mode == "indexed"
+    df = pd.read_sql("select simulation from market_dispatch", engine)
+    assert df["simulation"].tolist() == ["other"]
+
+
+def test_partition_statements():
+    name = partition_name("market_meta", "example_01a_base")
+    assert len(name) == len("market_meta") + 17
+    assert is_managed_table(name)
+    assert is_managed_table("market_meta_default")
+    assert not is_managed_table("power_plant_meta")
+    partition = partition_name("market_meta", "it's")
+    assert create_partition_statement("market_meta", "it's") == (
+        f'CREATE TABLE IF NOT EXISTS "{partition}" '
+        "PARTITION OF \"market_meta\" FOR VALUES IN ('it''s')"
+    )
@@ -4,12 +4,15 @@
 
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from assume.common.forecasts import NaiveForecast
+from assume.common.utils import get_products_index
 from assume.strategies.naive_strategies import NaiveSingleBidStrategy
 from assume.units import PowerPlant
+from tests.conftest import MockMarketConfig
 
 
 @pytest.fixture
@@ -474,6 +477,201 @@ def test_powerplant_execute_dispatch():
     )
 
 
+def test_powerplant_ramp_constraints_per_step():
+    # the dispatch kernel gives the same results as applying the constraints step by step
+    index = pd.date_range("2022-01-01", periods=200, freq="h")
+    rng = np.random.default_rng(1)
+    availability = rng.choice([0.3, 1, 1, 1], size=len(index))
+    ff = NaiveForecast(index, availability=availability, fuel_price=10, co2_price=10)
+    params = dict(
+        unit_operator="test_operator",
+        technology="coal",
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        index=index,
+        max_power=700,
+        min_power=50,
+        efficiency=0.5,
+        fuel_type="lignite",
+        ramp_down=150,
+        ramp_up=200,
+        min_operating_time=4,
+        min_down_time=3,
+        forecaster=ff,
+    )
+    power_plant = PowerPlant(id="test_pp", **params)
+    reference = PowerPlant(id="test_pp", **params)
+    dispatch = rng.choice([0, 0, 30.5, 100, 400, 700], size=len(index))
+    power_plant.outputs["energy"].loc[index] = dispatch
+    reference.outputs["energy"].loc[index] = dispatch
+
+    for start, end in [(0, 0), (1, 50), (40, 120), (121, 199)]:
+        power_plant.execute_current_dispatch(index[start], index[end])
+
+        max_power = ff.get_availability("test_pp") * reference.max_power
+        for t in index[start : end + 1]:
+            power = reference.outputs["energy"].at[t]
+            power = reference.calculate_ramp(
+                reference.get_operation_time(t), reference.get_output_before(t), power
+            )
+            if power > 0:
+                power = max(min(power, max_power[t]), reference.min_power)
+            reference.outputs["energy"].at[t] = power
+
+    np.testing.assert_array_equal(
+        power_plant.outputs["energy"].to_numpy(),
+        reference.outputs["energy"].to_numpy(),
+    )
+
+
+def test_powerplant_overridden_calculate_ramp():
+    class DelegatingPowerPlant(PowerPlant):
+        def calculate_ramp(self, op_time, previous_power, power, current_power=0):
+            return super().calculate_ramp(
+                op_time, previous_power, power, current_power
+            )
+
+    class LimitedPowerPlant(PowerPlant):
+        def calculate_ramp(self, op_time, previous_power, power, current_power=0):
+            return min(power, 300)
+
+    index = pd.date_range("2022-01-01", periods=100, freq="h")
+    rng = np.random.default_rng(4)
+    ff = NaiveForecast(index, availability=1, fuel_price=10, co2_price=10)
+    params = dict(
+        unit_operator="test_operator",
+        technology="coal",
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        index=index,
+        max_power=700,
+        min_power=50,
+        efficiency=0.5,
+        fuel_type="lignite",
+        ramp_down=150,
+        ramp_up=200,
+        min_operating_time=4,
+        min_down_time=3,
+        forecaster=ff,
+    )
+    dispatch = rng.choice([0, 0, 30.5, 100, 400, 700], size=len(index))
+    units = [
+        PowerPlant(id="test_pp", **params),
+        DelegatingPowerPlant(id="test_pp", **params),
+        LimitedPowerPlant(id="test_pp", **params),
+    ]
+    for unit in units:
+        unit.outputs["energy"][:] = dispatch
+        unit.execute_current_dispatch(index[0], index[-1])
+
+    # the overridden method is applied per timestep with the same results as the kernel
+    np.testing.assert_array_equal(
+        units[0].outputs["energy"].to_numpy(), units[1].outputs["energy"].to_numpy()
+    )
+    # the overridden method is not ignored
+    assert units[2].outputs["energy"].max() == 300
+    assert units[2].outputs["energy"].tolist() == [
+        min(power, 300) if power == 0 or power >= 50 else 50 for power in dispatch
+    ]
+
+
+class CapacityMarketConfig:
+    market_id = "EOM"
+    product_type = "capacity_pos"
+    additional_fields = []
+
+
+@pytest.mark.parametrize("market_config", [MockMarketConfig, CapacityMarketConfig])
+def test_powerplant_set_dispatch_plan_per_step(market_config):
+    # the dispatch kernel gives the same results as applying the constraints step by step
+    index = pd.date_range("2022-01-01", periods=100, freq="h")
+    rng = np.random.default_rng(2)
+    availability = rng.choice([0.3, 1, 1, 1], size=len(index))
+    ff = NaiveForecast(index, availability=availability, fuel_price=10, co2_price=10)
+    params = dict(
+        unit_operator="test_operator",
+        technology="coal",
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        index=index,
+        max_power=700,
+        min_power=50,
+        efficiency=0.5,
+        fuel_type="lignite",
+        ramp_down=150,
+        ramp_up=200,
+        min_operating_time=4,
+        min_down_time=3,
+        forecaster=ff,
+    )
+    power_plant = PowerPlant(id="test_pp", **params)
+    reference = PowerPlant(id="test_pp", **params)
+    # the operation history differs from the dispatch of the product type
+    history = rng.choice([0, 0, 100, 400, 700], size=len(index))
+    power_plant.outputs["energy"][:] = history
+    reference.outputs["energy"][:] = history
+
+    product_type = market_config.product_type
+    dispatch = reference.outputs.get_array(product_type)
+    max_power = ff.get_availability("test_pp") * reference.max_power
+    for products in [[10, 11, 12, 20], [30, 31, 32, 33, 34, 60, 61, 99]]:
+        orderbook = [
+            {
+                "start_time": index[pos],
+                "end_time": index[pos] + timedelta(hours=1),
+                "only_hours": None,
+                "price": 10,
+                "accepted_price": 10,
+                "accepted_volume": float(rng.choice([0, 30.5, 100, 400, 700])),
+            }
+            for pos in products
+        ]
+        power_plant.set_dispatch_plan(market_config(), orderbook)
+
+        for order in orderbook:
+            dispatch[index.get_loc(order["start_time"])] += order["accepted_volume"]
+        # the timesteps between the products are corrected as well
+        for t in get_products_index(orderbook):
+            pos = index.get_loc(t)
+            power = reference.calculate_ramp(
+                reference.get_operation_time(t),
+                reference.get_output_before(t),
+                dispatch[pos],
+            )
+            if power > 0:
+                power = max(min(power, max_power[t]), reference.min_power)
+            dispatch[pos] = power
+
+        np.testing.assert_array_equal(
+            power_plant.outputs.get_array(product_type), dispatch
+        )
+    if product_type != "energy":
+        np.testing.assert_array_equal(power_plant.outputs["energy"], history)
+
+
+def test_ramp_constraints_compiled():
+    # the kernel compiled with numba gives the same results as the python loop
+    pytest.importorskip("numba")
+    from assume.common.dispatch_kernels import apply_ramp_constraints
+
+    rng = np.random.default_rng(3)
+    energy = rng.choice([0, 0, 30.5, 100, 400, 700], size=200).astype(float)
+    available_power = rng.choice([210.0, 700.0], size=150)
+    positions = np.concatenate([np.arange(10, 100), np.arange(140, 200)])
+    args = (available_power, 50.0, 700.0, 200.0, 150.0, 4, 3)
+
+    for separate_dispatch in [False, True]:
+        compiled_energy, python_energy = energy.copy(), energy.copy()
+        if separate_dispatch:
+            compiled_dispatch, python_dispatch = (
+                energy[::-1].copy(),
+                energy[::-1].copy(),
+            )
+        else:
+            compiled_dispatch, python_dispatch = compiled_energy, python_energy
+        apply_ramp_constraints(compiled_dispatch, compiled_energy, positions, *args)
+        apply_ramp_constraints.py_func(python_dispatch, python_energy, positions, *args)
+        np.testing.assert_array_equal(compiled_dispatch, python_dispatch)
+        np.testing.assert_array_equal(compiled_energy, python_energy)
+
+
 if __name__ == "__main__":
     # run pytest and enable prints
     pytest.main(["-s", __file__])
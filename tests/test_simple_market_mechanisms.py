@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import copy
+import random
 from datetime import datetime, timedelta
 
 from dateutil import rrule as rr
@@ -11,6 +12,7 @@ from dateutil.relativedelta import relativedelta as rd
 from assume.common.market_objects import MarketConfig, MarketProduct
 from assume.common.utils import get_available_products
 from assume.markets.clearing_algorithms import PayAsClearRole, clearing_mechanisms
+from assume.markets.order_book import OrderBook
 
 from .utils import create_orderbook, extend_orderbook
 
@@ -185,3 +187,178 @@ def test_market_pay_as_clears_single_demand_more_generation():
     assert meta[0]["price"] == 60
     assert accepted[0]["volume"] == -400
     assert accepted[0]["accepted_volume"] == -400
+
+
+def test_vectorized_clearing_matches_simple_clearing():
+    next_opening = simple_dayahead_auction_config.opening_hours.after(datetime.now())
+    products = get_available_products(
+        simple_dayahead_auction_config.market_products, next_opening
+    )
+    order = {
+        "start_time": products[0][0],
+        "end_time": products[0][1],
+        "agent_id": "dem1",
+        "bid_id": "bid1",
+        "volume": 0,
+        "price": 0,
+        "only_hours": None,
+        "node": 0,
+    }
+
+    def summary(orders):
+        return [
+            (
+                o["bid_id"],
+                o["volume"],
+                o.get("accepted_volume"),
+                o.get("accepted_price"),
+            )
+            for o in orders
+        ]
+
+    for mechanism in ["pay_as_clear", "pay_as_bid"]:
+        for seed in range(20):
+            orderbook = create_orderbook(order, count=50, seed=seed)
+            simple_role = clearing_mechanisms[mechanism](simple_dayahead_auction_config)
+            vectorized_role = clearing_mechanisms[f"{mechanism}_vectorized"](
+                simple_dayahead_auction_config
+            )
+
+            random.seed(seed)
+            expected = simple_role.clear(copy.deepcopy(orderbook), products)
+            random.seed(seed)
+            result = vectorized_role.clear(copy.deepcopy(orderbook), products)
+
+            assert summary(result[0]) == summary(expected[0])
+            assert summary(result[1]) == summary(expected[1])
+            assert result[2] == expected[2]
+
+
+def test_vectorized_pay_as_bid_splits_supply():
+    next_opening = simple_dayahead_auction_config.opening_hours.after(datetime.now())
+    products = get_available_products(
+        simple_dayahead_auction_config.market_products, next_opening
+    )
+    orderbook = extend_orderbook(products, -400, 3000)
+    orderbook = extend_orderbook(products, -200, 200, orderbook)
+    orderbook = extend_orderbook(products, 500, 100, orderbook)
+    orderbook = extend_orderbook(products, 300, 150, orderbook)
+    orderbook = extend_orderbook(products, 300, 250, orderbook)
+
+    mr = clearing_mechanisms["pay_as_bid_vectorized"](simple_dayahead_auction_config)
+    accepted, rejected, meta = mr.clear(orderbook, products)
+    assert meta[0]["supply_volume"] == 600
+    assert meta[0]["demand_volume"] == 600
+    # the cheapest supply order is split between both demand orders
+    assert [o["accepted_volume"] for o in accepted] == [-400, -200, 400, 100, 100]
+    assert [o["accepted_price"] for o in accepted] == [100, 150, 100, 100, 150]
+    assert [o["volume"] for o in rejected] == [200, 300]
+
+
+def test_clearing_from_product_buckets():
+    config = copy.copy(simple_dayahead_auction_config)
+    config.market_products = [MarketProduct(rd(hours=+1), 24, rd(hours=1))]
+    next_opening = config.opening_hours.after(datetime.now())
+    products = get_available_products(config.market_products, next_opening)
+    assert len(products) == 24
+
+    orderbook = []
+    for i, product in enumerate(products):
+        order = {
+            "start_time": product[0],
+            "end_time": product[1],
+            "agent_id": "dem1",
+            "bid_id": "bid1",
+            "volume": 0,
+            "price": 0,
+            "only_hours": None,
+            "node": 0,
+        }
+        orderbook.extend(create_orderbook(order, count=20, seed=i))
+
+    def summary(orders):
+        return [
+            (
+                o["bid_id"],
+                o["start_time"],
+                o.get("accepted_volume"),
+                o.get("accepted_price"),
+            )
+            for o in orders
+        ]
+
+    # the clearing takes the products from the buckets of an order book
+    for mechanism in [
+        "pay_as_clear",
+        "pay_as_bid",
+        "pay_as_clear_vectorized",
+        "pay_as_bid_vectorized",
+    ]:
+        role = clearing_mechanisms[mechanism](config)
+        random.seed(1)
+        from_list = role.clear(copy.deepcopy(orderbook), products)
+        random.seed(1)
+        from_book = role.clear(OrderBook(copy.deepcopy(orderbook)), products)
+        assert summary(from_list[0]) == summary(from_book[0])
+        assert summary(from_list[1]) == summary(from_book[1])
+        assert from_list[2] == from_book[2]
+
+
+def test_parallel_product_clearing():
+    config = copy.copy(simple_dayahead_auction_config)
+    config.market_products = [MarketProduct(rd(hours=+1), 24, rd(hours=1))]
+    config.param_dict = {"parallel_products": 4}
+    next_opening = config.opening_hours.after(datetime.now())
+    products = get_available_products(config.market_products, next_opening)
+    assert len(products) == 24
+
+    orderbook = []
+    for i, product in enumerate(products):
+        order = {
+            "start_time": product[0],
+            "end_time": product[1],
+            "agent_id": "dem1",
+            "bid_id": "bid1",
+            "volume": 0,
+            "price": 0,
+            "only_hours": None,
+            "node": 0,
+        }
+        orderbook.extend(create_orderbook(order, count=20, seed=i))
+
+    def summary(orders):
+        return [
+            (
+                o["bid_id"],
+                o["start_time"],
+                o.get("accepted_volume"),
+                o.get("accepted_price"),
+            )
+            for o in orders
+        ]
+
+    for mechanism in ["pay_as_clear", "pay_as_bid_vectorized", "pay_as_bid_aon"]:
+        role = clearing_mechanisms[mechanism](config)
+        assert role.parallel_products == 4
+        assert role.independent_products
+
+        random.seed(1)
+        first = role.clear_parallel(OrderBook(copy.deepcopy(orderbook)), products)
+        random.seed(1)
+        second = role.clear_parallel(copy.deepcopy(orderbook), products)
+        assert summary(first[0]) == summary(second[0])
+        assert summary(first[1]) == summary(second[1])
+        assert first[2] == second[2]
+        # meta data is merged in product order
+        assert [meta["product_start"] for meta in first[2]] == [p[0] for p in products]
+
+        # clearing prices and volumes do not depend on the tie breaking
+        sequential = role.clear(copy.deepcopy(orderbook), products)
+        assert [m["price"] for m in first[2]] == [m["price"] for m in sequential[2]]
+        assert [m["supply_volume"] for m in first[2]] == [
+            m["supply_volume"] for m in sequential[2]
+        ]
+        role._executor.shutdown()
+
+    # the aon pay as clear price carries over between the products, so they are cleared sequentially
+    assert not clearing_mechanisms["pay_as_clear_aon"](config).independent_products
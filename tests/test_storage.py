@@ -2,9 +2,11 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import copy
 import math
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -432,6 +434,237 @@ def test_set_dispatch_plan(mock_market_config, storage_unit):
     assert len(bids) == 1
 
 
+def test_soc_constraints_per_step(mock_market_config):
+    # the dispatch kernel gives the same results as correcting the dispatch step by step
+    index = pd.date_range("2022-01-01", periods=100, freq="h")
+    params = dict(
+        unit_operator="TestOperator",
+        technology="TestTechnology",
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        max_power_charge=-100,
+        max_power_discharge=100,
+        min_power_charge=-10,
+        min_power_discharge=10,
+        max_volume=300,
+        min_volume=10,
+        efficiency_charge=0.9,
+        efficiency_discharge=0.95,
+        index=index,
+    )
+    storage = Storage(id="Test_Storage", **params)
+    reference = Storage(id="Test_Storage", **params)
+    rng = np.random.default_rng(0)
+    dispatch = rng.choice([-150, -100, -50, -5, 0, 5, 50, 100, 150], size=len(index))
+    storage.outputs["energy"][:] = dispatch
+    reference.outputs["energy"][:] = dispatch
+    energy = reference.outputs.get_array("energy")
+    socs = reference.outputs.get_array("soc")
+    hours = 1
+
+    for start, end in [(0, 30), (30, 70), (70, 100)]:
+        storage.execute_current_dispatch(index[start], index[end - 1])
+        for t in range(start, end - 1):
+            soc = socs[t]
+            energy[t] = min(max(energy[t], -100), 100)
+            if -10 < energy[t] < 10:
+                energy[t] = 0
+            delta_soc = 0
+            if energy[t] > 0:
+                energy[t] = min(energy[t], reference.calculate_soc_max_discharge(soc))
+                delta_soc = -energy[t] * hours / 0.95 / 300
+            elif energy[t] < 0:
+                energy[t] = max(energy[t], reference.calculate_soc_max_charge(soc))
+                delta_soc = -energy[t] * hours * 0.9 / 300
+            socs[t + 1] = soc + delta_soc
+
+    np.testing.assert_array_equal(storage.outputs["energy"], energy)
+    np.testing.assert_array_equal(storage.outputs["soc"], socs)
+
+    orderbook = [
+        {
+            "start_time": index[pos],
+            "end_time": index[pos + 1],
+            "only_hours": None,
+            "accepted_volume": volume,
+            "accepted_price": 50,
+        }
+        for pos, volume in [(10, 80), (11, -60), (15, 100), (16, 100), (40, -100)]
+    ]
+    storage.set_dispatch_plan(mock_market_config, orderbook)
+    for order in orderbook:
+        pos = reference.time_index.get_pos(order["start_time"])
+        energy[pos] += order["accepted_volume"]
+    for pos in range(10, 41):
+        soc = socs[pos]
+        delta_soc = 0
+        if energy[pos] > 0:
+            energy[pos] = min(energy[pos], reference.calculate_soc_max_discharge(soc))
+            delta_soc = -energy[pos] * hours / 0.95 / 300
+        elif energy[pos] < 0:
+            energy[pos] = max(energy[pos], reference.calculate_soc_max_charge(soc))
+            delta_soc = -energy[pos] * hours * 0.9 / 300
+        socs[pos + 1 :] = soc + delta_soc
+
+    np.testing.assert_array_equal(storage.outputs["energy"], energy)
+    np.testing.assert_array_equal(storage.outputs["soc"], socs)
+
+
+def test_soc_constraints_overridden_limits(mock_market_config):
+    class DelegatingStorage(Storage):
+        def calculate_soc_max_discharge(self, soc):
+            return super().calculate_soc_max_discharge(soc)
+
+    class LimitedStorage(Storage):
+        def calculate_soc_max_charge(self, soc):
+            return max(super().calculate_soc_max_charge(soc), -20)
+
+    index = pd.date_range("2022-01-01", periods=60, freq="h")
+    params = dict(
+        unit_operator="TestOperator",
+        technology="TestTechnology",
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        max_power_charge=-100,
+        max_power_discharge=100,
+        min_power_charge=-10,
+        min_power_discharge=10,
+        max_volume=300,
+        min_volume=10,
+        efficiency_charge=0.9,
+        efficiency_discharge=0.95,
+        index=index,
+    )
+    rng = np.random.default_rng(5)
+    dispatch = rng.choice([-150, -100, -50, -5, 0, 5, 50, 100, 150], size=len(index))
+    orderbook = [
+        {
+            "start_time": index[pos],
+            "end_time": index[pos + 1],
+            "only_hours": None,
+            "accepted_volume": volume,
+            "accepted_price": 50,
+        }
+        for pos, volume in [(40, 80), (41, -60), (45, -100), (50, 100)]
+    ]
+    units = [
+        Storage(id="Test_Storage", **params),
+        DelegatingStorage(id="Test_Storage", **params),
+        LimitedStorage(id="Test_Storage", **params),
+    ]
+    for unit in units:
+        unit.outputs["energy"][:30] = dispatch[:30]
+        unit.execute_current_dispatch(index[0], index[29])
+        unit.set_dispatch_plan(mock_market_config, copy.deepcopy(orderbook))
+
+    # the overridden methods are applied per timestep with the same results as the kernel
+    for column in ["energy", "soc"]:
+        np.testing.assert_array_equal(
+            units[0].outputs[column].to_numpy(), units[1].outputs[column].to_numpy()
+        )
+    # the overridden methods are not ignored
+    assert units[2].outputs["energy"].min() == -20
+    assert units[0].outputs["energy"].min() < -20
+
+
+class CapacityMarketConfig:
+    market_id = "EOM"
+    product_type = "capacity_pos"
+    additional_fields = []
+
+
+def test_soc_constraints_capacity_product():
+    # the dispatch of another product type is corrected with the state of charge of the energy output
+    index = pd.date_range("2022-01-01", periods=50, freq="h")
+    params = dict(
+        unit_operator="TestOperator",
+        technology="TestTechnology",
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        max_power_charge=-100,
+        max_power_discharge=100,
+        max_volume=300,
+        min_volume=10,
+        efficiency_charge=0.9,
+        efficiency_discharge=0.95,
+        index=index,
+    )
+    storage = Storage(id="Test_Storage", **params)
+    reference = Storage(id="Test_Storage", **params)
+    rng = np.random.default_rng(1)
+    history = rng.choice([-100, -50, 0, 50, 100], size=len(index))
+    storage.outputs["energy"][:] = history
+    reference.outputs["energy"][:] = history
+    energy = reference.outputs.get_array("energy")
+    dispatch = reference.outputs.get_array("capacity_pos")
+    socs = reference.outputs.get_array("soc")
+    hours = 1
+
+    orderbook = [
+        {
+            "start_time": index[pos],
+            "end_time": index[pos + 1],
+            "only_hours": None,
+            "accepted_volume": volume,
+            "accepted_price": 50,
+        }
+        for pos, volume in [(5, 80), (6, -60), (12, 100), (20, 300), (21, -300)]
+    ]
+    storage.set_dispatch_plan(CapacityMarketConfig(), orderbook)
+    for order in orderbook:
+        pos = reference.time_index.get_pos(order["start_time"])
+        dispatch[pos] += order["accepted_volume"]
+    for pos in range(5, 22):
+        soc = socs[pos]
+        delta_soc = 0
+        if dispatch[pos] > 0:
+            dispatch[pos] = min(
+                dispatch[pos], reference.calculate_soc_max_discharge(soc)
+            )
+            delta_soc = -energy[pos] * hours / 0.95 / 300
+        elif dispatch[pos] < 0:
+            dispatch[pos] = max(dispatch[pos], reference.calculate_soc_max_charge(soc))
+            delta_soc = -energy[pos] * hours * 0.9 / 300
+        socs[pos + 1 :] = soc + delta_soc
+
+    np.testing.assert_array_equal(storage.outputs["capacity_pos"], dispatch)
+    np.testing.assert_array_equal(storage.outputs["soc"], socs)
+    np.testing.assert_array_equal(storage.outputs["energy"], history)
+
+
+def test_soc_constraints_compiled():
+    # the kernel compiled with numba gives the same results as the python loop
+    pytest.importorskip("numba")
+    from assume.common.dispatch_kernels import apply_soc_constraints
+
+    rng = np.random.default_rng(2)
+    energy = rng.choice([-150, -100, -33.3333, -5, 0, 5, 33.3333, 100, 150], size=100)
+    positions = np.concatenate([np.arange(0, 40), np.arange(50, 99)])
+    # the limits of the state of charge are rounded to 3 digits
+    args = (1.0, 300.0, 10.0, 0.9, 0.95, -10.0, -100.0, 10.0, 100.0)
+
+    for limit_power, fill_to_end in [(True, False), (False, True)]:
+        compiled_energy, python_energy = energy.copy(), energy.copy()
+        compiled_socs, python_socs = np.full(100, 0.5), np.full(100, 0.5)
+        apply_soc_constraints(
+            compiled_energy,
+            compiled_energy,
+            compiled_socs,
+            positions,
+            *args,
+            limit_power,
+            fill_to_end,
+        )
+        apply_soc_constraints.py_func(
+            python_energy,
+            python_energy,
+            python_socs,
+            positions,
+            *args,
+            limit_power,
+            fill_to_end,
+        )
+        np.testing.assert_array_equal(compiled_energy, python_energy)
+        np.testing.assert_array_equal(compiled_socs, python_socs)
+
+
 if __name__ == "__main__":
     # run pytest and enable prints
     pytest.main(["-s", __file__])
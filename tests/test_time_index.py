@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from assume.common.time_index import TimeIndex
+
+
+@pytest.fixture
+def index() -> pd.DatetimeIndex:
+    return pd.date_range("2022-01-01", periods=24, freq="h")
+
+
+def test_get_pos(index):
+    time_index = TimeIndex(index)
+    assert time_index.step is not None
+    for pos, timestamp in enumerate(index):
+        assert time_index.get_pos(timestamp) == pos
+        assert time_index.get_pos(timestamp.to_pydatetime()) == pos
+    # positions are passed through
+    assert time_index.get_pos(5) == 5
+
+    for dt in [
+        datetime(2021, 12, 31, 23),
+        datetime(2022, 1, 2),
+        datetime(2022, 1, 1, 1, 30),
+    ]:
+        with pytest.raises(KeyError):
+            time_index.get_pos(dt)
+
+    assert time_index.get_offset(datetime(2021, 12, 31, 22)) == -2
+    assert time_index.get_offset(datetime(2022, 1, 2, 1)) == 25
+
+
+def test_slices_match_label_indexing(index):
+    time_index = TimeIndex(index)
+    series = pd.Series(range(len(index)), index=index)
+    bounds = [
+        datetime(2021, 12, 31, 20),
+        datetime(2022, 1, 1),
+        datetime(2022, 1, 1, 2, 30),
+        datetime(2022, 1, 1, 5),
+        datetime(2022, 1, 1, 23),
+        datetime(2022, 1, 2, 3),
+    ]
+    for start in bounds:
+        for end in bounds:
+            expected = series[start:end].tolist()
+            assert series.iloc[time_index.get_slice(start, end)].tolist() == expected
+            if end.minute == 0:
+                expected = series[start : end - index.freq].tolist()
+                assert (
+                    series.iloc[time_index.get_product_slice(start, end)].tolist()
+                    == expected
+                )
+
+    # a product contains all timesteps which start before its end
+    assert time_index.get_product_slice(index[0], bounds[2]) == slice(0, 3)
+
+    assert time_index.get_slice(2, 4) == slice(2, 5)
+    assert time_index.get_product_slice(2, 4) == slice(2, 4)
+
+
+def test_irregular_index(index):
+    irregular = index[[0, 1, 2, 5, 6]]
+    time_index = TimeIndex(irregular)
+    assert time_index.step is None
+    assert time_index.get_pos(index[5]) == 3
+    assert time_index.get_slice(index[1], index[5]) == slice(1, 4)
+    assert time_index.get_product_slice(index[1], index[5]) == slice(1, 3)
+    assert time_index.get_offset(index[0] - index.freq) == -1
+    with pytest.raises(KeyError):
+        time_index.get_pos(index[3])
+
+
+def test_get_positions(index):
+    time_index = TimeIndex(index)
+    assert time_index.get_positions(index[[3, 7, 1]]).tolist() == [3, 7, 1]
+    assert TimeIndex(index[::2]).get_positions(index[[4, 8]]).tolist() == [2, 4]
+    # the positions do not depend on the resolution of the timestamps
+    seconds = index.as_unit("s")
+    assert TimeIndex(seconds).get_positions(seconds[[5, 2]]).tolist() == [5, 2]
+    with pytest.raises(KeyError):
+        time_index.get_positions([datetime(2023, 1, 1)])
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from assume.common.unit_outputs import UnitOutputs
+
+
+@pytest.fixture
+def outputs() -> UnitOutputs:
+    index = pd.date_range("2022-01-01", periods=4, freq="h")
+    return UnitOutputs(index, ["energy", "heat"])
+
+
+def test_declared_columns_share_matrix(outputs):
+    assert list(outputs.keys()) == []
+    assert outputs.data.shape == (2, 4)
+
+    energy = outputs.get_array("energy")
+    energy[1:3] += 100
+    assert outputs.data[0, 1] == 100
+    assert outputs["energy"].at[outputs.index[2]] == 100
+    assert list(outputs.keys()) == ["energy"]
+
+    # writes through the series view end up in the matrix
+    outputs["heat"][outputs.index[3]] = 50
+    assert outputs.data[1, 3] == 50
+    outputs["heat"].loc[outputs.index[0] : outputs.index[1]] += 10
+    assert outputs.get_array("heat").tolist() == [10, 10, 0, 50]
+
+
+def test_undeclared_columns(outputs):
+    profit = outputs["profit"]
+    assert (profit == 0).all()
+    assert "profit" in outputs
+    outputs.get_array("profit")[0] = 5
+    assert outputs["profit"].iloc[0] == 5
+
+
+def test_assignment(outputs):
+    outputs["energy"] = pd.Series(3.0, index=outputs.index)
+    assert outputs.data[0].tolist() == [3.0] * 4
+
+    outputs["rl_rewards"] = []
+    outputs["rl_rewards"].append(1)
+    assert outputs["rl_rewards"] == [1]
+    with pytest.raises(TypeError):
+        outputs.get_array("rl_rewards")
+
+    outputs["actions"] = pd.Series(0.0, index=outputs.index, dtype=object)
+    assert outputs["actions"].dtype == object
+
+
+def test_writes_after_augmented_assignment(outputs):
+    outputs["energy"] += 500
+    # with copy on write, this write goes into a copy of the series
+    outputs["energy"][-2:] = 0
+    assert outputs.get_array("energy").tolist() == [500, 500, 0, 0]
+    assert outputs.data[0].tolist() == [500, 500, 0, 0]
+
+    outputs.get_array("energy")[0] = 1
+    assert outputs["energy"].iloc[0] == 1
+
+
+def test_positions(outputs):
+    index = outputs.index
+    assert outputs.get_pos(index[2]) == 2
+    assert outputs.get_slice(index[1], index[2]) == slice(1, 3)
+    # timestamps outside of the index are clipped
+    positions = outputs.get_slice(index[0] - index.freq, index[-1] + index.freq)
+    assert (positions.start, positions.stop) == (0, 4)
+
+
+def test_get_block(outputs):
+    outputs.get_array("energy")[:] = [1, 2, 3, 4]
+    outputs.get_array("profit")[:] = [5, 6, 7, 8]
+    outputs["actions"] = pd.Series([9, 10, 11, 12], index=outputs.index, dtype=object)
+
+    block = outputs.get_block(["profit", "energy", "heat", "actions"], slice(1, 3))
+    assert block.tolist() == [[6, 2, 0, 10], [7, 3, 0, 11]]
+    block = outputs.get_block(["energy", "profit"], np.array([3, 0]))
+    assert block.tolist() == [[4, 8], [1, 5]]
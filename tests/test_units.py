@@ -4,6 +4,7 @@
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from assume.common.base import SupportsMinMax, SupportsMinMaxCharge
@@ -194,3 +195,46 @@ def test_minmax_operationtime():
     mm.outputs["energy"][-1:] = 0
     runtime = mm.get_operation_time(datetime(2023, 7, 2))
     assert runtime == 4
+
+
+def test_minmax_operation_counters():
+    mm = SupportsMinMax("Test", "TestOperator", "TestTechnology", {}, None, "empty")
+    mm.min_operating_time = 3
+    mm.min_down_time = 5
+    rng = np.random.default_rng(0)
+
+    def average_operation_times(energy: pd.Series):
+        # run lengths of the whole history, like before the counters were introduced
+        is_on = (energy > 0).to_numpy()
+        if len(is_on) == 0:
+            return max(mm.min_operating_time, 1), min(-mm.min_down_time, -1)
+        bounds = np.flatnonzero(np.diff(is_on)) + 1
+        periods = np.split(is_on, bounds)
+        op_times = [len(p) for p in periods if p[0]]
+        down_times = [-len(p) for p in periods if not p[0]]
+        avg_op_time = sum(op_times) / len(op_times) if op_times else 3
+        avg_down_time = sum(down_times) / len(down_times) if down_times else 5
+        return max(1, avg_op_time, 3), min(-1, avg_down_time, -5)
+
+    for committed in [0, 1, 30, 64, 100]:
+        # new outputs without committed dispatch
+        mm.index = pd.date_range("2023-07-01", periods=100, freq="h")
+        mm.outputs["energy"][:] = rng.choice([0, 100], size=100, p=[0.3, 0.7])
+        # the dispatch is executed step by step
+        for pos in [*range(0, committed, 9), committed]:
+            mm.operation_counters.commit(pos)
+        assert mm.operation_counters.position == committed
+        # forward and backward queries around the committed dispatch
+        for pos in [*range(0, 101, 7), 100, 3, 50, committed]:
+            start = mm.index[0] + mm.index.freq * pos
+            energy = mm.outputs["energy"].iloc[:pos]
+            assert mm.get_average_operation_times(start) == average_operation_times(
+                energy
+            )
+            window = (energy.iloc[-5:] > 0).to_numpy()[::-1]
+            if len(window):
+                run = np.argmin(window == window[0]) or len(window)
+                expected = run if window[0] else -run
+            else:
+                expected = 5
+            assert mm.get_operation_time(start) == expected
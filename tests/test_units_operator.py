@@ -4,6 +4,7 @@
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import pytest
 from dateutil import rrule as rr
@@ -234,11 +235,11 @@ async def test_get_actual_dispatch(units_operator: UnitsOperator):
     last = clock.time
     clock.set_time(clock.time + 3600)
     # WHEN actual_dispatch is called
-    market_dispatch, unit_dfs = units_operator.get_actual_dispatch("energy", last)
+    market_dispatch, unit_df = units_operator.get_actual_dispatch("energy", last)
     # THEN resulting unit dispatch dataframe contains one row
     # which is for the current time - as we must know our current dispatch
-    assert unit_dfs[0].index[0].timestamp() == clock.time
-    assert len(unit_dfs[0]) == 1
+    assert unit_df.index[0].timestamp() == clock.time
+    assert len(unit_df) == 1
     assert len(market_dispatch) == 0
 
     # WHEN another hour passes
@@ -246,15 +247,51 @@ async def test_get_actual_dispatch(units_operator: UnitsOperator):
     last = clock.time - 3600
 
     # THEN resulting unit dispatch dataframe contains only one row with current dispatch
-    market_dispatch, unit_dfs = units_operator.get_actual_dispatch("energy", last)
-    assert unit_dfs[0].index[0].timestamp() == clock.time
-    assert len(unit_dfs[0]) == 1
+    market_dispatch, unit_df = units_operator.get_actual_dispatch("energy", last)
+    assert unit_df.index[0].timestamp() == clock.time
+    assert len(unit_df) == 1
     assert len(market_dispatch) == 0
 
     clock.set_time(clock.time + 3600)
     last = clock.time - 3600
 
-    market_dispatch, unit_dfs = units_operator.get_actual_dispatch("energy", last)
-    assert unit_dfs[0].index[0].timestamp() == clock.time
-    assert len(unit_dfs[0]) == 1
+    market_dispatch, unit_df = units_operator.get_actual_dispatch("energy", last)
+    assert unit_df.index[0].timestamp() == clock.time
+    assert len(unit_df) == 1
     assert len(market_dispatch) == 0
+
+
+async def test_get_actual_dispatch_outputs(units_operator: UnitsOperator):
+    index = units_operator.units["testdemand"].index
+    unit = PowerPlant(
+        "testplant",
+        unit_operator="test_operator",
+        technology="coal",
+        index=index,
+        max_power=1000,
+        min_power=0,
+        bidding_strategies={"EOM": NaiveSingleBidStrategy()},
+        forecaster=NaiveForecast(index, availability=1, fuel_price=10, co2_price=10),
+    )
+    await units_operator.add_unit(unit)
+    unit.outputs["energy"].iloc[:4] = [100, 200, 300, 400]
+    unit.outputs["cashflow_EOM"].iloc[:4] = [1, 2, 3, 4]
+
+    clock = units_operator.context._agent_context._container.clock
+    last = clock.time - 3600
+    clock.set_time(clock.time + 2 * 3600)
+    market_dispatch, unit_df = units_operator.get_actual_dispatch("energy", last)
+
+    # one row per unit and timestep with the outputs of each unit
+    assert unit_df.columns[0] == "power"
+    assert unit_df.columns.get_loc("unit") < unit_df.columns.get_loc("cashflow_EOM")
+    assert list(unit_df["unit"]) == ["testdemand"] * 3 + ["testplant"] * 3
+    assert list(unit_df.index[3:]) == list(index[:3])
+    assert list(unit_df["power"].iloc[3:]) == [100, 200, 300]
+    assert list(unit_df["cashflow_EOM"].iloc[3:]) == [1, 2, 3]
+    assert np.isnan(unit_df["cashflow_EOM"].iloc[:3]).all()
+
+    # outputs created after the unit was added are exported as well
+    unit.outputs["total_costs"].iloc[:4] = 5
+    market_dispatch, unit_df = units_operator.get_actual_dispatch("energy", last)
+    assert list(unit_df["total_costs"].iloc[3:]) == [5, 5, 5]
@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import calendar
+import sys
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pandas as pd
@@ -14,6 +16,7 @@ from dateutil.tz import tzlocal
 from assume.common.market_objects import MarketConfig, MarketProduct
 from assume.common.utils import (
     aggregate_step_amount,
+    check_for_tensors,
     convert_to_rrule_freq,
     datetime2timestamp,
     get_available_products,
@@ -102,6 +105,7 @@ def test_available_products():
         i += 1
 
 
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
 def test_aggregate_step_amount():
     start = datetime(2020, 1, 1)
     end = datetime(2020, 12, 2)
@@ -155,6 +159,7 @@ def test_aggregate_step_amount():
     assert step_func
 
 
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
 def test_aggregate_step_amount_multi_hour():
     # when we have a single multi-hour bid
     orderbook = [
@@ -202,6 +207,7 @@ def test_aggregate_step_amount_multi_hour():
     assert step_func == [[datetime(2019, 1, 3, 13), 0.0]]
 
 
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
 def test_aggregate_step_amount_long():
     # when we have two valid bids and additional empty bids, this should not change much:
     orderbook = [
@@ -271,6 +277,27 @@ def test_aggregate_step_amount_long():
     # this returns the bids in a minimal representation
 
 
+def test_aggregate_step_amount_block_order():
+    start = datetime(2019, 1, 3, 9)
+    orderbook = [
+        {
+            "start_time": start,
+            "end_time": start + timedelta(hours=2),
+            "only_hours": None,
+            "volume": 30,
+            "accepted_volume": {start: 10, start + timedelta(hours=1): 20},
+        },
+    ]
+    with pytest.warns(DeprecationWarning, match="DispatchTimeline"):
+        step_func = aggregate_step_amount(orderbook)
+    # each product of the block order covers one hour
+    assert step_func == [
+        [datetime(2019, 1, 3, 9), 10],
+        [datetime(2019, 1, 3, 10), 20],
+        [datetime(2019, 1, 3, 11), 0],
+    ]
+
+
 def test_initializer():
     class Test:
         @initializer
@@ -447,6 +474,27 @@ def test_datetime2timestamp():
     assert 0 == datetime2timestamp(unix_start)
 
 
+def test_check_for_tensors(monkeypatch):
+    class Tensor:
+        def __init__(self, value):
+            self.value = value
+
+        def item(self):
+            return self.value
+
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [Tensor(1.5), 2.5], "c": ["x", None]})
+    # without torch being imported there can not be any tensors
+    monkeypatch.delitem(sys.modules, "torch", raising=False)
+    assert check_for_tensors(df)["b"].dtype == object
+
+    monkeypatch.setitem(sys.modules, "torch", SimpleNamespace(Tensor=Tensor))
+    df = check_for_tensors(df)
+    assert df["b"].tolist() == [1.5, 2.5]
+    assert df["b"].dtype == float
+    assert df["c"].iloc[0] == "x" and pd.isna(df["c"].iloc[1])
+    assert check_for_tensors([{"a": Tensor(1)}]) == [{"a": 1}]
+
+
 if __name__ == "__main__":
     test_convert_rrule()
     test_available_products()
@@ -3,8 +3,16 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import asyncio
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from dateutil import rrule as rr
 
 from assume import World
+from assume.common.forecasts import CsvForecaster
+from assume.common.market_objects import MarketConfig, MarketProduct
 from assume.scenario.loader_csv import load_scenario_folder
 
 
@@ -23,3 +31,77 @@ def test_world():
     assert world.market_operators.keys()
     assert world.markets.keys()
     assert world.unit_operators.keys()
+
+
+def test_world_shared_forecaster_subprocess():
+    start = datetime(2019, 1, 1)
+    end = datetime(2019, 1, 1, 4)
+    index = pd.date_range(start, end + timedelta(hours=24), freq="h")
+    world = World(database_uri=None, export_csv_path=None, distributed_role=True)
+    forecaster = CsvForecaster(index)
+    forecaster.set_forecast(
+        pd.DataFrame({"demand_1": 100.0 + np.arange(len(index))}, index=index)
+    )
+    market_config = MarketConfig(
+        market_id="EOM",
+        opening_hours=rr.rrule(rr.HOURLY, dtstart=start, until=end),
+        opening_duration=timedelta(hours=1),
+        market_mechanism="pay_as_clear",
+        market_products=[MarketProduct(timedelta(hours=1), 1, timedelta(hours=1))],
+    )
+    units = [
+        {
+            "id": "demand_1",
+            "unit_type": "demand",
+            "unit_operator_id": "operator_1",
+            "unit_params": {
+                "min_power": 0,
+                "max_power": 1000,
+                "bidding_strategies": {"EOM": "naive_eom"},
+                "technology": "demand",
+            },
+            "forecaster": forecaster,
+        },
+        {
+            "id": "plant_1",
+            "unit_type": "power_plant",
+            "unit_operator_id": "operator_1",
+            "unit_params": {
+                "min_power": 0,
+                "max_power": 1000,
+                "bidding_strategies": {"EOM": "naive_eom"},
+                "technology": "nuclear",
+            },
+            "forecaster": forecaster,
+        },
+    ]
+
+    async def setup():
+        await world.setup(start=start, end=end, simulation_id="shared", index=index)
+        world.add_market_operator(id="market_operator")
+        world.add_market("market_operator", market_config)
+        await world.add_units_with_operator_subprocess("operator_1", units)
+
+    async def wait_for_subprocess():
+        # the agents of the subprocess are registered with the main container asynchronously
+        process_manager = world.container._container_process_manager
+        while not {"operator_1", "clock_agent_operator_1"} <= set(process_manager.aids):
+            await asyncio.sleep(0.05)
+
+    world.loop.run_until_complete(setup())
+    world.loop.run_until_complete(asyncio.wait_for(wait_for_subprocess(), timeout=30))
+    # the forecaster is shared once for both units
+    assert world.shared_forecasters == [forecaster]
+    path = forecaster._shared_path
+    assert os.path.exists(path)
+
+    world.run()
+    market_role = world.market_operators["market_operator"].roles[0]
+    # the demand in the subprocess is read from the mapped forecasts
+    assert market_role.results
+    for result in market_role.results:
+        assert (
+            result["demand_volume"] == forecaster["demand_1"][result["product_start"]]
+        )
+    assert world.shared_forecasters == []
+    assert not os.path.exists(path)